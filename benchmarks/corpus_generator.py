@@ -0,0 +1,96 @@
+"""Synthetic full-size bible texts in the "0#Book#C#V#text" format
+
+The texts are generated from a fixed seed, so every run benchmarks the
+same ~31k verses per translation.
+
+Write the three known translations to a directory with:
+
+    python -m benchmarks.corpus_generator /tmp/texts
+"""
+
+import argparse
+import random
+from pathlib import Path
+from typing import List, Optional
+
+from src.book_registry import BOOK_NAMES, ENGLISH_BOOK_NAMES
+
+# Canonical chapter counts of the 66 books
+CHAPTER_COUNTS = [
+    50, 40, 27, 36, 34, 24, 21, 4, 31, 24, 22, 25, 29, 36, 10, 13, 10, 42, 150,
+    31, 12, 8, 66, 52, 5, 48, 12, 14, 3, 9, 1, 4, 7, 3, 3, 3, 2, 14, 4, 28, 16,
+    24, 21, 28, 16, 16, 13, 6, 6, 4, 4, 5, 3, 6, 4, 3, 1, 13, 5, 5, 3, 5, 1, 1,
+    1, 22,
+]  # fmt: skip
+VERSES_PER_CHAPTER = 26
+SEED = 1905
+
+GERMAN_WORDS = (
+    "und der die das Gott sprach Herr Himmel Erde Licht Finsternis Wasser "
+    "Tag Nacht Volk Israel König Haus Sohn Vater Mutter Mann Weib Kinder "
+    "Land Stadt Berg Meer Wort Geist Leben Tod Sünde Gnade Frieden Herz "
+    "siehe ward sah gut schied nannte machte ging kam gab nahm sagte hörte "
+    "über unter nach vor mit ohne gegen durch für seinen seine ihr ihm euch "
+    "alle groß klein heilig ewig Abend Morgen Brot Wein Feuer Wolke Stimme"
+).split()
+ENGLISH_WORDS = (
+    "and the of God said Lord heaven earth light darkness water day night "
+    "people Israel king house son father mother man woman children land "
+    "city mountain sea word spirit life death sin grace peace heart behold "
+    "was saw good divided called made went came gave took heard over under "
+    "after before with without against through for his her their him you "
+    "all great small holy everlasting evening morning bread wine fire cloud voice"
+).split()
+
+# File name -> (book names, vocabulary)
+TRANSLATIONS = {
+    "elberfelder1905": (BOOK_NAMES, GERMAN_WORDS),
+    "schlachter1951": (BOOK_NAMES, GERMAN_WORDS),
+    "world": (list(ENGLISH_BOOK_NAMES), ENGLISH_WORDS),
+}
+
+
+def generate_text(
+    book_names: List[str] = BOOK_NAMES,
+    words: List[str] = GERMAN_WORDS,
+    verses_per_chapter: int = VERSES_PER_CHAPTER,
+    seed: int = SEED,
+) -> str:
+    """Generate a full-size text in "0#Book#C#V#text" format
+
+    Chapters have between half and one and a half times ``verses_per_chapter``
+    verses of 8 to 30 words each.
+    """
+    rng = random.Random(seed)
+    low, high = max(verses_per_chapter // 2, 1), verses_per_chapter * 3 // 2
+    lines = []
+    for book_name, chapters in zip(book_names, CHAPTER_COUNTS):
+        for chapter in range(1, chapters + 1):
+            for verse in range(1, rng.randint(low, high) + 1):
+                text = " ".join(rng.choices(words, k=rng.randint(8, 30)))
+                lines.append(
+                    f"0#{book_name}#{chapter}#{verse}#{text[0].upper()}{text[1:]}."
+                )
+    return "\n".join(lines)
+
+
+def write_texts(texts_dir: Path, verses_per_chapter: int = VERSES_PER_CHAPTER) -> None:
+    """Write a generated text for every known translation"""
+    texts_dir.mkdir(parents=True, exist_ok=True)
+    for seed, (filename, (book_names, words)) in enumerate(TRANSLATIONS.items()):
+        text = generate_text(book_names, words, verses_per_chapter, SEED + seed)
+        (texts_dir / f"{filename}.txt").write_text(text, encoding="utf-8")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic bible texts")
+    parser.add_argument("texts_dir", type=Path)
+    parser.add_argument("--verses-per-chapter", type=int, default=VERSES_PER_CHAPTER)
+    args = parser.parse_args(argv)
+
+    write_texts(args.texts_dir, args.verses_per_chapter)
+    print(f"Wrote {len(TRANSLATIONS)} texts to {args.texts_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compare the legacy regex parser with Bible._parse_text on a full-size text
+
+Run from the repository root:
+
+    python -m benchmarks.parse_benchmark
+"""
+
+import re
+import time
+from typing import Dict
+
+from benchmarks.corpus_generator import generate_text
+from src.bible_base import Bible
+from src.book_registry import GERMAN_BOOK_NAMES
+
+
+class BenchmarkBible(Bible):
+    """Concrete Bible used to drive the parser"""
+
+    def load_text(self, file_path: str) -> None:
+        pass
+
+
+def legacy_parse_text(content: str) -> Dict[str, Dict[int, Dict[int, str]]]:
+    """The per-line multi-regex parser that _parse_text replaced"""
+    books: Dict[str, Dict[int, Dict[int, str]]] = {}
+    patterns = [
+        r"^(.+?)\s+(\d+):(\d+)\s+(.+)$",
+        r"^(\w+)\s+(\d+):(\d+)\s+(.+)$",
+        r"^\d+#(.+?)#(\d+)#(\d+)#(.+)$",
+    ]
+    for line in content.strip().split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        verse_match = None
+        for pattern in patterns:
+            verse_match = re.match(pattern, line)
+            if verse_match:
+                break
+        if verse_match:
+            name_mappings = dict(GERMAN_BOOK_NAMES)
+            raw_book = verse_match.group(1).strip()
+            book_name = name_mappings.get(raw_book, raw_book)
+            chapter_num = int(verse_match.group(2))
+            verse_num = int(verse_match.group(3))
+            books.setdefault(book_name, {}).setdefault(chapter_num, {})[verse_num] = (
+                verse_match.group(4).strip()
+            )
+    return books
+
+
+def best_of(repeat: int, func, *args) -> float:
+    """Return the fastest of several timed runs in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def parse_with_bible(content: str) -> None:
+    BenchmarkBible("Benchmark")._parse_text(content)
+
+
+def main(repeat: int = 5) -> None:
+    content = generate_text()
+    verse_count = content.count("\n") + 1
+
+    bible = BenchmarkBible("Benchmark")
+    bible._parse_text(content)
+    assert bible.books == legacy_parse_text(content)
+
+    legacy = best_of(repeat, legacy_parse_text, content)
+    current = best_of(repeat, parse_with_bible, content)
+    print(f"verses:  {verse_count}")
+    print(f"legacy:  {legacy * 1000:8.1f} ms")
+    print(f"current: {current * 1000:8.1f} ms")
+    print(f"speedup: {legacy / current:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
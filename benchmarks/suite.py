@@ -0,0 +1,279 @@
+"""Benchmark suite for parsing, loading, lookups and the HTTP routes
+
+Run from the repository root:
+
+    python -m benchmarks.suite                # print results
+    python -m benchmarks.suite --compare      # compare with baseline.json
+    python -m benchmarks.suite --save         # store results as new baseline
+
+Every benchmark runs on synthetic full-size texts from corpus_generator.
+Timings are the best of several runs, HTTP latencies are measured in process
+through httpx with an ASGI transport, so no server or network is involved.
+Results are keyed "group.name" and are either seconds (lower is better) or
+rates and sizes as named by their suffix.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.corpus_generator import generate_text, write_texts
+from src.bible_base import Bible
+from src.bible_manager import BibleManager
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+# Results that are better when higher, all others are better when lower
+HIGHER_IS_BETTER = ("_per_second",)
+
+Results = Dict[str, float]
+
+
+class BenchmarkBible(Bible):
+    """Concrete Bible used to drive the parser"""
+
+    def load_text(self, file_path: str) -> None:
+        pass
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    """Return the fastest of several timed runs in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def peak_rss_bytes() -> int:
+    """Get the peak resident set size of this process"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def bench_parse(repeat: int) -> Results:
+    """Time Bible._parse_text on one full-size text"""
+    content = generate_text()
+
+    def parse():
+        BenchmarkBible("Benchmark")._parse_text(content)
+
+    return {"parse.parse_text": best_of(repeat, parse)}
+
+
+def bench_load(texts_dir: Path, repeat: int) -> Results:
+    """Time BibleManager.load_bibles sequentially and in a process pool"""
+
+    def load(**options):
+        def run():
+            asyncio.run(BibleManager().load_bibles(str(texts_dir), **options))
+
+        return run
+
+    return {
+        "load.sequential": best_of(repeat, load()),
+        "load.sequential_compact": best_of(repeat, load(compact=True)),
+        "load.pool_compact": best_of(repeat, load(max_workers=3, compact=True)),
+    }
+
+
+def bench_lookups(bible: Bible, count: int, label: str) -> Results:
+    """Measure getter calls per second on random references"""
+    rng = random.Random(0)
+    references = [
+        bible.verse_reference(rng.randrange(len(bible.verse_index)))
+        for _ in range(count)
+    ]
+    books = [book for book, _, _ in references]
+
+    def rate(func: Callable[[], object]) -> float:
+        return count / best_of(3, func)
+
+    return {
+        f"lookup.{label}_get_verse_per_second": rate(
+            lambda: [bible.get_verse(*reference) for reference in references]
+        ),
+        f"lookup.{label}_get_chapter_per_second": rate(
+            lambda: [
+                bible.get_chapter(book, chapter) for book, chapter, _ in references
+            ]
+        ),
+        f"lookup.{label}_get_book_per_second": rate(
+            lambda: [bible.get_book(book) for book in books]
+        ),
+    }
+
+
+def http_paths(bible: Bible) -> Dict[str, List[str]]:
+    """Build request paths per route, all hitting existing verses"""
+    name = bible.name
+    rng = random.Random(1)
+    references = [
+        bible.verse_reference(rng.randrange(len(bible.verse_index))) for _ in range(50)
+    ]
+    books = bible.get_book_names()
+    return {
+        "translations": ["/api/translations"],
+        "books": [f"/api/{name}/books"],
+        "book": [f"/api/{name}/{book}" for book in ("Ruth", "Jona", "Judas")],
+        "chapters": [f"/api/{name}/{book}/chapters" for book in books[:20]],
+        "chapter": [f"/api/{name}/{b}/{c}" for b, c, _ in references],
+        "verse": [f"/api/{name}/{b}/{c}/{v}" for b, c, v in references],
+        "verse_alias": [f"/api/{name}/Gen/1/{v}" for v in range(1, 11)],
+        "range": [f"/api/{name}/range?from={rng.randrange(30000)}" for _ in range(20)],
+        "verses": [f"/api/{name}/verses?refs=1. Mose 1:1-5;Johannes 3:16"],
+        "search": [
+            f"/api/{name}/search?q={query}"
+            for query in ("Gott", "Himmel Erde", '"und Gott sprach"')
+        ],
+        "compare": ["/api/compare/Johannes/3", "/api/compare/1/1"],
+        "metrics": ["/metrics"],
+    }
+
+
+async def bench_http(requests_per_route: int) -> Results:
+    """Load test every route in process and report latency and throughput"""
+    from src.main import app, bible_manager
+
+    bible = bible_manager.get_bible("Elberfelder1905")
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for route, paths in http_paths(bible).items():
+            for path in paths:
+                response = await client.get(path)
+                response.raise_for_status()
+
+            latencies = []
+            started = time.perf_counter()
+            for index in range(requests_per_route):
+                path = paths[index % len(paths)]
+                start = time.perf_counter()
+                await client.get(path)
+                latencies.append(time.perf_counter() - start)
+            elapsed = time.perf_counter() - started
+
+            quantiles = statistics.quantiles(latencies, n=100)
+            results[f"http.{route}_p50"] = quantiles[49]
+            results[f"http.{route}_p99"] = quantiles[98]
+            results[f"http.{route}_requests_per_second"] = requests_per_route / elapsed
+    return results
+
+
+def run(quick: bool = False) -> Results:
+    """Run all benchmarks and return the results"""
+    repeat = 2 if quick else 5
+    results: Results = {}
+    with tempfile.TemporaryDirectory() as texts_dir:
+        write_texts(Path(texts_dir))
+        results.update(bench_parse(repeat))
+        results.update(bench_load(Path(texts_dir), 1 if quick else 3))
+
+        from src.main import bible_manager
+
+        asyncio.run(bible_manager.load_bibles(texts_dir, compact=True))
+        compact = bible_manager.get_bible("Elberfelder1905")
+        plain = BibleManager()
+        asyncio.run(plain.load_bibles(texts_dir))
+
+        lookups = 10_000 if quick else 100_000
+        results.update(
+            bench_lookups(plain.get_bible("Elberfelder1905"), lookups, "dict")
+        )
+        results.update(bench_lookups(compact, lookups, "compact"))
+        results.update(asyncio.run(bench_http(200 if quick else 1000)))
+
+    results["memory.peak_rss_bytes"] = peak_rss_bytes()
+    return results
+
+
+def compare(
+    results: Results, baseline: Results, tolerance: float
+) -> List[Tuple[str, float, float, float, bool]]:
+    """Compare results with a baseline
+
+    Returns (name, baseline, result, change, regressed) per result in the
+    baseline. ``change`` is the relative improvement, negative if slower.
+    """
+    rows = []
+    for name, before in baseline.items():
+        after = results.get(name)
+        if after is None or not before or not after:
+            continue
+        if name.endswith(HIGHER_IS_BETTER):
+            change = after / before - 1
+        else:
+            change = before / after - 1
+        rows.append((name, before, after, change, change < -tolerance))
+    return rows
+
+
+def format_value(name: str, value: float) -> str:
+    """Format a result for printing"""
+    if name.endswith("_per_second"):
+        return f"{value:12,.0f}/s"
+    if name.endswith("_bytes"):
+        return f"{value / 2**20:11,.1f} MB"
+    return f"{value * 1000:11,.3f} ms"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="fewer repetitions")
+    parser.add_argument("--save", action="store_true", help="store as baseline")
+    parser.add_argument("--compare", action="store_true", help="compare to baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="relative slowdown reported as regression (default 0.2)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(quick=args.quick)
+
+    if args.compare:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = 0
+        for name, before, after, change, regressed in compare(
+            results, baseline, args.tolerance
+        ):
+            regressions += regressed
+            marker = "  REGRESSION" if regressed else ""
+            print(
+                f"{name:45} {format_value(name, before)} -> "
+                f"{format_value(name, after)} {change:+7.1%}{marker}"
+            )
+        if regressions:
+            print(f"{regressions} results regressed by more than {args.tolerance:.0%}")
+            sys.exit(1)
+    else:
+        for name, value in results.items():
+            print(f"{name:45} {format_value(name, value)}")
+
+    if args.save:
+        report = {
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "results": results,
+        }
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Saved baseline to {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
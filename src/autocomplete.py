@@ -0,0 +1,193 @@
+"""Prefix and typo-tolerant completion of book names and search terms
+
+Completions come from a sorted key list: the best keys of every prefix of up
+to SHORT_PREFIX characters are precomputed, longer prefixes bisect into the
+sorted keys and rank the few keys that start with them. Typos are matched
+with symmetric deletes (SymSpell): every key is indexed under itself and
+all strings with one character deleted, so the candidates of a query are a
+few dict lookups and only those are compared with the query. This finds
+every key one edit away, counting a swap of neighbouring characters as one
+edit.
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from src.bible_base import Bible
+from src.book_registry import BOOK_COUNT, alias_key, book_aliases, book_id
+from src.search_index import SearchIndex, tokenize
+
+# Shorter queries and keys are not matched with typos
+MIN_FUZZY_LENGTH = 4
+# Prefixes up to this length have their completions ranked in advance
+SHORT_PREFIX = 3
+
+
+class Completion(NamedTuple):
+    text: str
+    # Edits from the query, 0 for prefix matches and 1 for typo matches
+    distance: int
+
+
+def is_one_edit(a: str, b: str) -> bool:
+    """Check that two strings differ by exactly one edit
+
+    An edit inserts, deletes or replaces one character or swaps two
+    neighbouring characters.
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) > 1 or a == b:
+        return False
+    position = 0
+    while position < len(a) and a[position] == b[position]:
+        position += 1
+    if len(a) < len(b):
+        return a[position:] == b[position + 1 :]
+    if a[position + 1 :] == b[position + 1 :]:
+        return True
+    # Swapped neighbours
+    return (
+        a[position : position + 1] == b[position + 1 : position + 2]
+        and a[position + 1 : position + 2] == b[position : position + 1]
+        and a[position + 2 :] == b[position + 2 :]
+    )
+
+
+def _deletes(key: str) -> Iterator[str]:
+    """Yield a key and every string with one of its characters deleted"""
+    yield key
+    for position in range(len(key)):
+        yield key[:position] + key[position + 1 :]
+
+
+class CompletionIndex:
+    """Weighted keys completed by prefix and matched with typos
+
+    Each key has a display text and a weight; completions are ranked by
+    weight and several keys may share one text, which is suggested once.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, int]]):
+        ranked = sorted(entries, key=lambda entry: entry[0])
+        self.keys: List[str] = [key for key, _, _ in ranked]
+        self.texts: List[str] = [text for _, text, _ in ranked]
+        self.weights: List[int] = [weight for _, _, weight in ranked]
+
+        # Prefix -> key positions by descending weight
+        self._short: Dict[str, List[int]] = {}
+        # Key or key with one deleted character -> key positions
+        self._deletes: Dict[str, Union[int, List[int]]] = {}
+        for position in sorted(
+            range(len(self.keys)), key=self.weights.__getitem__, reverse=True
+        ):
+            key = self.keys[position]
+            for length in range(1, min(len(key), SHORT_PREFIX) + 1):
+                self._short.setdefault(key[:length], []).append(position)
+            if len(key) >= MIN_FUZZY_LENGTH:
+                for deleted in set(_deletes(key)):
+                    found = self._deletes.get(deleted)
+                    if found is None:
+                        self._deletes[deleted] = position
+                    elif isinstance(found, int):
+                        self._deletes[deleted] = [found, position]
+                    else:
+                        found.append(position)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _prefix_positions(self, prefix: str) -> List[int]:
+        """Get the positions of all keys starting with a prefix by weight"""
+        if len(prefix) <= SHORT_PREFIX:
+            return self._short.get(prefix, [])
+        start = bisect_left(self.keys, prefix)
+        end = start
+        while end < len(self.keys) and self.keys[end].startswith(prefix):
+            end += 1
+        return sorted(range(start, end), key=self.weights.__getitem__, reverse=True)
+
+    def _fuzzy_positions(self, key: str) -> List[int]:
+        """Get the positions of keys one edit away by descending weight"""
+        if len(key) < MIN_FUZZY_LENGTH:
+            return []
+        candidates = set()
+        for deleted in _deletes(key):
+            found = self._deletes.get(deleted)
+            if found is None:
+                continue
+            if isinstance(found, int):
+                candidates.add(found)
+            else:
+                candidates.update(found)
+        matches = [
+            position for position in candidates if is_one_edit(key, self.keys[position])
+        ]
+        return sorted(matches, key=self.weights.__getitem__, reverse=True)
+
+    def _matches(self, key: str) -> Iterator[Tuple[int, int]]:
+        """Yield (distance, position) of prefix matches, then of typo matches"""
+        for position in self._prefix_positions(key):
+            yield 0, position
+        for position in self._fuzzy_positions(key):
+            yield 1, position
+
+    def complete(self, key: str, limit: int) -> List[Completion]:
+        """Complete a normalized key, filling up with typo matches"""
+        completions: List[Completion] = []
+        seen = set()
+        for distance, position in self._matches(key):
+            text = self.texts[position]
+            if text in seen:
+                continue
+            seen.add(text)
+            completions.append(Completion(text, distance))
+            if len(completions) == limit:
+                break
+        return completions
+
+
+def book_entries(bible: Bible) -> Iterator[Tuple[str, str, int]]:
+    """Yield (alias key, book name, weight) of every alias of a bible's books
+
+    Books rank in canonical order, books unknown to the registry last.
+    """
+    for alias, found in book_aliases().items():
+        if alias.isdecimal():
+            continue
+        book = bible.resolve_book(str(found))
+        if book is not None:
+            yield alias, book, -found
+    for book in bible.get_book_names():
+        if book_id(book) is None:
+            yield alias_key(book), book, -(BOOK_COUNT + 1)
+
+
+class AutocompleteIndex:
+    """Completions of the book names and vocabulary of one translation"""
+
+    def __init__(self, bible: Bible, search_index: SearchIndex):
+        self.books = CompletionIndex(book_entries(bible))
+        # Words rank by the number of verses they occur in
+        self.words = CompletionIndex(
+            (token, token, len(posting))
+            for token, posting in search_index.postings.items()
+        )
+
+    def complete_books(self, query: str, limit: int) -> List[Completion]:
+        """Complete a book name, alias or abbreviation"""
+        key = alias_key(query.strip())
+        return self.books.complete(key, limit) if key else []
+
+    def complete_words(self, query: str, limit: int) -> List[Completion]:
+        """Complete the last word of a search query"""
+        word = _last_word(query)
+        return self.words.complete(word, limit) if word else []
+
+
+def _last_word(query: str) -> Optional[str]:
+    """Get the word being typed, None after trailing whitespace"""
+    if not query or query[-1].isspace():
+        return None
+    tokens = tokenize(query)
+    return tokens[-1] if tokens else None
@@ -1,172 +1,293 @@
+import asyncio
+import re
+import sys
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.book_registry import GERMAN_BOOK_NAMES, book_id
+from src.content_hashes import ContentHashes
+from src.verse_index import VerseIndex
+from src.verse_store import VerseStore
+
+# "0#1. Mose#1#1#Am Anfang schuf Gott..."
+_HASH_LINE = re.compile(r"^\d+#(.+?)#(\d+)#(\d+)#(.+)$")
+# "1. Mose 1:1 Am Anfang schuf Gott..." or "1Mos 1:1 Am Anfang..."
+_REFERENCE_LINE = re.compile(r"^(.+?)\s+(\d+):(\d+)\s+(.+)$")
+
+ParsedVerse = Tuple[str, int, int, str]
+
+# Characters read per chunk by aload_text
+LOAD_CHUNK_SIZE = 256 * 1024
+
+
+def _split_hash_line(line: str) -> Optional[ParsedVerse]:
+    """Split a "0#Book#C#V#text" line without running a regex"""
+    parts = line.split("#", 4)
+    if len(parts) != 5:
+        return None
+    number, book, chapter, verse, text = parts
+    if not (number.isdecimal() and chapter.isdecimal() and verse.isdecimal()):
+        return None
+    book = book.strip()
+    text = text.strip()
+    if not book or not text:
+        return None
+    return book, int(chapter), int(verse), text
+
+
+def _match_verse_line(line: str, hash_first: bool) -> Optional[ParsedVerse]:
+    """Match a line against the supported verse patterns"""
+    patterns = (
+        (_HASH_LINE, _REFERENCE_LINE) if hash_first else (_REFERENCE_LINE, _HASH_LINE)
+    )
+    for pattern in patterns:
+        match = pattern.match(line)
+        if match:
+            return (
+                match.group(1).strip(),
+                int(match.group(2)),
+                int(match.group(3)),
+                match.group(4).strip(),
+            )
+    return None
 
 
 class Bible(ABC):
     """Abstract base class for Bible translations"""
 
+    # Lookup tables derived from books, rebuilt when books is replaced,
+    # changes size or is parsed into
+    _book_keys: Optional[Dict[int, str]] = None
+    _verse_index: Optional[VerseIndex] = None
+    _content_hashes: Optional[ContentHashes] = None
+    _books_source: Optional[Tuple[int, int]] = None
+
     def __init__(self, name: str):
         self.name = name
         self.books: Dict[str, Dict[int, Dict[int, str]]] = {}
 
+    def __getstate__(self) -> Dict:
+        """Pickle verses as a compact VerseStore instead of nested dicts"""
+        state = self.__dict__.copy()
+        for derived in (
+            "_book_keys",
+            "_verse_index",
+            "_content_hashes",
+            "_books_source",
+        ):
+            state.pop(derived, None)
+        if isinstance(self.books, dict):
+            state["books"] = VerseStore.from_books(self.books)
+            state["_unpack_books"] = True
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        """Restore nested dicts for bibles that were not compacted"""
+        if state.pop("_unpack_books", False):
+            state["books"] = state["books"].to_dict()
+        self.__dict__.update(state)
+
     @abstractmethod
     def load_text(self, file_path: str) -> None:
         """Load bible text from file - must be implemented by subclasses"""
         pass
 
+    async def aload_text(self, file_path: str) -> None:
+        """Load bible text from file without blocking the event loop
+
+        The file is read in chunks in the default executor, and the complete
+        lines of each chunk are parsed while the next one is read. The verses
+        replace ``books`` only once the whole file is parsed; read and decode
+        errors are raised and leave the bible unchanged.
+        """
+        loop = asyncio.get_running_loop()
+        books: Dict[str, Dict[int, Dict[int, str]]] = {}
+        pending = ""
+        with open(file_path, "r", encoding="utf-8") as file:
+            while True:
+                chunk = await loop.run_in_executor(None, file.read, LOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                pending += chunk
+                end = pending.rfind("\n")
+                if end != -1:
+                    self._parse_into(books, pending[:end])
+                    pending = pending[end + 1 :]
+        self._parse_into(books, pending)
+        self.books = books
+        self._books_source = None
+
+    def compact(self) -> None:
+        """Move all verses into an array-backed VerseStore
+
+        The getters keep their behavior, chapters and books are returned as
+        read-only mappings over the store instead of dicts.
+        """
+        if isinstance(self.books, dict):
+            self.books = VerseStore.from_books(self.books)
+
+    def _check_books_source(self) -> None:
+        """Drop the derived lookup tables if books was replaced or resized"""
+        source = (id(self.books), len(self.books))
+        if self._books_source != source:
+            self._book_keys = None
+            self._verse_index = None
+            self._content_hashes = None
+            self._books_source = source
+
+    @property
+    def verse_index(self) -> VerseIndex:
+        """Dense canonical verse IDs, built on first use"""
+        self._check_books_source()
+        if self._verse_index is None:
+            self._verse_index = VerseIndex(self.books)
+        return self._verse_index
+
+    @property
+    def content_hashes(self) -> ContentHashes:
+        """Content hashes of all chapters and the translation, built on first use"""
+        self._check_books_source()
+        if self._content_hashes is None:
+            self._content_hashes = ContentHashes(self.books)
+        return self._content_hashes
+
+    def resolve_book(self, book: str) -> Optional[str]:
+        """Find the key of a book from its name, an alias or its numeric ID"""
+        if book in self.books:
+            return book
+
+        self._check_books_source()
+        if self._book_keys is None:
+            book_keys = {}
+            for key in self.books:
+                key_id = book_id(key)
+                if key_id is not None:
+                    book_keys.setdefault(key_id, key)
+            self._book_keys = book_keys
+
+        found = book_id(book)
+        return self._book_keys.get(found) if found is not None else None
+
     def get_verse(self, book: str, chapter: int, verse: int) -> Optional[str]:
         """Get a specific verse"""
-        if book in self.books:
-            if chapter in self.books[book]:
-                if verse in self.books[book][chapter]:
-                    return self.books[book][chapter][verse]
+        chapters = self.get_book(book)
+        if chapters is not None:
+            if chapter in chapters:
+                if verse in chapters[chapter]:
+                    return chapters[chapter][verse]
         return None
 
     def get_chapter(self, book: str, chapter: int) -> Optional[Dict[int, str]]:
         """Get all verses in a chapter"""
-        if book in self.books:
-            if chapter in self.books[book]:
-                return self.books[book][chapter]
+        chapters = self.get_book(book)
+        if chapters is not None:
+            if chapter in chapters:
+                return chapters[chapter]
         return None
 
     def get_book(self, book: str) -> Optional[Dict[int, Dict[int, str]]]:
         """Get all chapters in a book"""
-        if book in self.books:
-            return self.books[book]
+        book_key = self.resolve_book(book)
+        if book_key is not None:
+            return self.books[book_key]
         return None
 
+    def verse_id(self, book: str, chapter: int, verse: int) -> Optional[int]:
+        """Get the canonical verse ID of a reference"""
+        book_key = self.resolve_book(book)
+        if book_key is None:
+            return None
+        return self.verse_index.verse_id(book_key, chapter, verse)
+
+    def verse_reference(self, verse_id: int) -> Optional[Tuple[str, int, int]]:
+        """Get the (book, chapter, verse) reference of a canonical verse ID"""
+        return self.verse_index.reference(verse_id)
+
+    def iter_range(
+        self, start: int, end: int
+    ) -> Iterator[Tuple[int, str, int, int, str]]:
+        """Yield (verse ID, book, chapter, verse, text) of verse IDs start to end
+
+        Both ends are inclusive and clamped to the verses of the bible.
+        """
+        verse_index = self.verse_index
+        # A VerseStore keeps verses in the same canonical order
+        store = self.books if isinstance(self.books, VerseStore) else None
+        for verse_id in range(max(start, 0), min(end + 1, len(verse_index))):
+            book, chapter, verse = verse_index.reference(verse_id)
+            if store is not None:
+                text = store.verse_text(verse_id)
+            else:
+                text = self.books[book][chapter][verse]
+            yield verse_id, book, chapter, verse, text
+
+    def get_range(self, start: int, end: int) -> List[Tuple[int, str, int, int, str]]:
+        """Get all verses with IDs from start to end, both inclusive"""
+        return list(self.iter_range(start, end))
+
     def get_book_names(self) -> List[str]:
         """Get list of all book names"""
         return list(self.books.keys())
 
     def get_chapter_count(self, book: str) -> int:
         """Get number of chapters in a book"""
-        if book in self.books:
-            return len(self.books[book])
+        chapters = self.get_book(book)
+        if chapters is not None:
+            return len(chapters)
         return 0
 
     def get_verse_count(self, book: str, chapter: int) -> int:
         """Get number of verses in a chapter"""
-        if book in self.books and chapter in self.books[book]:
-            return len(self.books[book][chapter])
+        chapters = self.get_book(book)
+        if chapters is not None and chapter in chapters:
+            return len(chapters[chapter])
         return 0
 
     def _parse_text(self, content: str) -> None:
-        """Parse Elberfelder 1905 specific format"""
-        import re
+        """Parse verse lines in "0#Book#C#V#text" or "Book C:V text" format"""
+        self._parse_into(self.books, content)
+        self._books_source = None
 
-        lines = content.strip().split("\n")
+    def _parse_into(
+        self, books: Dict[str, Dict[int, Dict[int, str]]], content: str
+    ) -> None:
+        """Parse verse lines and add the verses to nested book dicts"""
+        book_names: Dict[str, str] = {}
+        hash_format = None
 
-        for line in lines:
+        for line in content.strip().split("\n"):
             line = line.strip()
             if not line:
                 continue
 
-            # Text format might use German book names like "1. Mose", "2. Mose", etc.
-            patterns = [
-                # Standard format: "1. Mose 1:1 Am Anfang schuf Gott..."
-                r"^(.+?)\s+(\d+):(\d+)\s+(.+)$",
-                # Alternative format with book numbers: "1Mos 1:1 Am Anfang..."
-                r"^(\w+)\s+(\d+):(\d+)\s+(.+)$",
-                # Alternative format: "0#1. Mose#1#1#Am Anfang schuf Gott..."
-                r"^\d+#(.+?)#(\d+)#(\d+)#(.+)$",
-            ]
-
-            verse_match = None
-            for pattern in patterns:
-                verse_match = re.match(pattern, line)
-                if verse_match:
-                    break
+            # Detect the line format once per file; lines that do not fit the
+            # detected format still fall back to the full pattern match
+            if hash_format is None:
+                hash_format = _HASH_LINE.match(line) is not None
 
-            if verse_match:
-                book_name = self._normalize_german_book_name(
-                    verse_match.group(1).strip()
-                )
-                chapter_num = int(verse_match.group(2))
-                verse_num = int(verse_match.group(3))
-                verse_text = verse_match.group(4).strip()
+            parsed = _split_hash_line(line) if hash_format else None
+            if parsed is None:
+                parsed = _match_verse_line(line, hash_format)
+                if parsed is None:
+                    continue
 
-                # Initialize book if not exists
-                if book_name not in self.books:
-                    self.books[book_name] = {}
+            raw_book, chapter_num, verse_num, verse_text = parsed
+            book_name = book_names.get(raw_book)
+            if book_name is None:
+                book_name = sys.intern(self._normalize_german_book_name(raw_book))
+                book_names[raw_book] = book_name
 
-                # Initialize chapter if not exists
-                if chapter_num not in self.books[book_name]:
-                    self.books[book_name][chapter_num] = {}
+            # Initialize book and chapter if not exists
+            chapters = books.get(book_name)
+            if chapters is None:
+                chapters = books[book_name] = {}
+            verses = chapters.get(chapter_num)
+            if verses is None:
+                verses = chapters[chapter_num] = {}
 
-                # Add verse
-                self.books[book_name][chapter_num][verse_num] = verse_text
+            # Add verse
+            verses[verse_num] = verse_text
 
     def _normalize_german_book_name(self, book_name: str) -> str:
         """Normalize German book names to consistent format"""
-        # Common German book name mappings
-        name_mappings = {
-            "1Mos": "1. Mose",
-            "2Mos": "2. Mose",
-            "3Mos": "3. Mose",
-            "4Mos": "4. Mose",
-            "5Mos": "5. Mose",
-            "Jos": "Josua",
-            "Ri": "Richter",
-            "Ruth": "Ruth",
-            "1Sam": "1. Samuel",
-            "2Sam": "2. Samuel",
-            "1Kön": "1. Könige",
-            "2Kön": "2. Könige",
-            "1Chr": "1. Chronik",
-            "2Chr": "2. Chronik",
-            "Esr": "Esra",
-            "Neh": "Nehemia",
-            "Est": "Ester",
-            "Hi": "Hiob",
-            "Ps": "Psalmen",
-            "Spr": "Sprüche",
-            "Pred": "Prediger",
-            "Hld": "Hohelied",
-            "Jes": "Jesaja",
-            "Jer": "Jeremia",
-            "Kla": "Klagelieder",
-            "Hes": "Hesekiel",
-            "Dan": "Daniel",
-            "Hos": "Hosea",
-            "Joe": "Joel",
-            "Am": "Amos",
-            "Ob": "Obadja",
-            "Jon": "Jona",
-            "Mi": "Micha",
-            "Nah": "Nahum",
-            "Hab": "Habakuk",
-            "Zef": "Zefanja",
-            "Hag": "Haggai",
-            "Sach": "Sacharja",
-            "Mal": "Maleachi",
-            "Mt": "Matthäus",
-            "Mk": "Markus",
-            "Lk": "Lukas",
-            "Joh": "Johannes",
-            "Apg": "Apostelgeschichte",
-            "Röm": "Römer",
-            "1Kor": "1. Korinther",
-            "2Kor": "2. Korinther",
-            "Gal": "Galater",
-            "Eph": "Epheser",
-            "Phil": "Philipper",
-            "Kol": "Kolosser",
-            "1Thess": "1. Thessalonicher",
-            "2Thess": "2. Thessalonicher",
-            "1Tim": "1. Timotheus",
-            "2Tim": "2. Timotheus",
-            "Tit": "Titus",
-            "Phlm": "Philemon",
-            "Hebr": "Hebräer",
-            "Jak": "Jakobus",
-            "1Petr": "1. Petrus",
-            "2Petr": "2. Petrus",
-            "1Joh": "1. Johannes",
-            "2Joh": "2. Johannes",
-            "3Joh": "3. Johannes",
-            "Jud": "Judas",
-            "Offb": "Offenbarung",
-        }
-
-        return name_mappings.get(book_name, book_name)
+        return GERMAN_BOOK_NAMES.get(book_name, book_name)
@@ -0,0 +1,156 @@
+"""Verse-level differences between two translations or revisions
+
+Verses are aligned by book ID, chapter and verse, so a German and an English
+translation line up as well as two revisions of one text file. Each verse is
+reduced to a short blake2b fingerprint of its text, and comparing two bibles
+is one dict lookup per verse.
+
+Compare two text files with:
+
+    python -m src.bible_diff src/texts/elberfelder1905.txt revised/elberfelder1905.txt
+"""
+
+import argparse
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from src.bible_base import Bible
+from src.book_registry import BOOK_COUNT, book_id
+
+# Book ID or, for unknown books, the book name after all known books
+VerseKey = Tuple[int, str, int, int]
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+
+class VerseChange(NamedTuple):
+    change: str
+    book: str
+    chapter: int
+    verse: int
+    # Text before and after the change, None for added and removed verses
+    old: Optional[str]
+    new: Optional[str]
+
+
+class BibleDiff(NamedTuple):
+    added: List[VerseChange]
+    removed: List[VerseChange]
+    changed: List[VerseChange]
+
+    def is_empty(self) -> bool:
+        """Check that both bibles have the same verses"""
+        return not (self.added or self.removed or self.changed)
+
+    def changes(self) -> List[VerseChange]:
+        """Get all changes in canonical verse order"""
+        books: Dict[str, Tuple[int, str]] = {}
+        return sorted(
+            [*self.added, *self.removed, *self.changed],
+            key=lambda change: _verse_key(
+                books, change.book, change.chapter, change.verse
+            ),
+        )
+
+    def chapters(self) -> Set[Tuple[str, int]]:
+        """Get the (book, chapter) pairs that have any change"""
+        return {(change.book, change.chapter) for changes in self for change in changes}
+
+
+def verse_fingerprint(text: str) -> bytes:
+    """Hash a verse text to an 8 byte fingerprint"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+
+def _verse_key(
+    books: Dict[str, Tuple[int, str]], book: str, chapter: int, verse: int
+) -> VerseKey:
+    """Build the alignment key of a verse, caching book lookups in ``books``"""
+    book_key = books.get(book)
+    if book_key is None:
+        found = book_id(book)
+        book_key = books[book] = (found, "") if found else (BOOK_COUNT + 1, book)
+    return (*book_key, chapter, verse)
+
+
+def iter_fingerprints(
+    bible: Bible,
+) -> Iterator[Tuple[VerseKey, bytes, str, int, int, str]]:
+    """Yield (key, fingerprint, book, chapter, verse, text) of every verse"""
+    books: Dict[str, Tuple[int, str]] = {}
+    for _, book, chapter, verse, text in bible.iter_range(0, len(bible.verse_index)):
+        key = _verse_key(books, book, chapter, verse)
+        yield key, verse_fingerprint(text), book, chapter, verse, text
+
+
+def diff_bibles(old: Bible, new: Bible) -> BibleDiff:
+    """Find the verses added, removed and changed from one bible to another"""
+    old_verses = {
+        key: (fingerprint, book, chapter, verse, text)
+        for key, fingerprint, book, chapter, verse, text in iter_fingerprints(old)
+    }
+
+    added = []
+    changed = []
+    for key, fingerprint, book, chapter, verse, text in iter_fingerprints(new):
+        previous = old_verses.pop(key, None)
+        if previous is None:
+            added.append(VerseChange(ADDED, book, chapter, verse, None, text))
+        elif previous[0] != fingerprint:
+            changed.append(
+                VerseChange(CHANGED, book, chapter, verse, previous[4], text)
+            )
+
+    removed = [
+        VerseChange(REMOVED, book, chapter, verse, text, None)
+        for _, book, chapter, verse, text in old_verses.values()
+    ]
+    return BibleDiff(added, removed, changed)
+
+
+def format_change(change: VerseChange) -> str:
+    """Format a change as one line, prefixed with +, - or ~"""
+    reference = f"{change.book} {change.chapter}:{change.verse}"
+    if change.change == ADDED:
+        return f"+ {reference} {change.new}"
+    if change.change == REMOVED:
+        return f"- {reference} {change.old}"
+    return f"~ {reference} {change.old} -> {change.new}"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Print the verse differences between two text files"""
+    from src.bible_manager import find_bible_class
+
+    parser = argparse.ArgumentParser(description="Compare two bible text files")
+    parser.add_argument("old", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument(
+        "--summary", action="store_true", help="only print the number of changes"
+    )
+    args = parser.parse_args(argv)
+
+    bibles = []
+    for path in (args.old, args.new):
+        bible_class = find_bible_class(path.stem.lower())
+        if bible_class is None:
+            parser.error(f"No specific parser found for {path.name}")
+        bible = bible_class()
+        bible.load_text(str(path))
+        bibles.append(bible)
+
+    diff = diff_bibles(*bibles)
+    if not args.summary:
+        for change in diff.changes():
+            print(format_change(change))
+    print(
+        f"{len(diff.added)} added, {len(diff.removed)} removed, "
+        f"{len(diff.changed)} changed"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,464 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple, Type
 
+from src.autocomplete import AutocompleteIndex
 from src.bible_base import Bible
+from src.bible_diff import BibleDiff, diff_bibles
+from src.corpus import CORPUS_SUFFIX, is_corpus_current, load_corpus
+from src.corpus_stats import CorpusStatistics
 from src.elberfelder1905 import Elberfelder1905
+from src.lazy_books import LazyBooks
 from src.schlachter1951 import Schlachter1951
+from src.search_index import SearchIndex
+from src.shared_corpus import attach_corpus
 from src.world import WorldEnglishBible
 
+# Map file patterns to bible classes
+BIBLE_MAPPINGS: Dict[str, Type[Bible]] = {
+    "elberfelder1905": Elberfelder1905,
+    "world": WorldEnglishBible,
+    "schlachter1951": Schlachter1951,
+}
+
+# Loading status of a translation
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+def find_bible_class(filename: str) -> Optional[Type[Bible]]:
+    """Find the bible class whose file pattern matches a file name"""
+    for pattern, cls in BIBLE_MAPPINGS.items():
+        if pattern in filename:
+            return cls
+    return None
+
+
+def _load_bible_file(
+    bible_class: Type[Bible], file_path: str, compact: bool = False
+) -> Bible:
+    """Create and load a bible, run inside a worker process"""
+    bible = bible_class()
+    bible.load_text(file_path)
+    if compact:
+        bible.compact()
+    return bible
+
+
+def _load_bible_corpus(bible_class: Type[Bible], corpus_path: str) -> Bible:
+    """Create a bible served from a memory-mapped corpus file"""
+    bible = bible_class()
+    bible.name, bible.books = load_corpus(corpus_path)
+    return bible
+
+
+def _attach_shared_bible(bible_class: Type[Bible], segment: str) -> Bible:
+    """Create a bible served from a shared memory segment"""
+    bible = bible_class()
+    bible.name, bible.books = attach_corpus(segment)
+    return bible
+
+
+def _load_lazy_bible(
+    bible_class: Type[Bible], file_path: str, max_bytes: int, compact: bool
+) -> Bible:
+    """Create a bible that parses its books on first access"""
+    bible = bible_class()
+    bible.books = LazyBooks(bible, file_path, max_bytes, compact)
+    return bible
+
+
+def _hash_bible(bible: Bible) -> None:
+    """Build the verse IDs and content hashes of a bible
+
+    Done at load time rather than on the first request that needs them.
+    """
+    bible.verse_index
+    bible.content_hashes
+
+
+def _index_bible(bible: Bible) -> Tuple[SearchIndex, float]:
+    """Build the search index, verse IDs and content hashes of a bible
+
+    Returns the index and the seconds it took to build.
+    """
+    started = time.perf_counter()
+    search_index = SearchIndex(bible)
+    seconds = time.perf_counter() - started
+    _hash_bible(bible)
+    return search_index, seconds
+
 
 class BibleManager:
     """Manages multiple Bible translations"""
 
     def __init__(self):
         self.bibles: Dict[str, Bible] = {}
+        self.search_indexes: Dict[str, SearchIndex] = {}
+        self.autocomplete_indexes: Dict[str, AutocompleteIndex] = {}
+        self.statistics: Dict[str, CorpusStatistics] = {}
+        # Translation name loaded from each text file, by lowercase file stem
+        self.files: Dict[str, str] = {}
+        self.reload_listeners: List[Callable[[str, Optional[BibleDiff]], None]] = []
+        # Verses changed by the last reload of each translation
+        self.diffs: Dict[str, BibleDiff] = {}
+        # Seconds spent loading each translation and building its search index
+        self.load_seconds: Dict[str, float] = {}
+        self.index_seconds: Dict[str, float] = {}
+        # Loading status of every translation found in the texts directory
+        self.status: Dict[str, str] = {}
+        self.compact = False
+        self.lazy_max_bytes: Optional[int] = None
+        self.build_indexes = True
+
+    async def load_bibles(
+        self,
+        texts_dir: str = "src/texts/",
+        max_workers: Optional[int] = None,
+        compact: bool = False,
+        lazy_max_bytes: Optional[int] = None,
+        build_indexes: bool = True,
+    ):
+        """Load all bible texts from directory
 
-    async def load_bibles(self, texts_dir: str = "src/texts/"):
-        """Load all bible texts from directory"""
+        Without ``max_workers``, files are read in chunks off the event loop
+        and parsed one after the other. With ``max_workers`` set, each file is
+        parsed in a separate worker process. Either way every bible is added
+        as soon as its file is parsed, and ``status`` tells which translations
+        are still loading.
+        With ``compact`` set, verses are kept in an array-backed VerseStore.
+        Files with an up-to-date compiled corpus next to them are memory-mapped
+        instead of parsed.
+        With ``lazy_max_bytes`` set, files are only indexed by book and books
+        are parsed on first access, keeping at most about that many source
+        bytes parsed per translation.
+        Without ``build_indexes``, search indexes and content hashes are not
+        built when a bible is added, e.g. in a process that only publishes
+        the translations to others.
+        """
+        self.compact = compact
+        self.lazy_max_bytes = lazy_max_bytes
+        self.build_indexes = build_indexes
         texts_path = Path(texts_dir)
         if not texts_path.exists():
             print(f"Warning: Texts directory {texts_dir} not found")
             return
 
-        # Map file patterns to bible classes
-        bible_mappings = {
-            "elberfelder1905": Elberfelder1905,
-            "world": WorldEnglishBible,
-            "schlachter1951": Schlachter1951,
-        }
-
+        jobs = []
         for file_path in texts_path.glob("*.txt"):
             filename = file_path.stem.lower()
 
             # Try to match filename to known translations
-            bible_class = None
-            for pattern, cls in bible_mappings.items():
-                if pattern in filename:
-                    bible_class = cls
-                    break
+            bible_class = find_bible_class(filename)
 
             # If no specific class found, skip or use a generic approach
             if bible_class is None:
                 print(f"Warning: No specific parser found for {filename}, skipping")
                 continue
 
-            # Create and load bible
-            bible = bible_class()
-            bible.load_text(str(file_path))
+            self._set_status(bible_class, LOADING)
+            if not await self._load_without_parsing(filename, bible_class, file_path):
+                jobs.append((filename, bible_class, str(file_path)))
+
+        if not max_workers:
+            for filename, bible_class, file_path in jobs:
+                await self._load_async(filename, bible_class, file_path, compact)
+            return
+
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs) or 1)) as pool:
+            await asyncio.gather(
+                *(
+                    self._load_in_pool(pool, filename, bible_class, file_path, compact)
+                    for filename, bible_class, file_path in jobs
+                )
+            )
+
+    async def load_shared_corpus(self, segments: Dict[str, str]) -> None:
+        """Attach translations a parent process published in shared memory
+
+        ``segments`` maps lowercase file stems to segment names.
+        """
+        for filename, segment in segments.items():
+            bible_class = find_bible_class(filename)
+            if bible_class is None:
+                print(f"Warning: No specific parser found for {filename}, skipping")
+                continue
+
+            started = time.perf_counter()
+            try:
+                bible = _attach_shared_bible(bible_class, segment)
+            except (OSError, ValueError) as e:
+                print(f"Error attaching {filename} from shared memory {segment}: {e}")
+                self._set_status(bible_class, FAILED)
+                continue
+            await self._add_bible(filename, bible, started)
+
+    async def reload_file(self, file_path: str) -> None:
+        """Reload the translation of a changed text or corpus file
+
+        The file is parsed off the event loop and the new bible replaces the
+        old one in a single assignment, so requests see either version.
+        Deleted files remove their translation.
+        """
+        path = Path(file_path).with_suffix(".txt")
+        filename = path.stem.lower()
+        bible_class = find_bible_class(filename)
+        if bible_class is None:
+            return
+
+        if not path.exists():
+            name = self.files.pop(filename, None)
+            if name is not None:
+                self.bibles.pop(name, None)
+                self.search_indexes.pop(name, None)
+                self.autocomplete_indexes.pop(name, None)
+                self.statistics.pop(name, None)
+                self.load_seconds.pop(name, None)
+                self.index_seconds.pop(name, None)
+                self.status.pop(name, None)
+                self.diffs.pop(name, None)
+                print(f"Removed {name}")
+                self._notify_reload(name, None)
+            return
+
+        if await self._load_without_parsing(filename, bible_class, path):
+            return
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            bible = await loop.run_in_executor(
+                None, _load_bible_file, bible_class, str(path), self.compact
+            )
+        except Exception as e:
+            print(f"Error loading {filename} from {path}: {e}")
+            self._set_status(bible_class, FAILED)
+            return
+
+        previous = self.bibles.get(bible.name)
+        diff = None
+        if previous is not None and not isinstance(previous.books, LazyBooks):
+            diff = await loop.run_in_executor(None, diff_bibles, previous, bible)
+        await self._add_bible(filename, bible, started, diff)
+
+    def add_reload_listener(
+        self, listener: Callable[[str, Optional[BibleDiff]], None]
+    ) -> None:
+        """Call a listener whenever a translation changes
+
+        The listener gets the translation name and the verses that changed
+        if they are known, or None if the whole translation may have changed.
+        """
+        self.reload_listeners.append(listener)
 
-            if bible.books:  # Only add if successfully loaded
-                self.bibles[bible.name] = bible
-                print(f"Loaded {bible.name} with {len(bible.books)} books")
+    def _notify_reload(self, translation: str, diff: Optional[BibleDiff]) -> None:
+        for listener in self.reload_listeners:
+            listener(translation, diff)
+
+    def _set_status(self, bible_class: Type[Bible], status: str) -> None:
+        """Set the loading status of a translation that is not loaded yet"""
+        name = bible_class().name
+        if name not in self.bibles:
+            self.status[name] = status
+
+    def is_ready(self) -> bool:
+        """Check that no translation is still loading"""
+        return LOADING not in self.status.values()
+
+    async def _load_without_parsing(
+        self, filename: str, bible_class: Type[Bible], file_path: Path
+    ) -> bool:
+        """Add a bible from its compiled corpus or lazily, if possible
+
+        Opening the corpus and scanning the text file for its books run in
+        the default executor.
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        corpus_path = file_path.with_suffix(CORPUS_SUFFIX)
+        if is_corpus_current(corpus_path, file_path):
+            try:
+                bible = await loop.run_in_executor(
+                    None, _load_bible_corpus, bible_class, str(corpus_path)
+                )
+            except (OSError, ValueError) as e:
+                print(f"Error loading {filename} from {corpus_path}: {e}")
+                self._set_status(bible_class, FAILED)
             else:
-                print(f"Warning: No content loaded from {filename}")
+                await self._add_bible(filename, bible, started)
+                return True
+
+        if self.lazy_max_bytes:
+            try:
+                bible = await loop.run_in_executor(
+                    None,
+                    _load_lazy_bible,
+                    bible_class,
+                    str(file_path),
+                    self.lazy_max_bytes,
+                    self.compact,
+                )
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Error loading {filename} from {file_path}: {e}")
+                self._set_status(bible_class, FAILED)
+            else:
+                await self._add_bible(filename, bible, started)
+            return True
+
+        return False
+
+    async def _load_in_pool(
+        self,
+        pool: ProcessPoolExecutor,
+        filename: str,
+        bible_class: Type[Bible],
+        file_path: str,
+        compact: bool,
+    ) -> None:
+        """Parse one bible file in the pool and add it once it is done"""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            bible = await loop.run_in_executor(
+                pool, _load_bible_file, bible_class, file_path, compact
+            )
+        except Exception as e:
+            print(f"Error loading {filename} from {file_path}: {e}")
+            self._set_status(bible_class, FAILED)
+            return
+        await self._add_bible(filename, bible, started)
+
+    async def _load_async(
+        self, filename: str, bible_class: Type[Bible], file_path: str, compact: bool
+    ) -> None:
+        """Read and parse one bible file without blocking the event loop"""
+        started = time.perf_counter()
+        bible = bible_class()
+        try:
+            await bible.aload_text(file_path)
+        except Exception as e:
+            print(f"Error loading {filename} from {file_path}: {e}")
+            self._set_status(bible_class, FAILED)
+            return
+        if compact:
+            bible.compact()
+        await self._add_bible(filename, bible, started)
+
+    async def _add_bible(
+        self,
+        filename: str,
+        bible: Bible,
+        started: float,
+        diff: Optional[BibleDiff] = None,
+    ) -> None:
+        """Add a loaded bible if it has any content
+
+        ``diff`` holds the verses changed from the bible it replaces. The
+        search index and content hashes are built in the default executor,
+        so requests are served meanwhile.
+        """
+        if bible.books:  # Only add if successfully loaded
+            self.load_seconds[bible.name] = time.perf_counter() - started
+            loop = asyncio.get_running_loop()
+            if not self.build_indexes:
+                self.search_indexes.pop(bible.name, None)
+            elif isinstance(bible.books, LazyBooks):
+                # Lazy bibles build their search index on the first search
+                self.search_indexes.pop(bible.name, None)
+                await loop.run_in_executor(None, _hash_bible, bible)
+            else:
+                search_index, seconds = await loop.run_in_executor(
+                    None, _index_bible, bible
+                )
+                self.search_indexes[bible.name] = search_index
+                self.index_seconds[bible.name] = seconds
+            self.autocomplete_indexes.pop(bible.name, None)
+            self.statistics.pop(bible.name, None)
+            self.bibles[bible.name] = bible
+            self.files[filename] = bible.name
+            self.status[bible.name] = READY
+            if diff is not None:
+                self.diffs[bible.name] = diff
+            else:
+                self.diffs.pop(bible.name, None)
+            print(f"Loaded {bible.name} with {len(bible.books)} books")
+            self._notify_reload(bible.name, diff)
+        else:
+            print(f"Warning: No content loaded from {filename}")
+            if bible.name not in self.bibles:
+                self.status[bible.name] = FAILED
 
     def get_bible(self, translation: str) -> Optional[Bible]:
         """Get a specific bible translation"""
         return self.bibles.get(translation)
 
+    async def get_search_index(self, translation: str) -> Optional[SearchIndex]:
+        """Get the full-text search index of a translation
+
+        Indexes missing after loading, like those of lazy bibles, are built
+        in the default executor on first use. They are only kept if the
+        translation was not reloaded meanwhile.
+        """
+        search_index = self.search_indexes.get(translation)
+        if search_index is not None or translation not in self.bibles:
+            return search_index
+
+        bible = self.bibles[translation]
+        loop = asyncio.get_running_loop()
+        search_index, seconds = await loop.run_in_executor(None, _index_bible, bible)
+        if self.bibles.get(translation) is bible:
+            if translation not in self.search_indexes:
+                self.search_indexes[translation] = search_index
+                self.index_seconds[translation] = seconds
+            search_index = self.search_indexes[translation]
+        return search_index
+
+    async def get_autocomplete_index(
+        self, translation: str
+    ) -> Optional[AutocompleteIndex]:
+        """Get the book and word completions of a translation, built on first use
+
+        The completions, and the search index they need if it is missing, are
+        built in the default executor. They are only kept if the translation
+        was not reloaded meanwhile.
+        """
+        autocomplete_index = self.autocomplete_indexes.get(translation)
+        if autocomplete_index is not None or translation not in self.bibles:
+            return autocomplete_index
+
+        bible = self.bibles[translation]
+        search_index = await self.get_search_index(translation)
+        loop = asyncio.get_running_loop()
+        autocomplete_index = await loop.run_in_executor(
+            None, AutocompleteIndex, bible, search_index
+        )
+        if self.bibles.get(translation) is bible:
+            self.autocomplete_indexes[translation] = autocomplete_index
+        return autocomplete_index
+
+    async def get_statistics(self, translation: str) -> Optional[CorpusStatistics]:
+        """Get the word statistics of a translation, built on first use
+
+        The statistics, and the search index they need if it is missing, are
+        built in the default executor. They are only kept if the translation
+        was not reloaded meanwhile. Raises RuntimeError if NumPy is not
+        installed.
+        """
+        statistics = self.statistics.get(translation)
+        if statistics is not None or translation not in self.bibles:
+            return statistics
+
+        bible = self.bibles[translation]
+        search_index = await self.get_search_index(translation)
+        loop = asyncio.get_running_loop()
+        statistics = await loop.run_in_executor(None, CorpusStatistics, search_index)
+        if self.bibles.get(translation) is bible:
+            self.statistics[translation] = statistics
+        return statistics
+
     def get_translation_names(self) -> List[str]:
         """Get list of available translations"""
         return list(self.bibles.keys())
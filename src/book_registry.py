@@ -0,0 +1,251 @@
+"""Canonical book registry
+
+Every book has a numeric ID from 1 (1. Mose) to 66 (Offenbarung) and a
+German canonical name. German and English names and abbreviations resolve
+to the ID through one dict lookup; aliases are compared case-insensitively
+and without spaces and dots, so "1. Mose", "1Mos", "genesis" and "Gen"
+all name the same book.
+"""
+
+import unicodedata
+from typing import Dict, List, Optional
+
+# Common German book name mappings
+GERMAN_BOOK_NAMES: Dict[str, str] = {
+    "1Mos": "1. Mose",
+    "2Mos": "2. Mose",
+    "3Mos": "3. Mose",
+    "4Mos": "4. Mose",
+    "5Mos": "5. Mose",
+    "Jos": "Josua",
+    "Ri": "Richter",
+    "Ruth": "Ruth",
+    "1Sam": "1. Samuel",
+    "2Sam": "2. Samuel",
+    "1Kön": "1. Könige",
+    "2Kön": "2. Könige",
+    "1Chr": "1. Chronik",
+    "2Chr": "2. Chronik",
+    "Esr": "Esra",
+    "Neh": "Nehemia",
+    "Est": "Ester",
+    "Hi": "Hiob",
+    "Ps": "Psalmen",
+    "Spr": "Sprüche",
+    "Pred": "Prediger",
+    "Hld": "Hohelied",
+    "Jes": "Jesaja",
+    "Jer": "Jeremia",
+    "Kla": "Klagelieder",
+    "Hes": "Hesekiel",
+    "Dan": "Daniel",
+    "Hos": "Hosea",
+    "Joe": "Joel",
+    "Am": "Amos",
+    "Ob": "Obadja",
+    "Jon": "Jona",
+    "Mi": "Micha",
+    "Nah": "Nahum",
+    "Hab": "Habakuk",
+    "Zef": "Zefanja",
+    "Hag": "Haggai",
+    "Sach": "Sacharja",
+    "Mal": "Maleachi",
+    "Mt": "Matthäus",
+    "Mk": "Markus",
+    "Lk": "Lukas",
+    "Joh": "Johannes",
+    "Apg": "Apostelgeschichte",
+    "Röm": "Römer",
+    "1Kor": "1. Korinther",
+    "2Kor": "2. Korinther",
+    "Gal": "Galater",
+    "Eph": "Epheser",
+    "Phil": "Philipper",
+    "Kol": "Kolosser",
+    "1Thess": "1. Thessalonicher",
+    "2Thess": "2. Thessalonicher",
+    "1Tim": "1. Timotheus",
+    "2Tim": "2. Timotheus",
+    "Tit": "Titus",
+    "Phlm": "Philemon",
+    "Hebr": "Hebräer",
+    "Jak": "Jakobus",
+    "1Petr": "1. Petrus",
+    "2Petr": "2. Petrus",
+    "1Joh": "1. Johannes",
+    "2Joh": "2. Johannes",
+    "3Joh": "3. Johannes",
+    "Jud": "Judas",
+    "Offb": "Offenbarung",
+}
+
+# English book names mapped to the German names used as canonical keys
+ENGLISH_BOOK_NAMES: Dict[str, str] = {
+    "Genesis": "1. Mose",
+    "Exodus": "2. Mose",
+    "Leviticus": "3. Mose",
+    "Numbers": "4. Mose",
+    "Deuteronomy": "5. Mose",
+    "Joshua": "Josua",
+    "Judges": "Richter",
+    "Ruth": "Ruth",
+    "1 Samuel": "1. Samuel",
+    "2 Samuel": "2. Samuel",
+    "1 Kings": "1. Könige",
+    "2 Kings": "2. Könige",
+    "1 Chronicles": "1. Chronik",
+    "2 Chronicles": "2. Chronik",
+    "Ezra": "Esra",
+    "Nehemiah": "Nehemia",
+    "Esther": "Ester",
+    "Job": "Hiob",
+    "Psalms": "Psalmen",
+    "Proverbs": "Sprüche",
+    "Ecclesiastes": "Prediger",
+    "Song of Solomon": "Hohelied",
+    "Isaiah": "Jesaja",
+    "Jeremiah": "Jeremia",
+    "Lamentations": "Klagelieder",
+    "Ezekiel": "Hesekiel",
+    "Daniel": "Daniel",
+    "Hosea": "Hosea",
+    "Joel": "Joel",
+    "Amos": "Amos",
+    "Obadiah": "Obadja",
+    "Jonah": "Jona",
+    "Micah": "Micha",
+    "Nahum": "Nahum",
+    "Habakkuk": "Habakuk",
+    "Zephaniah": "Zefanja",
+    "Haggai": "Haggai",
+    "Zechariah": "Sacharja",
+    "Malachi": "Maleachi",
+    "Matthew": "Matthäus",
+    "Mark": "Markus",
+    "Luke": "Lukas",
+    "John": "Johannes",
+    "Acts": "Apostelgeschichte",
+    "Romans": "Römer",
+    "1 Corinthians": "1. Korinther",
+    "2 Corinthians": "2. Korinther",
+    "Galatians": "Galater",
+    "Ephesians": "Epheser",
+    "Philippians": "Philipper",
+    "Colossians": "Kolosser",
+    "1 Thessalonians": "1. Thessalonicher",
+    "2 Thessalonians": "2. Thessalonicher",
+    "1 Timothy": "1. Timotheus",
+    "2 Timothy": "2. Timotheus",
+    "Titus": "Titus",
+    "Philemon": "Philemon",
+    "Hebrews": "Hebräer",
+    "James": "Jakobus",
+    "1 Peter": "1. Petrus",
+    "2 Peter": "2. Petrus",
+    "1 John": "1. Johannes",
+    "2 John": "2. Johannes",
+    "3 John": "3. Johannes",
+    "Jude": "Judas",
+    "Revelation": "Offenbarung",
+}
+
+# Common English abbreviations mapped to the German names
+ENGLISH_ABBREVIATIONS: Dict[str, str] = {
+    "Gen": "1. Mose",
+    "Ex": "2. Mose",
+    "Exod": "2. Mose",
+    "Lev": "3. Mose",
+    "Num": "4. Mose",
+    "Deut": "5. Mose",
+    "Josh": "Josua",
+    "Judg": "Richter",
+    "Rut": "Ruth",
+    "1 Sam": "1. Samuel",
+    "2 Sam": "2. Samuel",
+    "1 Kgs": "1. Könige",
+    "2 Kgs": "2. Könige",
+    "1 Chron": "1. Chronik",
+    "2 Chron": "2. Chronik",
+    "Ezr": "Esra",
+    "Esth": "Ester",
+    "Psa": "Psalmen",
+    "Psalm": "Psalmen",
+    "Prov": "Sprüche",
+    "Eccl": "Prediger",
+    "Song": "Hohelied",
+    "Isa": "Jesaja",
+    "Lam": "Klagelieder",
+    "Ezek": "Hesekiel",
+    "Obad": "Obadja",
+    "Mic": "Micha",
+    "Zeph": "Zefanja",
+    "Zech": "Sacharja",
+    "Matt": "Matthäus",
+    "Mrk": "Markus",
+    "Luk": "Lukas",
+    "Rom": "Römer",
+    "1 Cor": "1. Korinther",
+    "2 Cor": "2. Korinther",
+    "Ephes": "Epheser",
+    "Col": "Kolosser",
+    "1 Thes": "1. Thessalonicher",
+    "2 Thes": "2. Thessalonicher",
+    "Philem": "Philemon",
+    "Heb": "Hebräer",
+    "Jas": "Jakobus",
+    "1 Pet": "1. Petrus",
+    "2 Pet": "2. Petrus",
+    "1 Jn": "1. Johannes",
+    "2 Jn": "2. Johannes",
+    "3 Jn": "3. Johannes",
+    "Rev": "Offenbarung",
+}
+
+# Canonical German names in canonical order, the book ID is the index + 1
+BOOK_NAMES: List[str] = list(GERMAN_BOOK_NAMES.values())
+BOOK_COUNT = len(BOOK_NAMES)
+
+
+def alias_key(name: str) -> str:
+    """Normalize a book name for alias lookups"""
+    name = unicodedata.normalize("NFC", name).casefold()
+    return name.replace(" ", "").replace(".", "")
+
+
+def _build_aliases() -> Dict[str, int]:
+    """Map the normalized names, abbreviations and IDs of all books to IDs"""
+    aliases = {}
+    for table in (ENGLISH_ABBREVIATIONS, ENGLISH_BOOK_NAMES, GERMAN_BOOK_NAMES):
+        for alias, name in table.items():
+            aliases[alias_key(alias)] = BOOK_NAMES.index(name) + 1
+    for book_id, name in enumerate(BOOK_NAMES, 1):
+        aliases[alias_key(name)] = book_id
+        aliases[str(book_id)] = book_id
+    return aliases
+
+
+_BOOK_ALIASES = _build_aliases()
+
+
+def book_aliases() -> Dict[str, int]:
+    """Get the normalized names, abbreviations and IDs of all books with IDs"""
+    return dict(_BOOK_ALIASES)
+
+
+def book_id(name: str) -> Optional[int]:
+    """Get the ID of a book from a name, abbreviation or numeric ID"""
+    return _BOOK_ALIASES.get(alias_key(name.strip()))
+
+
+def book_name(book_id: int) -> Optional[str]:
+    """Get the canonical German name of a book ID"""
+    if 1 <= book_id <= BOOK_COUNT:
+        return BOOK_NAMES[book_id - 1]
+    return None
+
+
+def canonical_book_name(name: str) -> str:
+    """Map German or English book names and abbreviations to the German name"""
+    found = book_id(name)
+    return BOOK_NAMES[found - 1] if found else name
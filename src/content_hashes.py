@@ -0,0 +1,38 @@
+import hashlib
+from collections.abc import Mapping
+from typing import Dict, Optional
+
+# Bytes per hash, printed as twice as many hex digits
+DIGEST_SIZE = 8
+
+
+def chapter_hash(verses: Mapping) -> str:
+    """Hash the verse numbers and texts of a chapter"""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for verse in sorted(verses):
+        digest.update(f"{verse}\t{verses[verse]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ContentHashes:
+    """Content hashes of every chapter and of the whole translation
+
+    A chapter hash changes exactly when a verse of the chapter is added,
+    removed or changed, so a URL containing it can be cached forever. The
+    translation hash covers all book names and chapter hashes.
+    """
+
+    def __init__(self, books: Mapping):
+        # Book -> chapter -> chapter hash
+        self.chapters: Dict[str, Dict[int, str]] = {}
+        digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        for book, book_chapters in books.items():
+            hashes = self.chapters[book] = {}
+            for chapter in sorted(book_chapters):
+                hashes[chapter] = chapter_hash(book_chapters[chapter])
+                digest.update(f"{book}\t{chapter}\t{hashes[chapter]}\n".encode())
+        self.translation = digest.hexdigest()
+
+    def chapter(self, book: str, chapter: int) -> Optional[str]:
+        """Get the hash of a chapter, None if it does not exist"""
+        return self.chapters.get(book, {}).get(chapter)
@@ -0,0 +1,224 @@
+"""Precompiled binary corpus files
+
+A corpus file holds one translation in the layout of a VerseStore so it can
+be memory-mapped and served without parsing. All integers are little-endian.
+
+    header      magic "PYBL", version, counts and section sizes
+    name        translation name, UTF-8
+    books       book names, UTF-8, separated by newlines
+    book index  array('H') chapter count per book
+    chapters    array('H') chapter numbers
+    starts      array('I') first verse position per chapter, plus the end
+    verses      array('H') verse numbers
+    offsets     array('I') verse text offsets, plus the end
+    text        verse texts, UTF-8
+
+Every section starts on a 4 byte boundary.
+
+Build the corpus files next to the text files with:
+
+    python -m src.corpus src/texts/
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from src.verse_store import Buffer, VerseStore
+
+CORPUS_SUFFIX = ".pybl"
+MAGIC = b"PYBL"
+VERSION = 1
+
+# magic, version, name size, books size, book count, chapter count,
+# verse count, text size
+_HEADER = struct.Struct("<4sHxxIIIIII")
+
+
+def _pad(size: int) -> int:
+    """Round a section size up to the next 4 byte boundary"""
+    return (size + 3) & ~3
+
+
+def _little_endian(values: array) -> bytes:
+    """Serialize an array in little-endian byte order"""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def dump_corpus(name: str, store: VerseStore) -> bytes:
+    """Serialize a translation into the binary corpus format"""
+    book_names = list(store.chapters)
+    book_index = array("H")
+    chapter_numbers = array("H")
+    chapter_starts = array("I")
+    for book in book_names:
+        chapters = store.chapters[book]
+        book_index.append(len(chapters))
+        for chapter, (start, _) in chapters.items():
+            chapter_numbers.append(chapter)
+            chapter_starts.append(start)
+    chapter_starts.append(store.verse_count)
+
+    name_bytes = name.encode("utf-8")
+    books_bytes = "\n".join(book_names).encode("utf-8")
+    sections = [
+        name_bytes,
+        books_bytes,
+        _little_endian(book_index),
+        _little_endian(chapter_numbers),
+        _little_endian(chapter_starts),
+        _little_endian(array("H", store.verse_numbers)),
+        _little_endian(array("I", store.offsets)),
+        bytes(store.text),
+    ]
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        len(name_bytes),
+        len(books_bytes),
+        len(book_names),
+        len(chapter_numbers),
+        store.verse_count,
+        len(store.text),
+    )
+
+    parts = [header]
+    for section in sections:
+        parts.append(section)
+        parts.append(b"\0" * (_pad(len(section)) - len(section)))
+    return b"".join(parts)
+
+
+def read_corpus_buffer(
+    buffer: Union[bytes, memoryview, mmap.mmap],
+) -> Tuple[str, VerseStore]:
+    """Build a VerseStore whose arrays and text are views into a buffer
+
+    Nothing but the small book and chapter tables is copied, verse texts are
+    decoded from the buffer on access.
+    """
+    view = memoryview(buffer)
+    (
+        magic,
+        version,
+        name_size,
+        books_size,
+        book_count,
+        chapter_count,
+        verse_count,
+        text_size,
+    ) = _HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a compiled bible corpus")
+
+    position = _HEADER.size
+
+    def section(size: int) -> memoryview:
+        nonlocal position
+        data = view[position : position + size]
+        position += _pad(size)
+        return data
+
+    def integers(typecode: str, count: int) -> Union[memoryview, array]:
+        data = section(count * array(typecode).itemsize)
+        if sys.byteorder == "big":
+            values = array(typecode, data.tobytes())
+            values.byteswap()
+            return values
+        return data.cast(typecode)
+
+    name = str(section(name_size), "utf-8")
+    book_names = str(section(books_size), "utf-8").split("\n") if book_count else []
+    book_index = integers("H", book_count)
+    chapter_numbers = integers("H", chapter_count)
+    chapter_starts = integers("I", chapter_count + 1)
+    verse_numbers = integers("H", verse_count)
+    offsets = integers("I", verse_count + 1)
+    text: Buffer = section(text_size)
+
+    chapters = {}
+    first = 0
+    for book, count in zip(book_names, book_index):
+        table = chapters[sys.intern(book)] = {}
+        for index in range(first, first + count):
+            table[chapter_numbers[index]] = (
+                chapter_starts[index],
+                chapter_starts[index + 1],
+            )
+        first += count
+
+    return name, VerseStore(text, offsets, verse_numbers, chapters)
+
+
+def write_corpus(name: str, store: VerseStore, path: Union[str, Path]) -> None:
+    """Write a translation to a corpus file
+
+    The file is written next to the target and renamed over it, so processes
+    that have the old file memory-mapped keep reading the old inode instead
+    of crashing with SIGBUS on a truncated one.
+    """
+    path = Path(path)
+    descriptor, temp_path = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(dump_corpus(name, store))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def load_corpus(path: Union[str, Path]) -> Tuple[str, VerseStore]:
+    """Memory-map a corpus file and serve verses straight from the mapping"""
+    with open(path, "rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return read_corpus_buffer(mapping)
+
+
+def is_corpus_current(corpus_path: Path, text_path: Path) -> bool:
+    """Check if a corpus file exists and is not older than its text file"""
+    try:
+        return corpus_path.stat().st_mtime >= text_path.stat().st_mtime
+    except OSError:
+        return False
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Compile every known translation text in a directory"""
+    from src.bible_manager import find_bible_class
+
+    parser = argparse.ArgumentParser(description="Compile bible texts to corpus files")
+    parser.add_argument("texts_dir", nargs="?", default="src/texts/")
+    args = parser.parse_args(argv)
+
+    for text_path in sorted(Path(args.texts_dir).glob("*.txt")):
+        bible_class = find_bible_class(text_path.stem.lower())
+        if bible_class is None:
+            print(f"Warning: No specific parser found for {text_path.stem}, skipping")
+            continue
+
+        bible = bible_class()
+        bible.load_text(str(text_path))
+        if not bible.books:
+            print(f"Warning: No content loaded from {text_path.stem}")
+            continue
+
+        bible.compact()
+        corpus_path = text_path.with_suffix(CORPUS_SUFFIX)
+        write_corpus(bible.name, bible.books, corpus_path)
+        print(f"Compiled {bible.name} to {corpus_path}")
+
+
+if __name__ == "__main__":
+    main()
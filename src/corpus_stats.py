@@ -0,0 +1,292 @@
+"""Word frequencies, concordances and co-occurrences of a translation
+
+The statistics are built once from the search index: its posting lists,
+concatenated in vocabulary order, are a sparse verses x vocabulary matrix
+in compressed sparse column (CSC) form, and one stable sort by verse ID
+turns them into compressed sparse row (CSR) form. Every query is then a few
+NumPy slices and bincounts over these arrays instead of a loop over verses.
+Concordance lines (keyword in context) are only cut from the verse texts of
+the requested page.
+
+NumPy is optional, without it building the statistics raises RuntimeError.
+"""
+
+import unicodedata
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from src.search_index import SearchIndex, token_spans
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+class WordCount(NamedTuple):
+    word: str
+    # Occurrences and number of verses containing the word
+    count: int
+    verses: int
+
+
+class BookFrequency(NamedTuple):
+    book: str
+    count: int
+    verses: int
+    # Occurrences per 1000 words of the book
+    per_thousand: float
+
+
+class ConcordanceLine(NamedTuple):
+    book: str
+    chapter: int
+    verse: int
+    # Verse text before and after the keyword, at most a few words each
+    left: str
+    word: str
+    right: str
+
+
+class CoOccurrence(NamedTuple):
+    word: str
+    # Verses containing both words
+    verses: int
+    # Dice coefficient, 2 * shared verses / (verses of one + of the other)
+    dice: float
+
+
+def _concatenate(arrays: List, dtype: str) -> "np.ndarray":
+    """Copy Python arrays into one NumPy array"""
+    if not arrays:
+        return np.zeros(0, dtype=dtype)
+    return np.concatenate([np.frombuffer(part, dtype=dtype) for part in arrays])
+
+
+def _offsets(lengths: "np.ndarray") -> "np.ndarray":
+    """Get the start of every part and the end of the last from part lengths"""
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def _top(values: "np.ndarray", limit: int) -> "np.ndarray":
+    """Get the positions of the largest positive values, ties in position order"""
+    limit = min(limit, int(np.count_nonzero(values > 0)))
+    if limit <= 0:
+        return np.zeros(0, dtype=np.int64)
+    threshold = np.partition(values, len(values) - limit)[len(values) - limit]
+    candidates = np.flatnonzero((values >= threshold) & (values > 0))
+    order = np.lexsort((candidates, -values[candidates]))
+    return candidates[order[:limit]]
+
+
+class CorpusStatistics:
+    """Sparse verses x vocabulary matrix of one bible with report queries
+
+    Words are numbered in alphabetical order. Verse ranges are inclusive
+    canonical verse IDs like those of the search index.
+    """
+
+    def __init__(self, search_index: SearchIndex):
+        if np is None:
+            raise RuntimeError("Corpus statistics require NumPy")
+
+        self.search_index = search_index
+        verse_index = search_index.verse_index
+        self.book_names: List[str] = verse_index.book_names
+        self.vocabulary: List[str] = sorted(search_index.postings)
+        self.word_ids: Dict[str, int] = {
+            word: word_id for word_id, word in enumerate(self.vocabulary)
+        }
+        verse_count = len(verse_index)
+        postings = [search_index.postings[word] for word in self.vocabulary]
+        frequencies = [search_index.frequencies[word] for word in self.vocabulary]
+
+        # CSC: word i occurs in column_verses[column_starts[i]:column_starts[i + 1]]
+        self.word_verses = np.fromiter(map(len, postings), np.int64, len(postings))
+        self.column_starts = _offsets(self.word_verses)
+        self.column_verses = _concatenate(postings, "I").astype(np.int64)
+        self.column_counts = _concatenate(frequencies, "H").astype(np.int64)
+
+        # CSR: verse v contains row_words[row_starts[v]:row_starts[v + 1]]
+        column_words = np.repeat(np.arange(len(postings)), self.word_verses)
+        order = np.argsort(self.column_verses, kind="stable")
+        self.row_words = column_words[order]
+        self.row_counts = self.column_counts[order]
+        self.row_starts = _offsets(
+            np.bincount(self.column_verses, minlength=verse_count)
+        )
+
+        self.verse_books = np.frombuffer(verse_index.verse_books, "H").astype(np.int64)
+        self.verse_lengths = np.bincount(
+            self.column_verses, weights=self.column_counts, minlength=verse_count
+        ).astype(np.int64)
+        self.book_lengths = np.bincount(
+            self.verse_books, weights=self.verse_lengths, minlength=len(self.book_names)
+        ).astype(np.int64)
+
+    def _rows(self, start: int, end: Optional[int]) -> Tuple[int, int]:
+        """Get the CSR positions of the verses from start to end"""
+        verse_count = len(self.row_starts) - 1
+        start = min(max(start, 0), verse_count)
+        end = verse_count if end is None else min(max(end + 1, start), verse_count)
+        return int(self.row_starts[start]), int(self.row_starts[end])
+
+    def _column(self, word_id: int, start: int, end: Optional[int]) -> Tuple[int, int]:
+        """Get the CSC positions of a word within the verses from start to end"""
+        first = int(self.column_starts[word_id])
+        last = int(self.column_starts[word_id + 1])
+        verses = self.column_verses[first:last]
+        if end is not None:
+            last = first + int(np.searchsorted(verses, end + 1))
+        if start:
+            first += int(np.searchsorted(verses, start))
+        return first, max(first, last)
+
+    def word_count(self, start: int = 0, end: Optional[int] = None) -> int:
+        """Count the words of the verses from start to end"""
+        verse_count = len(self.verse_lengths)
+        stop = verse_count if end is None else end + 1
+        return int(self.verse_lengths[max(start, 0) : stop].sum())
+
+    def top_words(
+        self, limit: int, start: int = 0, end: Optional[int] = None
+    ) -> List[WordCount]:
+        """Get the most frequent words of the verses from start to end"""
+        first, last = self._rows(start, end)
+        words = self.row_words[first:last]
+        vocabulary_size = len(self.vocabulary)
+        counts = np.bincount(
+            words, weights=self.row_counts[first:last], minlength=vocabulary_size
+        ).astype(np.int64)
+        verses = np.bincount(words, minlength=vocabulary_size)
+        return [
+            WordCount(
+                self.vocabulary[word_id], int(counts[word_id]), int(verses[word_id])
+            )
+            for word_id in _top(counts, limit)
+        ]
+
+    def frequency_by_book(self, word: str) -> List[BookFrequency]:
+        """Count the occurrences of a word in every book containing it"""
+        word_id = self.word_ids.get(word)
+        if word_id is None:
+            return []
+        first, last = self._column(word_id, 0, None)
+        books = self.verse_books[self.column_verses[first:last]]
+        book_count = len(self.book_names)
+        counts = np.bincount(
+            books, weights=self.column_counts[first:last], minlength=book_count
+        ).astype(np.int64)
+        verses = np.bincount(books, minlength=book_count)
+        per_thousand = 1000 * counts / np.maximum(self.book_lengths, 1)
+        return [
+            BookFrequency(
+                self.book_names[book],
+                int(counts[book]),
+                int(verses[book]),
+                round(float(per_thousand[book]), 3),
+            )
+            for book in np.flatnonzero(verses)
+        ]
+
+    def concordance(
+        self,
+        word: str,
+        width: int = 5,
+        limit: int = 20,
+        offset: int = 0,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> Tuple[int, List[ConcordanceLine]]:
+        """Get the occurrence count and one page of a word in context
+
+        Occurrences are in canonical order with up to width words of context
+        on each side.
+        """
+        word_id = self.word_ids.get(word)
+        if word_id is None:
+            return 0, []
+        first, last = self._column(word_id, start, end)
+        counts = self.column_counts[first:last]
+        occurrence_ends = np.cumsum(counts)
+        total = int(occurrence_ends[-1]) if len(counts) else 0
+
+        page = np.arange(offset, min(offset + limit, total))
+        positions = np.searchsorted(occurrence_ends, page, side="right")
+        # Number of the occurrence within its verse
+        nths = page - (occurrence_ends[positions] - counts[positions])
+        verses = self.column_verses[first:last][positions]
+        lines = (
+            self._line(int(verse_id), word, int(nth), width)
+            for verse_id, nth in zip(verses, nths)
+        )
+        return total, [line for line in lines if line is not None]
+
+    def _line(
+        self, verse_id: int, word: str, nth: int, width: int
+    ) -> Optional[ConcordanceLine]:
+        """Cut the nth occurrence of a word and its context from a verse"""
+        hit = self.search_index.hit(verse_id)
+        text = unicodedata.normalize("NFC", hit.text)
+        spans = token_spans(text)
+        positions = [
+            position for position, (token, _, _) in enumerate(spans) if token == word
+        ]
+        if nth >= len(positions):
+            return None
+        position = positions[nth]
+        _, word_start, word_end = spans[position]
+        left = spans[position - width][1] if position >= width else 0
+        right = spans[position + width][2] if position + width < len(spans) else None
+        return ConcordanceLine(
+            hit.book,
+            hit.chapter,
+            hit.verse,
+            text[left:word_start],
+            text[word_start:word_end],
+            text[word_end:right],
+        )
+
+    def cooccurrences(
+        self, word: str, limit: int, start: int = 0, end: Optional[int] = None
+    ) -> Tuple[int, List[CoOccurrence]]:
+        """Get the verse count of a word and the words most associated with it
+
+        Words rank by the Dice coefficient of the verses containing them and
+        the word, so frequent words only rank high if they mostly occur
+        together with it.
+        """
+        word_id = self.word_ids.get(word)
+        if word_id is None:
+            return 0, []
+        first, last = self._column(word_id, start, end)
+        verses = self.column_verses[first:last]
+        if not len(verses):
+            return 0, []
+
+        # CSR positions of all words of the verses containing the word
+        row_first = self.row_starts[verses]
+        row_lengths = self.row_starts[verses + 1] - row_first
+        row_offsets = np.repeat(row_first - _offsets(row_lengths)[:-1], row_lengths)
+        positions = row_offsets + np.arange(len(row_offsets))
+        vocabulary_size = len(self.vocabulary)
+        shared = np.bincount(self.row_words[positions], minlength=vocabulary_size)
+        shared[word_id] = 0
+
+        if start or end is not None:
+            row_start, row_end = self._rows(start, end)
+            word_verses = np.bincount(
+                self.row_words[row_start:row_end], minlength=vocabulary_size
+            )
+        else:
+            word_verses = self.word_verses
+        dice = 2 * shared / (len(verses) + word_verses)
+        return len(verses), [
+            CoOccurrence(
+                self.vocabulary[other],
+                int(shared[other]),
+                round(float(dice[other]), 4),
+            )
+            for other in _top(dice, limit)
+        ]
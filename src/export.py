@@ -0,0 +1,45 @@
+import csv
+import io
+from typing import Iterator
+
+from src.bible_base import Bible
+from src.json_encoding import serialize_json
+
+CSV_HEADER = ("book", "chapter", "verse", "text")
+
+
+def iter_ndjson(bible: Bible) -> Iterator[bytes]:
+    """Yield a translation as one JSON object per verse, one chunk per chapter"""
+    for book, chapters in bible.books.items():
+        for chapter, verses in chapters.items():
+            lines = [
+                serialize_json(
+                    {
+                        "translation": bible.name,
+                        "book": book,
+                        "chapter": chapter,
+                        "verse": verse,
+                        "text": text,
+                    }
+                )
+                for verse, text in verses.items()
+            ]
+            lines.append(b"")
+            yield b"\n".join(lines)
+
+
+def iter_csv(bible: Bible) -> Iterator[bytes]:
+    """Yield a translation as CSV rows, one chunk per chapter"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_HEADER)
+    for book, chapters in bible.books.items():
+        for chapter, verses in chapters.items():
+            writer.writerows(
+                (book, chapter, verse, text) for verse, text in verses.items()
+            )
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
@@ -0,0 +1,49 @@
+"""Fast JSON encoding of response bodies
+
+Route handlers build plain dicts in the shape of the response models and
+encode them here, skipping model construction and validation for data that
+came from our own parser. The models stay the ``response_model`` of the
+routes, so the OpenAPI schema is unchanged.
+
+orjson is used if it is installed, otherwise the standard json module.
+Both produce the same compact UTF-8 output with integer keys as strings.
+"""
+
+import json
+from collections.abc import Mapping
+from typing import Any
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode verse store views and models the encoders do not know"""
+    to_dict = getattr(value, "to_dict", None)
+    if to_dict is not None:
+        # VerseStore views decode their verses without per-verse lookups
+        return to_dict()
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+
+    def serialize_json(content: Any) -> bytes:
+        """Serialize a response body to compact UTF-8 JSON"""
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+else:  # pragma: no cover - depends on the environment
+
+    def serialize_json(content: Any) -> bytes:
+        """Serialize a response body to compact UTF-8 JSON"""
+        return json.dumps(
+            content, default=_default, ensure_ascii=False, separators=(",", ":")
+        ).encode()
@@ -0,0 +1,135 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Tuple
+
+from src.bible_base import _HASH_LINE, Bible, _match_verse_line, _split_hash_line
+from src.verse_store import VerseStore
+
+
+class LazyBooks(Mapping):
+    """Book mapping that parses books from the text file on first access
+
+    At construction the file is only scanned for the byte ranges of each
+    book. Parsed books are kept in an LRU resident set; once the source
+    bytes of resident books exceed ``max_bytes`` the least recently used
+    books are evicted and parsed again when needed.
+    """
+
+    def __init__(
+        self, bible: Bible, file_path: str, max_bytes: int, compact: bool = False
+    ):
+        self.bible = bible
+        self.file_path = file_path
+        self.max_bytes = max_bytes
+        self.compact = compact
+        self.ranges: Dict[str, List[Tuple[int, int]]] = {}
+        self.resident_bytes = 0
+        self.loads = 0
+        self._resident: "OrderedDict[str, Mapping]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._scan()
+
+    def _scan(self) -> None:
+        """Record the byte ranges of every book in the text file"""
+        book_names: Dict[str, str] = {}
+        ranges: Dict[str, List[List[int]]] = {}
+        current = None
+        hash_format = None
+        position = 0
+
+        with open(self.file_path, "rb") as file:
+            for raw_line in file:
+                start = position
+                position += len(raw_line)
+                line = raw_line.decode("utf-8").strip()
+                if not line:
+                    continue
+
+                if hash_format is None:
+                    hash_format = _HASH_LINE.match(line) is not None
+                parsed = _split_hash_line(line) if hash_format else None
+                if parsed is None:
+                    parsed = _match_verse_line(line, hash_format)
+                    if parsed is None:
+                        continue
+
+                book = book_names.get(parsed[0])
+                if book is None:
+                    book = self.bible._normalize_german_book_name(parsed[0])
+                    book_names[parsed[0]] = book
+
+                if book == current:
+                    ranges[book][-1][1] = position
+                else:
+                    ranges.setdefault(book, []).append([start, position])
+                    current = book
+
+        self.ranges = {
+            book: [(start, end) for start, end in book_ranges]
+            for book, book_ranges in ranges.items()
+        }
+
+    def _load(self, book: str) -> Mapping:
+        """Parse one book from its byte ranges"""
+        with open(self.file_path, "rb") as file:
+            parts = []
+            for start, end in self.ranges[book]:
+                file.seek(start)
+                parts.append(file.read(end - start))
+
+        books: Dict[str, Dict[int, Dict[int, str]]] = {}
+        self.bible._parse_into(books, b"".join(parts).decode("utf-8"))
+        chapters = books.get(book, {})
+        if self.compact:
+            return VerseStore.from_books({book: chapters})[book]
+        return chapters
+
+    def book_size(self, book: str) -> int:
+        """Get the number of source bytes of a book"""
+        return sum(end - start for start, end in self.ranges[book])
+
+    def __getitem__(self, book: str) -> Mapping:
+        with self._lock:
+            chapters = self._resident.get(book)
+            if chapters is not None:
+                self._resident.move_to_end(book)
+                return chapters
+
+            if book not in self.ranges:
+                raise KeyError(book)
+
+            chapters = self._load(book)
+            self.loads += 1
+            self._resident[book] = chapters
+            self.resident_bytes += self.book_size(book)
+            # Keep at least the book that was just loaded
+            while self.resident_bytes > self.max_bytes and len(self._resident) > 1:
+                evicted, _ = self._resident.popitem(last=False)
+                self.resident_bytes -= self.book_size(evicted)
+            return chapters
+
+    def __contains__(self, book: object) -> bool:
+        return book in self.ranges
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ranges)
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def resident_books(self) -> List[str]:
+        """Get the parsed books from least to most recently used"""
+        return list(self._resident)
+
+    def __getstate__(self) -> Dict:
+        """Pickle only the index, books are parsed again after unpickling"""
+        state = self.__dict__.copy()
+        state["_resident"] = OrderedDict()
+        state["resident_bytes"] = 0
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -1,21 +1,192 @@
-from contextlib import asynccontextmanager
+import asyncio
+import gc
+import os
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import asynccontextmanager, suppress
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import quote
 
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import (
+    HTMLResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.templating import Jinja2Templates
 
-from src.bible_manager import BibleManager
-from src.models import BibleListResponse, BookResponse, ChapterResponse, VerseResponse
+from src.bible_base import Bible
+from src.bible_diff import ADDED, CHANGED, REMOVED, BibleDiff, diff_bibles
+from src.bible_manager import LOADING, READY, BibleManager
+from src.book_registry import canonical_book_name
+from src.compression import MIN_COMPRESS_SIZE, negotiate_encoding, variant_etag
+from src.corpus_stats import CorpusStatistics
+from src.export import iter_csv, iter_ndjson
+from src.json_encoding import serialize_json
+from src.metrics import (
+    CONTENT_TYPE,
+    MetricsMiddleware,
+    RequestMetrics,
+    render_bible_metrics,
+    render_cache_metrics,
+)
+from src.models import (
+    AutocompleteResponse,
+    BatchVerseRequest,
+    BatchVerseResponse,
+    BibleListResponse,
+    BookResponse,
+    ChapterResponse,
+    CoOccurrencesResponse,
+    CompareResponse,
+    ConcordanceResponse,
+    DiffResponse,
+    FrequencyResponse,
+    RangeResponse,
+    ReadinessResponse,
+    SearchResponse,
+    VerseResponse,
+    WordsResponse,
+)
+from src.references import (
+    book_bounds,
+    count_reference,
+    iter_reference,
+    parse_reference,
+    reference_bounds,
+    split_references,
+)
+from src.reloader import watch_texts
+from src.response_cache import ResponseCache, etag_matches
+from src.search_index import tokenize
+from src.shared_corpus import SEGMENTS_ENV, parse_segments
 
 templates = Jinja2Templates(directory="templates")
 bible_manager = BibleManager()
+response_cache = ResponseCache(
+    max_bytes=int(os.environ.get("BIBLE_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+    max_entries=int(os.environ.get("BIBLE_CACHE_MAX_ENTRIES", 4096)),
+)
+# Single verses and verse ranges get their own smaller LRUs, so a client
+# scanning verse by verse or range by range cannot evict the chapters and
+# books of the response cache
+verse_cache = ResponseCache(
+    max_bytes=int(os.environ.get("BIBLE_VERSE_CACHE_MAX_BYTES", 4 * 1024 * 1024)),
+    max_entries=int(os.environ.get("BIBLE_VERSE_CACHE_MAX_ENTRIES", 1024)),
+)
+range_cache = ResponseCache(
+    max_bytes=int(os.environ.get("BIBLE_RANGE_CACHE_MAX_BYTES", 16 * 1024 * 1024)),
+    max_entries=int(os.environ.get("BIBLE_RANGE_CACHE_MAX_ENTRIES", 256)),
+)
+# Response caches by name, and the caches of response kinds kept apart
+response_caches = {
+    "responses": response_cache,
+    "verses": verse_cache,
+    "ranges": range_cache,
+}
+KIND_CACHES = {"verse": verse_cache, "range": range_cache}
+# Diffs between two translations by (translation, other), least recently used first
+diff_cache: "OrderedDict[Tuple[str, str], BibleDiff]" = OrderedDict()
+CACHE_CONTROL = "public, max-age=3600"
+# Versioned URLs change with their content and can be cached for a year
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+TEXTS_DIR = "src/texts/"
+MAX_REFERENCES = 500
+MAX_BATCH_VERSES = 5000
+STREAM_VERSE_THRESHOLD = 500
+DEFAULT_RANGE_VERSES = 50
+MAX_RANGE_VERSES = 1000
+MAX_DIFF_VERSES = 1000
+MAX_CACHED_DIFFS = 8
+MAX_SUGGESTIONS = 50
+MAX_STATISTICS_WORDS = 1000
+EXPORT_FORMATS = {
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+    "csv": (iter_csv, "text/csv; charset=utf-8"),
+}
+
+
+def invalidate_responses(translation: str, diff: Optional[BibleDiff] = None) -> None:
+    """Drop the cached responses a reloaded translation made stale
+
+    If only verse texts changed, just the books, chapters, verses and ranges
+    containing them and the lists advertising their content hashes are
+    dropped. Added or removed verses shift verse IDs, so all responses of the
+    translation and the translation list are dropped then.
+    """
+    for pair in [pair for pair in diff_cache if translation in pair]:
+        del diff_cache[pair]
+
+    bible = bible_manager.get_bible(translation)
+    if diff is None or diff.added or diff.removed or bible is None:
+        for cache in response_caches.values():
+            cache.invalidate(translation)
+        response_cache.invalidate(None)
+        return
+
+    chapters = diff.chapters()
+    books = {book for book, _ in chapters}
+    verse_ids = sorted(
+        bible.verse_id(change.book, change.chapter, change.verse)
+        for change in diff.changed
+    )
+
+    def is_stale(key: Tuple) -> bool:
+        kind = key[1]
+        if kind == "books":
+            return True
+        if kind in ("book", "chapters"):
+            return key[2] in books
+        if kind in ("chapter", "verse"):
+            return (key[2], key[3]) in chapters
+        if kind == "range":
+            # Any changed verse ID from the first to the last of the range
+            found = bisect_left(verse_ids, key[2])
+            return found < len(verse_ids) and verse_ids[found] <= key[3]
+        return True
+
+    if verse_ids:
+        for cache in response_caches.values():
+            cache.invalidate(translation, is_stale)
+
+
+bible_manager.add_reload_listener(invalidate_responses)
+# Set once every translation found on startup is loaded or failed
+startup_complete = asyncio.Event()
+
+
+async def load_translations() -> None:
+    """Load bible texts, then reload them when their files change"""
+    shared_segments = os.environ.get(SEGMENTS_ENV)
+    if shared_segments:
+        await bible_manager.load_shared_corpus(parse_segments(shared_segments))
+    else:
+        lazy_max_bytes = os.environ.get("BIBLE_LAZY_MAX_BYTES")
+        await bible_manager.load_bibles(
+            TEXTS_DIR,
+            max_workers=os.cpu_count(),
+            compact=True,
+            lazy_max_bytes=int(lazy_max_bytes) if lazy_max_bytes else None,
+        )
+    # Move everything loaded so far into the permanent generation, so later
+    # garbage collections do not traverse the verses and indexes again
+    gc.freeze()
+    startup_complete.set()
+
+    if os.environ.get("BIBLE_HOT_RELOAD", "1") != "0" and Path(TEXTS_DIR).exists():
+        await watch_texts(bible_manager, TEXTS_DIR)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Load bible texts on startup"""
-    await bible_manager.load_bibles()
+    """Load bible texts in the background, the server answers meanwhile"""
+    loader = asyncio.create_task(load_translations())
     yield
+    loader.cancel()
+    with suppress(asyncio.CancelledError):
+        await loader
     print("Shutting down...")
 
 
@@ -25,128 +196,840 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan,
 )
+request_metrics = RequestMetrics()
+app.add_middleware(MetricsMiddleware, metrics=request_metrics)
+
+
+def get_bible_or_404(translation: str) -> Bible:
+    """Get a loaded bible or raise 404 Not Found"""
+    bible = bible_manager.get_bible(translation)
+    if not bible and bible_manager.status.get(translation) == LOADING:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Translation '{translation}' is still loading",
+            headers={"Retry-After": "1"},
+        )
+    if not bible:
+        raise HTTPException(
+            status_code=404, detail=f"Translation '{translation}' not found"
+        )
+    return bible
+
+
+def resolve_book_or_404(bible: Bible, translation: str, book: str) -> str:
+    """Resolve a book name, abbreviation or ID or raise 404 Not Found"""
+    book_key = bible.resolve_book(book)
+    if book_key is None:
+        raise HTTPException(
+            status_code=404, detail=f"Book '{book}' not found in {translation}"
+        )
+    return book_key
+
+
+def json_response(content: Dict, status_code: int = 200) -> Response:
+    """Send a dict in the shape of a response model without validating it"""
+    return Response(
+        content=serialize_json(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def cached_response(
+    request: Request,
+    key: Tuple,
+    build: Callable[[], bytes],
+    media_type: str,
+    cache_control: str = CACHE_CONTROL,
+) -> Response:
+    """Send a cached body, or 304 Not Modified if the client has it
+
+    The body is built only on a cache miss. Bodies of at least
+    MIN_COMPRESS_SIZE bytes are sent compressed with the encoding the client
+    prefers; each encoding is compressed once and cached with the body.
+    """
+    cache = KIND_CACHES.get(key[1], response_cache)
+    cached = cache.get(key)
+    if cached is None:
+        cached = cache.put(key, build())
+
+    encoding = None
+    if len(cached.body) >= MIN_COMPRESS_SIZE:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    etag = variant_etag(cached.etag, encoding)
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    body = cached.body
+    if encoding is not None:
+        body = cache.encoded(key, cached, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def cached_json_response(
+    request: Request,
+    key: Tuple,
+    build: Callable[[], Dict],
+    cache_control: str = CACHE_CONTROL,
+) -> Response:
+    """Send a cached JSON body built from a dict on a cache miss"""
+    return cached_response(
+        request,
+        key,
+        lambda: serialize_json(build()),
+        "application/json",
+        cache_control,
+    )
+
+
+def translation_list_cache_control() -> str:
+    """Keep clients from caching the translation list while it is incomplete"""
+    return CACHE_CONTROL if startup_complete.is_set() else "no-cache"
+
+
+def versioned_chapter_path(
+    bible: Bible, translation: str, book: str, chapter: int
+) -> str:
+    """Build the immutable URL path of the current version of a chapter"""
+    content_hash = bible.content_hashes.chapter(book, chapter)
+    return f"/api/v/{content_hash}/{quote(translation)}/{quote(book)}/{chapter}"
 
 
 # Web Interface Routes
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
-    """Serve the main HTML interface"""
-    translations = bible_manager.get_translation_names()
-    return templates.TemplateResponse(
-        "index.html", {"request": request, "translations": translations}
+    """Serve the main HTML interface, rendered once per set of translations"""
+
+    def build():
+        translations = bible_manager.get_translation_names()
+        template = templates.get_template("index.html")
+        return template.render(translations=translations).encode()
+
+    return cached_response(
+        request,
+        (None, "index"),
+        build,
+        "text/html; charset=utf-8",
+        translation_list_cache_control(),
     )
 
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Expose request, bible and cache metrics in the Prometheus text format"""
+    lines = [
+        *request_metrics.render(),
+        *render_bible_metrics(bible_manager),
+        *render_cache_metrics(response_caches),
+    ]
+    return Response(content="\n".join(lines) + "\n", media_type=CONTENT_TYPE)
+
+
+@app.get("/health", include_in_schema=False)
+async def get_health():
+    """Liveness probe, answers as soon as the server runs"""
+    return json_response({"status": "ok"})
+
+
+@app.get("/ready", response_model=ReadinessResponse, include_in_schema=False)
+async def get_readiness():
+    """Readiness probe, 503 Service Unavailable until startup loading is done"""
+    ready = startup_complete.is_set() and bible_manager.is_ready()
+    content = {"ready": ready, "translations": dict(bible_manager.status)}
+    return json_response(content, status_code=200 if ready else 503)
+
+
+@app.get(
+    "/ready/{translation}",
+    response_model=ReadinessResponse,
+    include_in_schema=False,
+)
+async def get_translation_readiness(translation: str):
+    """Readiness probe of one translation, 503 while it is not loaded"""
+    status = bible_manager.status.get(translation)
+    if status is None:
+        if startup_complete.is_set():
+            raise HTTPException(
+                status_code=404, detail=f"Translation '{translation}' not found"
+            )
+        status = LOADING
+    ready = status == READY
+    content = {"ready": ready, "translations": {translation: status}}
+    return json_response(content, status_code=200 if ready else 503)
+
+
 # API Endpoints
 @app.get("/api/translations", response_model=BibleListResponse)
-async def list_translations():
+async def list_translations(request: Request):
     """Get list of available Bible translations"""
-    return BibleListResponse(translations=bible_manager.get_translation_names())
+    return cached_json_response(
+        request,
+        (None, "translations"),
+        lambda: {"translations": bible_manager.get_translation_names()},
+        translation_list_cache_control(),
+    )
 
 
-@app.get("/api/{translation}/books")
-async def get_books(translation: str):
-    """Get list of books for a specific translation"""
-    bible = bible_manager.get_bible(translation)
-    if not bible:
+@app.get("/api/compare/{book}/{chapter:int}", response_model=CompareResponse)
+async def compare_chapter(
+    book: str,
+    chapter: int,
+    translations: Optional[str] = Query(
+        None, description="Comma-separated translations, all if omitted"
+    ),
+):
+    """Get a chapter verse by verse across several translations"""
+    if translations:
+        names = [name.strip() for name in translations.split(",") if name.strip()]
+    else:
+        names = bible_manager.get_translation_names()
+
+    chapters = {}
+    for name in names:
+        bible = get_bible_or_404(name)
+        book_key = bible.resolve_book(book)
+        chapters[name] = bible.get_chapter(book_key, chapter) if book_key else None
+
+    verse_numbers = sorted(
+        {verse for verses in chapters.values() if verses for verse in verses}
+    )
+    if not verse_numbers:
         raise HTTPException(
-            status_code=404, detail=f"Translation '{translation}' not found"
+            status_code=404, detail=f"Chapter {chapter} not found in {book}"
         )
 
-    books = []
-    for book_name in bible.get_book_names():
-        books.append(
-            {"name": book_name, "chapters": bible.get_chapter_count(book_name)}
-        )
+    return json_response(
+        {
+            "book": canonical_book_name(book),
+            "chapter": chapter,
+            "translations": names,
+            "verses": [
+                {
+                    "verse": verse,
+                    "texts": {
+                        name: verses.get(verse) if verses else None
+                        for name, verses in chapters.items()
+                    },
+                }
+                for verse in verse_numbers
+            ],
+        }
+    )
 
-    return {"translation": translation, "books": books}
 
+def diff_response(
+    translation: str,
+    other: str,
+    diff: BibleDiff,
+    books: Optional[Set[str]],
+    limit: int,
+    offset: int,
+) -> Response:
+    """Send the counts and a page of the changes of a diff"""
+    changes = diff.changes()
+    if books is not None:
+        changes = [change for change in changes if change.book in books]
+    return json_response(
+        {
+            "translation": translation,
+            "other": other,
+            "added": sum(change.change == ADDED for change in changes),
+            "removed": sum(change.change == REMOVED for change in changes),
+            "changed": sum(change.change == CHANGED for change in changes),
+            "verses": [change._asdict() for change in changes[offset : offset + limit]],
+        }
+    )
 
-@app.get("/api/{translation}/{book}")
-async def get_book(translation: str, book: str):
-    """Get entire book with all chapters and verses"""
-    bible = bible_manager.get_bible(translation)
-    if not bible:
+
+@app.get("/api/diff/{translation}/{other}", response_model=DiffResponse)
+async def diff_translations(
+    translation: str,
+    other: str,
+    book: Optional[str] = Query(None, description="Only compare this book"),
+    limit: int = Query(100, ge=1, le=MAX_DIFF_VERSES),
+    offset: int = Query(0, ge=0),
+):
+    """Get the verses added, removed and changed from one translation to another"""
+    bible = get_bible_or_404(translation)
+    other_bible = get_bible_or_404(other)
+    books = None
+    if book is not None:
+        books = {
+            resolve_book_or_404(bible, translation, book),
+            resolve_book_or_404(other_bible, other, book),
+        }
+
+    diff = diff_cache.get((translation, other))
+    if diff is None:
+        loop = asyncio.get_running_loop()
+        diff = await loop.run_in_executor(None, diff_bibles, bible, other_bible)
+        # Neither side may have been reloaded while comparing
+        if (
+            bible_manager.get_bible(translation) is bible
+            and bible_manager.get_bible(other) is other_bible
+        ):
+            diff_cache[(translation, other)] = diff
+            if len(diff_cache) > MAX_CACHED_DIFFS:
+                diff_cache.popitem(last=False)
+    else:
+        diff_cache.move_to_end((translation, other))
+    return diff_response(translation, other, diff, books, limit, offset)
+
+
+@app.get("/api/{translation}/changes", response_model=DiffResponse)
+async def get_reload_changes(
+    translation: str,
+    limit: int = Query(100, ge=1, le=MAX_DIFF_VERSES),
+    offset: int = Query(0, ge=0),
+):
+    """Get the verses the last reload of a translation changed"""
+    get_bible_or_404(translation)
+    diff = bible_manager.diffs.get(translation)
+    if diff is None:
         raise HTTPException(
-            status_code=404, detail=f"Translation '{translation}' not found"
+            status_code=404, detail=f"No changes recorded for '{translation}'"
         )
+    return diff_response(translation, translation, diff, None, limit, offset)
+
 
-    book_data = bible.get_book(book)
-    if book_data is None:
+@app.get(
+    "/api/v/{content_hash}/{translation}/{book}/{chapter:int}",
+    response_model=ChapterResponse,
+)
+async def get_versioned_chapter(
+    request: Request, content_hash: str, translation: str, book: str, chapter: int
+):
+    """Get a chapter by its content hash, cacheable forever
+
+    Outdated hashes are redirected to the current version of the chapter.
+    """
+    bible = get_bible_or_404(translation)
+    book = resolve_book_or_404(bible, translation, book)
+    current = bible.content_hashes.chapter(book, chapter)
+    if current is None:
         raise HTTPException(
-            status_code=404, detail=f"Book '{book}' not found in {translation}"
+            status_code=404,
+            detail=f"Chapter {chapter} not found in {book} ({translation})",
+        )
+    if content_hash != current:
+        return RedirectResponse(
+            versioned_chapter_path(bible, translation, book, chapter),
+            status_code=302,
+            headers={"Cache-Control": "no-cache"},
         )
+    return chapter_response(
+        request, bible, translation, book, chapter, IMMUTABLE_CACHE_CONTROL
+    )
+
 
-    return BookResponse(book=book, chapters=book_data, translation=translation)
+@app.get("/api/{translation}/books")
+async def get_books(request: Request, translation: str):
+    """Get list of books for a specific translation"""
+    bible = get_bible_or_404(translation)
 
+    def build():
+        content_hashes = bible.content_hashes
+        books = []
+        for book_name in bible.get_book_names():
+            books.append(
+                {
+                    "name": book_name,
+                    "chapters": bible.get_chapter_count(book_name),
+                    "hashes": content_hashes.chapters[book_name],
+                }
+            )
 
-@app.get("/api/{translation}/{book}/{chapter:int}")
-async def get_chapter(translation: str, book: str, chapter: int):
-    """Get specific chapter with all verses"""
-    bible = bible_manager.get_bible(translation)
-    if not bible:
+        return {
+            "translation": translation,
+            "hash": content_hashes.translation,
+            "books": books,
+        }
+
+    return cached_json_response(request, (translation, "books"), build)
+
+
+def verse_scope(
+    bible: Bible, book: Optional[str], chapters: Optional[str]
+) -> Tuple[int, Optional[int]]:
+    """Resolve the book and chapters a query is limited to to verse IDs"""
+    if book is None:
+        if chapters is not None:
+            raise HTTPException(
+                status_code=400, detail="Chapters can only be given with a book"
+            )
+        return 0, None
+
+    if chapters is None:
+        bounds = book_bounds(bible, book)
+    else:
+        try:
+            bounds = reference_bounds(bible, parse_reference(f"{book} {chapters}"))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if bounds is None:
+        scope = book if chapters is None else f"{book} {chapters}"
+        raise HTTPException(status_code=404, detail=f"Reference '{scope}' not found")
+    return bounds
+
+
+@app.get("/api/{translation}/search", response_model=SearchResponse)
+async def search_verses(
+    translation: str,
+    q: str = Query(..., min_length=1, description='Words and "quoted phrases"'),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    mode: str = Query("match", pattern="^(match|ranked)$"),
+    book: Optional[str] = Query(None, description="Only search this book"),
+    chapters: Optional[str] = Query(None, description='Chapters like "3" or "3-5"'),
+):
+    """Find verses containing all words and phrases of a query
+
+    The ranked mode finds verses containing any of the words, best BM25
+    score first.
+    """
+    get_bible_or_404(translation)
+    search_index = await bible_manager.get_search_index(translation)
+    if not search_index:
         raise HTTPException(
             status_code=404, detail=f"Translation '{translation}' not found"
         )
 
-    chapter_data = bible.get_chapter(book, chapter)
-    if chapter_data is None:
+    start, end = verse_scope(search_index.bible, book, chapters)
+    if mode == "ranked":
+        total, hits = search_index.rank(q, limit, offset, start, end)
+    else:
+        total, hits = search_index.search(q, limit, offset, start, end)
+    return json_response(
+        {
+            "query": q,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "results": [hit._asdict() for hit in hits],
+            "translation": translation,
+        }
+    )
+
+
+@app.get("/api/{translation}/autocomplete", response_model=AutocompleteResponse)
+async def autocomplete(
+    translation: str,
+    q: str = Query(..., min_length=1, description="Book name or search words"),
+    limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS),
+):
+    """Complete book names and the last word of a search, tolerating one typo"""
+    get_bible_or_404(translation)
+    autocomplete_index = await bible_manager.get_autocomplete_index(translation)
+    return json_response(
+        {
+            "query": q,
+            "translation": translation,
+            "books": [
+                completion._asdict()
+                for completion in autocomplete_index.complete_books(q, limit)
+            ],
+            "words": [
+                completion._asdict()
+                for completion in autocomplete_index.complete_words(q, limit)
+            ],
+        }
+    )
+
+
+async def get_statistics_or_404(translation: str) -> CorpusStatistics:
+    """Get the word statistics of a translation, 501 without NumPy"""
+    get_bible_or_404(translation)
+    try:
+        return await bible_manager.get_statistics(translation)
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+
+def statistics_word(word: str) -> str:
+    """Normalize the single word of a statistics query like search terms"""
+    tokens = tokenize(word)
+    if len(tokens) != 1:
         raise HTTPException(
-            status_code=404,
-            detail=f"Chapter {chapter} not found in {book} ({translation})",
+            status_code=400, detail=f"Expected a single word, got '{word}'"
         )
+    return tokens[0]
+
 
-    return ChapterResponse(
-        book=book, chapter=chapter, verses=chapter_data, translation=translation
+@app.get("/api/{translation}/stats/words", response_model=WordsResponse)
+async def get_word_counts(
+    translation: str,
+    limit: int = Query(100, ge=1, le=MAX_STATISTICS_WORDS),
+    book: Optional[str] = Query(None, description="Only count this book"),
+    chapters: Optional[str] = Query(None, description='Chapters like "3" or "3-5"'),
+):
+    """Get the most frequent words of a translation, book or chapters"""
+    statistics = await get_statistics_or_404(translation)
+    start, end = verse_scope(statistics.search_index.bible, book, chapters)
+    return json_response(
+        {
+            "translation": translation,
+            "book": book,
+            "chapters": chapters,
+            "total": statistics.word_count(start, end),
+            "words": [
+                count._asdict() for count in statistics.top_words(limit, start, end)
+            ],
+        }
     )
 
 
-@app.get("/api/{translation}/{book}/{chapter:int}/{verse:int}")
-async def get_verse(translation: str, book: str, chapter: int, verse: int):
-    """Get specific verse"""
-    bible = bible_manager.get_bible(translation)
-    if not bible:
+@app.get("/api/{translation}/stats/frequency", response_model=FrequencyResponse)
+async def get_word_frequency(translation: str, word: str = Query(..., min_length=1)):
+    """Count a word in every book of a translation"""
+    statistics = await get_statistics_or_404(translation)
+    books = statistics.frequency_by_book(statistics_word(word))
+    return json_response(
+        {
+            "word": word,
+            "translation": translation,
+            "total": sum(frequency.count for frequency in books),
+            "books": [frequency._asdict() for frequency in books],
+        }
+    )
+
+
+@app.get("/api/{translation}/stats/concordance", response_model=ConcordanceResponse)
+async def get_concordance(
+    translation: str,
+    word: str = Query(..., min_length=1),
+    width: int = Query(5, ge=0, le=20, description="Words of context on each side"),
+    limit: int = Query(20, ge=1, le=MAX_STATISTICS_WORDS),
+    offset: int = Query(0, ge=0),
+    book: Optional[str] = Query(None, description="Only this book"),
+    chapters: Optional[str] = Query(None, description='Chapters like "3" or "3-5"'),
+):
+    """List the occurrences of a word with their context in canonical order"""
+    statistics = await get_statistics_or_404(translation)
+    start, end = verse_scope(statistics.search_index.bible, book, chapters)
+    total, lines = statistics.concordance(
+        statistics_word(word), width, limit, offset, start, end
+    )
+    return json_response(
+        {
+            "word": word,
+            "translation": translation,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "lines": [line._asdict() for line in lines],
+        }
+    )
+
+
+@app.get("/api/{translation}/stats/cooccurrence", response_model=CoOccurrencesResponse)
+async def get_cooccurrences(
+    translation: str,
+    word: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=MAX_STATISTICS_WORDS),
+    book: Optional[str] = Query(None, description="Only this book"),
+    chapters: Optional[str] = Query(None, description='Chapters like "3" or "3-5"'),
+):
+    """Find the words occurring in the same verses as a word"""
+    statistics = await get_statistics_or_404(translation)
+    start, end = verse_scope(statistics.search_index.bible, book, chapters)
+    verses, words = statistics.cooccurrences(statistics_word(word), limit, start, end)
+    return json_response(
+        {
+            "word": word,
+            "translation": translation,
+            "verses": verses,
+            "words": [cooccurrence._asdict() for cooccurrence in words],
+        }
+    )
+
+
+@app.get("/api/{translation}/export")
+async def export_translation(
+    translation: str,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+):
+    """Stream a whole translation, one verse per line"""
+    bible = get_bible_or_404(translation)
+
+    iter_rows, media_type = EXPORT_FORMATS[export_format]
+    filename = f"{translation}.{export_format}"
+    return StreamingResponse(
+        iter_rows(bible),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def resolve_verse_position(bible: Bible, position: str, last: bool) -> int:
+    """Resolve a verse ID or the first or last verse of a reference to an ID"""
+    if position.strip().isdecimal():
+        return int(position)
+
+    try:
+        reference = parse_reference(position)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    bounds = reference_bounds(bible, reference)
+    if bounds is None:
         raise HTTPException(
-            status_code=404, detail=f"Translation '{translation}' not found"
+            status_code=404, detail=f"Reference '{position.strip()}' not found"
         )
+    return bounds[1] if last else bounds[0]
+
 
-    verse_text = bible.get_verse(book, chapter, verse)
-    if verse_text is None:
+@app.get("/api/{translation}/range", response_model=RangeResponse)
+async def get_verse_range(
+    request: Request,
+    translation: str,
+    start: str = Query(..., alias="from", description="Verse ID or reference"),
+    end: Optional[str] = Query(None, alias="to", description="Verse ID or reference"),
+    count: int = Query(DEFAULT_RANGE_VERSES, ge=1, le=MAX_RANGE_VERSES),
+):
+    """Get a contiguous slice of verses in canonical order"""
+    bible = get_bible_or_404(translation)
+    verse_count = len(bible.verse_index)
+    first = resolve_verse_position(bible, start, last=False)
+    if first >= verse_count:
         raise HTTPException(
-            status_code=404,
-            detail=f"Verse {verse} not found in {book} {chapter} ({translation})",
+            status_code=404, detail=f"Verse ID {first} not found in {translation}"
         )
 
-    return VerseResponse(
-        book=book,
-        chapter=chapter,
-        verse=verse,
-        text=verse_text,
-        translation=translation,
-    )
+    if end is None:
+        last = min(first + count, verse_count) - 1
+    else:
+        last = min(resolve_verse_position(bible, end, last=True), verse_count - 1)
+        if last < first:
+            raise HTTPException(status_code=400, detail="Range ends before it starts")
+        if last - first + 1 > MAX_RANGE_VERSES:
+            raise HTTPException(
+                status_code=400, detail=f"At most {MAX_RANGE_VERSES} verses allowed"
+            )
 
+    def build():
+        return {
+            "translation": translation,
+            "start": first,
+            "end": last,
+            "previous": first - 1 if first > 0 else None,
+            "next": last + 1 if last + 1 < verse_count else None,
+            "verses": [
+                {
+                    "id": verse_id,
+                    "book": book,
+                    "chapter": chapter,
+                    "verse": verse,
+                    "text": text,
+                }
+                for verse_id, book, chapter, verse, text in bible.iter_range(
+                    first, last
+                )
+            ],
+        }
 
-@app.get("/api/{translation}/{book}/chapters")
-async def get_chapter_list(translation: str, book: str):
-    """Get list of chapters in a book"""
-    bible = bible_manager.get_bible(translation)
-    if not bible:
+    return cached_json_response(request, (translation, "range", first, last), build)
+
+
+def stream_batch_verses(
+    bible: Bible, translation: str, missing: List[str], matches: Iterable[Tuple]
+) -> Iterator[bytes]:
+    """Yield a BatchVerseResponse as JSON, a few hundred verses per chunk"""
+    prefix = {"translation": translation, "missing": missing}
+    parts = [serialize_json(prefix)[:-1].decode(), ',"verses":[']
+    for position, (book, chapter, verse) in enumerate(matches):
+        item = {
+            "book": book,
+            "chapter": chapter,
+            "verse": verse,
+            "text": bible.get_verse(book, chapter, verse),
+        }
+        parts.append(("," if position else "") + serialize_json(item).decode())
+        if len(parts) >= 200:
+            yield "".join(parts).encode()
+            parts = []
+    parts.append("]}")
+    yield "".join(parts).encode()
+
+
+def batch_verses_response(translation: str, refs: List[str]):
+    """Resolve references into one response, streamed if it is large"""
+    bible = get_bible_or_404(translation)
+
+    texts = [part for text in refs for part in split_references(text)]
+    if len(texts) > MAX_REFERENCES:
         raise HTTPException(
-            status_code=404, detail=f"Translation '{translation}' not found"
+            status_code=400, detail=f"At most {MAX_REFERENCES} references allowed"
         )
 
-    if book not in bible.books:
+    try:
+        references = [parse_reference(text) for text in texts]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    missing = []
+    total = 0
+    for text, reference in zip(texts, references):
+        count = count_reference(bible, reference)
+        if not count:
+            missing.append(text)
+        total += count
+    if total > MAX_BATCH_VERSES:
         raise HTTPException(
-            status_code=404, detail=f"Book '{book}' not found in {translation}"
+            status_code=400,
+            detail=f"At most {MAX_BATCH_VERSES} verses allowed, got {total}",
         )
 
-    chapters = []
-    for chapter_num in sorted(bible.books[book].keys()):
-        chapters.append(
-            {"chapter": chapter_num, "verses": bible.get_verse_count(book, chapter_num)}
+    # Resolved while the response is written, so no list of verses is built
+    matches = (
+        match for reference in references for match in iter_reference(bible, reference)
+    )
+    if total > STREAM_VERSE_THRESHOLD:
+        return StreamingResponse(
+            stream_batch_verses(bible, translation, missing, matches),
+            media_type="application/json",
         )
 
-    return {"translation": translation, "book": book, "chapters": chapters}
+    return json_response(
+        {
+            "translation": translation,
+            "missing": missing,
+            "verses": [
+                {
+                    "book": book,
+                    "chapter": chapter,
+                    "verse": verse,
+                    "text": bible.get_verse(book, chapter, verse),
+                }
+                for book, chapter, verse in matches
+            ],
+        }
+    )
+
+
+@app.get("/api/{translation}/verses", response_model=BatchVerseResponse)
+async def get_verses(
+    translation: str,
+    refs: str = Query(
+        ..., min_length=1, description="References like 1. Mose 1:1-5;Johannes 3:16"
+    ),
+):
+    """Get all verses of several references in one response"""
+    return batch_verses_response(translation, [refs])
+
+
+@app.post("/api/{translation}/verses", response_model=BatchVerseResponse)
+async def post_verses(translation: str, request: BatchVerseRequest):
+    """Get all verses of a list of references in one response"""
+    return batch_verses_response(translation, request.refs)
+
+
+@app.get("/api/{translation}/{book}", response_model=BookResponse)
+async def get_book(request: Request, translation: str, book: str):
+    """Get entire book with all chapters and verses"""
+    bible = get_bible_or_404(translation)
+    book = resolve_book_or_404(bible, translation, book)
+
+    def build():
+        return {
+            "book": book,
+            "chapters": bible.get_book(book),
+            "translation": translation,
+        }
+
+    return cached_json_response(request, (translation, "book", book), build)
+
+
+def chapter_response(
+    request: Request,
+    bible: Bible,
+    translation: str,
+    book: str,
+    chapter: int,
+    cache_control: str = CACHE_CONTROL,
+) -> Response:
+    """Send a chapter with all verses"""
+
+    def build():
+        chapter_data = bible.get_chapter(book, chapter)
+        if chapter_data is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Chapter {chapter} not found in {book} ({translation})",
+            )
+
+        return {
+            "book": book,
+            "chapter": chapter,
+            "verses": chapter_data,
+            "translation": translation,
+        }
+
+    key = (translation, "chapter", book, chapter)
+    return cached_json_response(request, key, build, cache_control)
+
+
+@app.get("/api/{translation}/{book}/{chapter:int}", response_model=ChapterResponse)
+async def get_chapter(request: Request, translation: str, book: str, chapter: int):
+    """Get specific chapter with all verses"""
+    bible = get_bible_or_404(translation)
+    book = resolve_book_or_404(bible, translation, book)
+    return chapter_response(request, bible, translation, book, chapter)
+
+
+@app.get(
+    "/api/{translation}/{book}/{chapter:int}/{verse:int}",
+    response_model=VerseResponse,
+)
+async def get_verse(
+    request: Request, translation: str, book: str, chapter: int, verse: int
+):
+    """Get specific verse"""
+    bible = get_bible_or_404(translation)
+    book = resolve_book_or_404(bible, translation, book)
+
+    def build():
+        verse_text = bible.get_verse(book, chapter, verse)
+        if verse_text is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Verse {verse} not found in {book} {chapter} ({translation})",
+            )
+
+        return {
+            "book": book,
+            "chapter": chapter,
+            "verse": verse,
+            "text": verse_text,
+            "translation": translation,
+        }
+
+    key = (translation, "verse", book, chapter, verse)
+    return cached_json_response(request, key, build)
+
+
+@app.get("/api/{translation}/{book}/chapters")
+async def get_chapter_list(request: Request, translation: str, book: str):
+    """Get list of chapters in a book"""
+    bible = get_bible_or_404(translation)
+    book = resolve_book_or_404(bible, translation, book)
+
+    def build():
+        hashes = bible.content_hashes.chapters[book]
+        chapters = []
+        for chapter_num in sorted(bible.books[book].keys()):
+            chapters.append(
+                {
+                    "chapter": chapter_num,
+                    "verses": bible.get_verse_count(book, chapter_num),
+                    "hash": hashes[chapter_num],
+                }
+            )
+
+        return {"translation": translation, "book": book, "chapters": chapters}
+
+    return cached_json_response(request, (translation, "chapters", book), build)
 
 
 if __name__ == "__main__":
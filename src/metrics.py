@@ -0,0 +1,319 @@
+"""Request metrics in the Prometheus text exposition format
+
+``MetricsMiddleware`` is a plain ASGI middleware that counts requests and
+records latency and response size histograms per route template, e.g.
+``/api/{translation}/{book}/{chapter}``, so the number of series does not
+grow with the number of URLs. Gauges of loaded bibles and caches are
+collected when ``/metrics`` is scraped.
+"""
+
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.bible_base import Bible
+from src.bible_manager import BibleManager
+from src.lazy_books import LazyBooks
+from src.response_cache import ResponseCache
+from src.verse_store import VerseStore
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+UNMATCHED_ROUTE = "unmatched"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Labels) -> str:
+    """Format labels as {name="value",...}"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def format_value(value: float) -> str:
+    """Format a sample value without losing precision of large counts"""
+    if isinstance(value, int):
+        return str(value)
+    return repr(value)
+
+
+def format_metric(
+    name: str, kind: str, description: str, samples: Iterable[Tuple[Labels, float]]
+) -> List[str]:
+    """Format one metric family with its HELP and TYPE lines"""
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+    return lines
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds"""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one value"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def samples(self, labels: Labels) -> List[Tuple[str, Labels, float]]:
+        """Get the _bucket, _sum and _count samples"""
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            samples.append(
+                ("_bucket", labels + (("le", format_value(bound)),), cumulative)
+            )
+        samples.append(("_bucket", labels + (("le", "+Inf"),), self.count))
+        samples.append(("_sum", labels, self.sum))
+        samples.append(("_count", labels, self.count))
+        return samples
+
+
+def format_histograms(
+    name: str, description: str, histograms: Dict[Labels, Histogram]
+) -> List[str]:
+    """Format a histogram metric family"""
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+    for labels, histogram in histograms.items():
+        for suffix, sample_labels, value in histogram.samples(labels):
+            lines.append(
+                f"{name}{suffix}{format_labels(sample_labels)} {format_value(value)}"
+            )
+    return lines
+
+
+class RequestMetrics:
+    """Request counts, latencies and response sizes per route template"""
+
+    def __init__(self):
+        self.requests: Dict[Labels, int] = {}
+        self.latency: Dict[Labels, Histogram] = {}
+        self.response_bytes: Dict[Labels, Histogram] = {}
+
+    def observe(
+        self, method: str, route: str, status: int, seconds: float, size: int
+    ) -> None:
+        """Record one finished request"""
+        labels = (("method", method), ("route", route))
+        key = labels + (("status", str(status)),)
+        self.requests[key] = self.requests.get(key, 0) + 1
+
+        latency = self.latency.get(labels)
+        if latency is None:
+            latency = self.latency[labels] = Histogram(LATENCY_BUCKETS)
+            self.response_bytes[labels] = Histogram(SIZE_BUCKETS)
+        latency.observe(seconds)
+        self.response_bytes[labels].observe(size)
+
+    def render(self) -> List[str]:
+        """Format all request metrics"""
+        return [
+            *format_metric(
+                "http_requests_total",
+                "counter",
+                "HTTP requests by method, route template and status",
+                self.requests.items(),
+            ),
+            *format_histograms(
+                "http_request_duration_seconds",
+                "HTTP request latency by route template",
+                self.latency,
+            ),
+            *format_histograms(
+                "http_response_size_bytes",
+                "HTTP response body size by route template",
+                self.response_bytes,
+            ),
+        ]
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording every HTTP request in RequestMetrics"""
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            self.metrics.observe(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                time.perf_counter() - started,
+                size,
+            )
+
+
+def _sizeof_books(books: Mapping) -> int:
+    """Estimate the bytes of nested book -> chapter -> verse dicts"""
+    size = sys.getsizeof(books)
+    for book, chapters in books.items():
+        size += sys.getsizeof(book) + sys.getsizeof(chapters)
+        for verses in chapters.values():
+            size += sys.getsizeof(verses)
+            size += sum(map(sys.getsizeof, verses.values()))
+    return size
+
+
+def _sizeof_buffer(values) -> int:
+    """Get the bytes of an array, bytes object or memoryview"""
+    if isinstance(values, memoryview):
+        return values.nbytes
+    if isinstance(values, array):
+        return len(values) * values.itemsize
+    return len(values)
+
+
+def bible_stats(bible: Bible) -> Tuple[Optional[int], int]:
+    """Get the verse count and estimated memory in bytes of a bible
+
+    The verse count of a lazily loaded bible is only known once its verse
+    index was built; its memory is the source size of the resident books.
+    """
+    books = bible.books
+    if isinstance(books, VerseStore):
+        size = sum(
+            _sizeof_buffer(values)
+            for values in (books.text, books.offsets, books.verse_numbers)
+        )
+        return books.verse_count, size
+    if isinstance(books, LazyBooks):
+        verse_index = bible._verse_index
+        verses = len(verse_index) if verse_index is not None else None
+        return verses, books.resident_bytes
+    verses = sum(
+        len(verses) for chapters in books.values() for verses in chapters.values()
+    )
+    return verses, _sizeof_books(books)
+
+
+def render_bible_metrics(manager: BibleManager) -> List[str]:
+    """Format load durations, verse counts and memory of the loaded bibles"""
+    verse_counts = []
+    memory = []
+    lazy_loads = []
+    for name, bible in manager.bibles.items():
+        labels = (("translation", name),)
+        verses, size = bible_stats(bible)
+        if verses is not None:
+            verse_counts.append((labels, verses))
+        memory.append((labels, size))
+        if isinstance(bible.books, LazyBooks):
+            lazy_loads.append((labels, bible.books.loads))
+
+    def by_translation(values: Dict[str, float]) -> List[Tuple[Labels, float]]:
+        return [((("translation", name),), value) for name, value in values.items()]
+
+    return [
+        *format_metric(
+            "bible_load_seconds",
+            "gauge",
+            "Seconds until a translation was loaded",
+            by_translation(manager.load_seconds),
+        ),
+        *format_metric(
+            "bible_search_index_seconds",
+            "gauge",
+            "Seconds spent building the search index of a translation",
+            by_translation(manager.index_seconds),
+        ),
+        *format_metric(
+            "bible_verses", "gauge", "Verses of a translation", verse_counts
+        ),
+        *format_metric(
+            "bible_memory_bytes",
+            "gauge",
+            "Estimated memory of the verses of a translation",
+            memory,
+        ),
+        *format_metric(
+            "bible_lazy_book_loads_total",
+            "counter",
+            "Books parsed on demand by lazily loaded translations",
+            lazy_loads,
+        ),
+    ]
+
+
+def _hit_ratio(cache: ResponseCache) -> float:
+    """Get the share of cache lookups that were hits"""
+    lookups = cache.hits + cache.misses
+    return cache.hits / lookups if lookups else 0
+
+
+def render_cache_metrics(caches: Dict[str, ResponseCache]) -> List[str]:
+    """Format the hit, miss and size counters of response caches by name"""
+    samples = [((("cache", name),), cache) for name, cache in caches.items()]
+    return [
+        *format_metric(
+            "cache_hits_total",
+            "counter",
+            "Cache hits",
+            [(labels, cache.hits) for labels, cache in samples],
+        ),
+        *format_metric(
+            "cache_misses_total",
+            "counter",
+            "Cache misses",
+            [(labels, cache.misses) for labels, cache in samples],
+        ),
+        *format_metric(
+            "cache_hit_ratio",
+            "gauge",
+            "Share of cache lookups that were hits",
+            [(labels, _hit_ratio(cache)) for labels, cache in samples],
+        ),
+        *format_metric(
+            "cache_entries",
+            "gauge",
+            "Cached entries",
+            [(labels, len(cache)) for labels, cache in samples],
+        ),
+        *format_metric(
+            "cache_bytes",
+            "gauge",
+            "Cached bytes",
+            [(labels, cache.size) for labels, cache in samples],
+        ),
+    ]
@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -26,3 +26,161 @@ class BookResponse(BaseModel):
 
 class BibleListResponse(BaseModel):
     translations: List[str]
+
+
+class SearchHitResponse(BaseModel):
+    book: str
+    chapter: int
+    verse: int
+    text: str
+    # BM25 score of ranked searches
+    score: Optional[float] = None
+
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    offset: int
+    limit: int
+    results: List[SearchHitResponse]
+    translation: str
+
+
+class BatchVerseRequest(BaseModel):
+    refs: List[str]
+
+
+class ReferencedVerse(BaseModel):
+    book: str
+    chapter: int
+    verse: int
+    text: str
+
+
+class BatchVerseResponse(BaseModel):
+    translation: str
+    missing: List[str]
+    verses: List[ReferencedVerse]
+
+
+class IndexedVerse(BaseModel):
+    id: int
+    book: str
+    chapter: int
+    verse: int
+    text: str
+
+
+class RangeResponse(BaseModel):
+    translation: str
+    start: int
+    end: int
+    previous: Optional[int]
+    next: Optional[int]
+    verses: List[IndexedVerse]
+
+
+class Suggestion(BaseModel):
+    text: str
+    distance: int
+
+
+class AutocompleteResponse(BaseModel):
+    query: str
+    translation: str
+    books: List[Suggestion]
+    words: List[Suggestion]
+
+
+class WordCountResponse(BaseModel):
+    word: str
+    count: int
+    verses: int
+
+
+class WordsResponse(BaseModel):
+    translation: str
+    book: Optional[str]
+    chapters: Optional[str]
+    total: int
+    words: List[WordCountResponse]
+
+
+class BookFrequencyResponse(BaseModel):
+    book: str
+    count: int
+    verses: int
+    per_thousand: float
+
+
+class FrequencyResponse(BaseModel):
+    word: str
+    translation: str
+    total: int
+    books: List[BookFrequencyResponse]
+
+
+class ConcordanceLineResponse(BaseModel):
+    book: str
+    chapter: int
+    verse: int
+    left: str
+    word: str
+    right: str
+
+
+class ConcordanceResponse(BaseModel):
+    word: str
+    translation: str
+    total: int
+    offset: int
+    limit: int
+    lines: List[ConcordanceLineResponse]
+
+
+class CoOccurrenceResponse(BaseModel):
+    word: str
+    verses: int
+    dice: float
+
+
+class CoOccurrencesResponse(BaseModel):
+    word: str
+    translation: str
+    verses: int
+    words: List[CoOccurrenceResponse]
+
+
+class ChangedVerse(BaseModel):
+    change: str
+    book: str
+    chapter: int
+    verse: int
+    old: Optional[str]
+    new: Optional[str]
+
+
+class DiffResponse(BaseModel):
+    translation: str
+    other: str
+    added: int
+    removed: int
+    changed: int
+    verses: List[ChangedVerse]
+
+
+class ReadinessResponse(BaseModel):
+    ready: bool
+    translations: Dict[str, str]
+
+
+class ComparedVerse(BaseModel):
+    verse: int
+    texts: Dict[str, Optional[str]]
+
+
+class CompareResponse(BaseModel):
+    book: str
+    chapter: int
+    translations: List[str]
+    verses: List[ComparedVerse]
@@ -0,0 +1,146 @@
+import re
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from src.bible_base import Bible
+
+# "Johannes 3:16", "1. Mose 1:1-5", "1. Mose 1:30-2:3", "Psalmen 23", "Psalmen 1-3"
+_REFERENCE = re.compile(
+    r"^(?P<book>.+?)\s+(?P<chapter>\d+)(?::(?P<verse>\d+))?"
+    r"(?:\s*-\s*(?:(?P<end_chapter>\d+):)?(?P<end>\d+))?$"
+)
+
+
+class Reference(NamedTuple):
+    book: str
+    chapter: int
+    verse: Optional[int]
+    end_chapter: int
+    end_verse: Optional[int]
+
+
+def parse_reference(text: str) -> Reference:
+    """Parse a single reference like "1. Mose 1:1-5" or "Psalmen 23"
+
+    Raises ValueError if the text is not a reference.
+    """
+    match = _REFERENCE.match(text.strip())
+    if not match:
+        raise ValueError(f"Invalid reference '{text.strip()}'")
+
+    chapter = int(match.group("chapter"))
+    verse = int(match.group("verse")) if match.group("verse") else None
+    end = int(match.group("end")) if match.group("end") else None
+    if match.group("end_chapter"):
+        end_chapter, end_verse = int(match.group("end_chapter")), end
+    elif verse is None:
+        # "Psalmen 1-3" is a chapter range
+        end_chapter, end_verse = end or chapter, None
+    else:
+        end_chapter, end_verse = chapter, end or verse
+
+    if (end_chapter, end_verse or 0) < (chapter, verse or 0):
+        raise ValueError(
+            f"Invalid reference '{text.strip()}', range ends before it starts"
+        )
+    return Reference(
+        match.group("book").strip(), chapter, verse, end_chapter, end_verse
+    )
+
+
+def split_references(text: str) -> List[str]:
+    """Split references separated by semicolons"""
+    return [part.strip() for part in text.split(";") if part.strip()]
+
+
+def parse_references(text: str) -> List[Reference]:
+    """Parse references separated by semicolons"""
+    return [parse_reference(part) for part in split_references(text)]
+
+
+def resolve_book(bible: Bible, name: str) -> Optional[str]:
+    """Find the book key a bible uses for a German or English book name"""
+    return bible.resolve_book(name)
+
+
+def iter_reference(
+    bible: Bible, reference: Reference
+) -> Iterator[Tuple[str, int, int]]:
+    """Yield (book, chapter, verse) of every verse a reference covers"""
+    book = resolve_book(bible, reference.book)
+    if book is None:
+        return
+
+    chapters = bible.get_book(book)
+    for chapter in sorted(chapters):
+        if chapter < reference.chapter or chapter > reference.end_chapter:
+            continue
+        for verse in sorted(chapters[chapter]):
+            if chapter == reference.chapter and verse < (reference.verse or 0):
+                continue
+            if chapter == reference.end_chapter and reference.end_verse is not None:
+                if verse > reference.end_verse:
+                    break
+            yield book, chapter, verse
+
+
+def count_reference(bible: Bible, reference: Reference) -> int:
+    """Count the verses a reference covers without listing them"""
+    book = resolve_book(bible, reference.book)
+    if book is None:
+        return 0
+
+    count = 0
+    for chapter, verses in bible.get_book(book).items():
+        if chapter < reference.chapter or chapter > reference.end_chapter:
+            continue
+        first = (reference.verse or 0) if chapter == reference.chapter else 0
+        last = None
+        if chapter == reference.end_chapter:
+            last = reference.end_verse
+        if not first and last is None:
+            count += len(verses)
+        else:
+            count += sum(
+                1
+                for verse in verses
+                if verse >= first and (last is None or verse <= last)
+            )
+    return count
+
+
+def reference_bounds(bible: Bible, reference: Reference) -> Optional[Tuple[int, int]]:
+    """Get the first and last canonical verse ID a reference covers"""
+    book = bible.resolve_book(reference.book)
+    if book is None:
+        return None
+
+    verse_index = bible.verse_index
+    first_chapter = verse_index.chapter_range(book, reference.chapter)
+    last_chapter = verse_index.chapter_range(book, reference.end_chapter)
+    if first_chapter is None or last_chapter is None:
+        return None
+
+    if reference.verse is None:
+        start = first_chapter[0]
+    else:
+        start = verse_index.verse_id(book, reference.chapter, reference.verse)
+    if reference.end_verse is None:
+        end = last_chapter[1] - 1
+    else:
+        end = verse_index.verse_id(book, reference.end_chapter, reference.end_verse)
+    if start is None or end is None:
+        return None
+    return start, end
+
+
+def book_bounds(bible: Bible, name: str) -> Optional[Tuple[int, int]]:
+    """Get the first and last canonical verse ID of a book"""
+    book = bible.resolve_book(name)
+    if book is None:
+        return None
+
+    chapters = bible.verse_index.chapters.get(book)
+    if not chapters:
+        return None
+    ranges = chapters.values()
+    return min(start for start, _ in ranges), max(end for _, end in ranges) - 1
@@ -0,0 +1,32 @@
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+from watchfiles import Change, awatch
+
+from src.bible_manager import BibleManager
+from src.corpus import CORPUS_SUFFIX
+
+WATCHED_SUFFIXES = (".txt", CORPUS_SUFFIX)
+
+
+def _is_translation_file(change: Change, path: str) -> bool:
+    """Watch filter for text and corpus files"""
+    return path.endswith(WATCHED_SUFFIXES)
+
+
+async def watch_texts(
+    manager: BibleManager,
+    texts_dir: str = "src/texts/",
+    stop_event: Optional[asyncio.Event] = None,
+) -> None:
+    """Reload translations whose files change until cancelled or stopped"""
+    async for changes in awatch(
+        texts_dir, watch_filter=_is_translation_file, stop_event=stop_event
+    ):
+        # A text file and its corpus changing together reload once
+        stems = {}
+        for _, path in changes:
+            stems.setdefault(str(Path(path).with_suffix("")), path)
+        for path in sorted(stems.values()):
+            await manager.reload_file(path)
@@ -0,0 +1,126 @@
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from src.compression import compress
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    # Content-Encoding -> compressed body, filled on first request
+    variants: Dict[str, bytes]
+
+    @property
+    def size(self) -> int:
+        """Bytes of the body and all compressed variants"""
+        return len(self.body) + sum(map(len, self.variants.values()))
+
+
+def make_etag(body: bytes) -> str:
+    """Build a strong ETag from the content hash of a body"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """LRU cache of pre-serialized response bodies bounded by size and count
+
+    Keys are tuples starting with the translation name, so all responses of
+    a translation can be dropped at once.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_entries: int = 4096):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """Get a cached response and mark it as recently used"""
+        cached = self._entries.get(key)
+        if cached is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return cached
+
+    def put(self, key: Hashable, body: bytes) -> CachedResponse:
+        """Cache a body, evicting least recently used entries as needed
+
+        Bodies larger than the whole cache are returned but not stored.
+        """
+        cached = CachedResponse(body, make_etag(body), {})
+        self._remove(key)
+        if len(body) > self.max_bytes:
+            return cached
+
+        self._entries[key] = cached
+        self.size += len(body)
+        self._evict()
+        return cached
+
+    def encoded(self, key: Hashable, cached: CachedResponse, encoding: str) -> bytes:
+        """Get a compressed variant of a cached body, compressing it only once
+
+        Variants count towards the size of the cache.
+        """
+        body = cached.variants.get(encoding)
+        if body is None:
+            body = cached.variants[encoding] = compress(cached.body, encoding)
+            if self._entries.get(key) is cached:
+                self.size += len(body)
+                self._evict()
+        return body
+
+    def invalidate(
+        self,
+        translation: Optional[str],
+        is_stale: Optional[Callable[[Tuple], bool]] = None,
+    ) -> None:
+        """Drop the cached responses of a translation
+
+        With ``is_stale`` set, only the keys it returns True for are dropped.
+        """
+        stale = [
+            key
+            for key in self._entries
+            if key[0] == translation and (is_stale is None or is_stale(key))
+        ]
+        for key in stale:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all cached responses"""
+        self._entries.clear()
+        self.size = 0
+
+    def _evict(self) -> None:
+        while self.size > self.max_bytes or len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+
+    def _remove(self, key: Hashable) -> None:
+        cached = self._entries.pop(key, None)
+        if cached is not None:
+            self.size -= cached.size
@@ -0,0 +1,256 @@
+import heapq
+import math
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from src.bible_base import Bible
+
+_TOKEN = re.compile(r"\w+")
+_PHRASE = re.compile(r'"([^"]*)"')
+
+# BM25 term frequency saturation and verse length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into case-folded word tokens
+
+    Text is NFC-normalized first, so umlauts typed with combining marks match
+    precomposed ones, and case folding maps "ß" to "ss".
+    """
+    return _TOKEN.findall(unicodedata.normalize("NFC", text).casefold())
+
+
+def token_spans(text: str) -> List[Tuple[str, int, int]]:
+    """Get (token, start, end) of every word of NFC-normalized text
+
+    Tokens are case-folded like those of tokenize, positions refer to the
+    text before case folding.
+    """
+    return [
+        (match.group().casefold(), match.start(), match.end())
+        for match in _TOKEN.finditer(text)
+    ]
+
+
+def parse_query(query: str) -> Tuple[List[str], List[List[str]]]:
+    """Split a query into single terms and quoted phrases"""
+    phrases = [tokenize(phrase) for phrase in _PHRASE.findall(query)]
+    terms = tokenize(_PHRASE.sub(" ", query))
+    return terms, [phrase for phrase in phrases if phrase]
+
+
+def intersect(postings: Sequence[Sequence[int]]) -> Sequence[int]:
+    """Intersect sorted posting lists, starting with the shortest"""
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for other in postings[1:]:
+        matches = array("I")
+        position = 0
+        for verse_id in result:
+            position = bisect_left(other, verse_id, position)
+            if position == len(other):
+                break
+            if other[position] == verse_id:
+                matches.append(verse_id)
+        result = matches
+    return result
+
+
+def _contains_phrase(tokens: List[str], phrase: List[str]) -> bool:
+    """Check if a phrase occurs as consecutive tokens"""
+    size = len(phrase)
+    return any(
+        tokens[start : start + size] == phrase
+        for start in range(len(tokens) - size + 1)
+        if tokens[start] == phrase[0]
+    )
+
+
+def _slice(posting: Sequence[int], start: int, end: Optional[int]) -> Tuple[int, int]:
+    """Get the positions of a sorted posting list within verse IDs start to end"""
+    first = bisect_left(posting, start) if start else 0
+    last = len(posting) if end is None else bisect_left(posting, end + 1, first)
+    return first, last
+
+
+class SearchHit(NamedTuple):
+    book: str
+    chapter: int
+    verse: int
+    text: str
+    # BM25 score of ranked hits
+    score: Optional[float] = None
+
+
+class SearchIndex:
+    """Inverted index from tokens to sorted canonical verse IDs of one bible
+
+    Next to each posting list the index keeps how often the token occurs in
+    each verse, and per token its BM25 inverse document frequency, so ranked
+    queries only add up precomputed numbers.
+    """
+
+    def __init__(self, bible: Bible):
+        self.bible = bible
+        self.verse_index = bible.verse_index
+        self.postings: Dict[str, array] = {}
+        # Token -> occurrences per verse of its posting list
+        self.frequencies: Dict[str, array] = {}
+        lengths = array("H")
+
+        for verse_id, _, _, _, text in bible.iter_range(0, len(self.verse_index)):
+            tokens = tokenize(text)
+            lengths.append(min(len(tokens), 0xFFFF))
+            for token, count in Counter(tokens).items():
+                posting = self.postings.get(token)
+                if posting is None:
+                    posting = self.postings[token] = array("I")
+                    frequencies = self.frequencies[token] = array("H")
+                else:
+                    frequencies = self.frequencies[token]
+                posting.append(verse_id)
+                frequencies.append(count if count < 0xFFFF else 0xFFFF)
+
+        verse_count = len(lengths)
+        self.idf: Dict[str, float] = {
+            token: math.log(
+                1 + (verse_count - len(posting) + 0.5) / (len(posting) + 0.5)
+            )
+            for token, posting in self.postings.items()
+        }
+        # BM25 length normalization of every verse, k1 * (1 - b + b * length / avg)
+        average = sum(lengths) / verse_count if verse_count else 1.0
+        self.length_norms = array(
+            "f",
+            (BM25_K1 * (1 - BM25_B + BM25_B * length / average) for length in lengths),
+        )
+
+    def reference(self, verse_id: int) -> Tuple[str, int, int]:
+        """Get the (book, chapter, verse) reference of a verse ID"""
+        return self.verse_index.reference(verse_id)
+
+    def hit(self, verse_id: int) -> SearchHit:
+        """Build a search hit for a verse ID"""
+        book, chapter, verse = self.reference(verse_id)
+        return SearchHit(
+            book, chapter, verse, self.bible.get_verse(book, chapter, verse)
+        )
+
+    def match(
+        self, query: str, start: int = 0, end: Optional[int] = None
+    ) -> Sequence[int]:
+        """Find the IDs of all verses that contain every term and phrase
+
+        Only verses with IDs from start to end, both inclusive, are searched.
+        """
+        terms, phrases = parse_query(query)
+        tokens = set(terms)
+        for phrase in phrases:
+            tokens.update(phrase)
+        if not tokens:
+            return []
+
+        return self._filter_phrases(self._intersect(tokens, start, end), phrases)
+
+    def _intersect(
+        self, tokens: Set[str], start: int, end: Optional[int]
+    ) -> Sequence[int]:
+        """Find the IDs of the verses from start to end containing every token"""
+        postings = []
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                return []
+            first, last = _slice(posting, start, end)
+            postings.append(posting[first:last])
+        return intersect(postings)
+
+    def _filter_phrases(
+        self, verse_ids: Sequence[int], phrases: List[List[str]]
+    ) -> Sequence[int]:
+        """Keep the verses that contain every phrase"""
+        if not phrases:
+            return verse_ids
+        return [
+            verse_id
+            for verse_id in verse_ids
+            if all(
+                _contains_phrase(tokenize(self.hit(verse_id).text), phrase)
+                for phrase in phrases
+            )
+        ]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> Tuple[int, List[SearchHit]]:
+        """Get the total match count and one page of hits in canonical order"""
+        verse_ids = self.match(query, start, end)
+        page = verse_ids[offset : offset + limit]
+        return len(verse_ids), [self.hit(verse_id) for verse_id in page]
+
+    def scores(
+        self, query: str, start: int = 0, end: Optional[int] = None
+    ) -> Dict[int, float]:
+        """Get the BM25 score of every verse containing any term of a query
+
+        Phrases count with their words and verses must contain every phrase.
+        """
+        terms, phrases = parse_query(query)
+        tokens = set(terms)
+        for phrase in phrases:
+            tokens.update(phrase)
+
+        length_norms = self.length_norms
+        scores: Dict[int, float] = {}
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            weight = self.idf[token] * (BM25_K1 + 1)
+            first, last = _slice(posting, start, end)
+            for verse_id, frequency in zip(
+                posting[first:last], self.frequencies[token][first:last]
+            ):
+                score = weight * frequency / (frequency + length_norms[verse_id])
+                scores[verse_id] = scores.get(verse_id, 0.0) + score
+
+        if phrases:
+            phrase_tokens = {token for phrase in phrases for token in phrase}
+            matching = self._filter_phrases(
+                self._intersect(phrase_tokens, start, end), phrases
+            )
+            scores = {verse_id: scores[verse_id] for verse_id in matching}
+        return scores
+
+    def rank(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> Tuple[int, List[SearchHit]]:
+        """Get the match count and one page of hits by descending BM25 score
+
+        Only the best offset + limit verses are selected with a heap, the
+        other matches are never sorted. Equal scores rank in canonical order.
+        """
+        scores = self.scores(query, start, end)
+        best = heapq.nlargest(
+            offset + limit, scores.items(), key=lambda item: (item[1], -item[0])
+        )
+        return len(scores), [
+            self.hit(verse_id)._replace(score=score)
+            for verse_id, score in best[offset:]
+        ]
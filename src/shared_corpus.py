@@ -0,0 +1,121 @@
+"""Translations published once in shared memory for multi-worker servers
+
+The parent process loads every translation, writes it in the binary corpus
+format into one shared memory segment per text file and starts the workers.
+Each worker attaches the segments read-only and serves verses straight from
+them through ``read_corpus_buffer``, so verse texts exist once in memory no
+matter how many workers run. The texts are not Python objects, reference
+counting never writes to their pages.
+
+Start the server with four workers sharing the translations with:
+
+    python -m src.shared_corpus --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.corpus import dump_corpus, load_corpus, read_corpus_buffer
+from src.verse_store import VerseStore
+
+# Environment variable passing "file stem=segment name,..." to the workers
+SEGMENTS_ENV = "BIBLE_SHARED_CORPUS"
+# Where Linux exposes POSIX shared memory as files
+SHM_DIR = Path("/dev/shm")
+
+# Segments attached through SharedMemory, kept open for the process lifetime
+_attached: Dict[str, SharedMemory] = {}
+
+
+def publish_corpus(segment: str, name: str, store: VerseStore) -> SharedMemory:
+    """Write a translation into a new shared memory segment"""
+    data = dump_corpus(name, store)
+    shared = SharedMemory(name=segment, create=True, size=len(data))
+    shared.buf[: len(data)] = data
+    return shared
+
+
+def attach_corpus(segment: str) -> Tuple[str, VerseStore]:
+    """Serve a translation from a shared memory segment, read-only"""
+    path = SHM_DIR / segment
+    if path.exists():
+        return load_corpus(path)
+
+    shared = SharedMemory(name=segment)
+    # Attaching registers the segment with this process's resource tracker,
+    # which would unlink it for all workers once this one exits
+    resource_tracker.unregister(shared._name, "shared_memory")
+    _attached[segment] = shared
+    return read_corpus_buffer(shared.buf.toreadonly())
+
+
+def format_segments(segments: Dict[str, str]) -> str:
+    """Format file stems and segment names for SEGMENTS_ENV"""
+    return ",".join(f"{stem}={segment}" for stem, segment in segments.items())
+
+
+def parse_segments(value: str) -> Dict[str, str]:
+    """Parse file stems and segment names from SEGMENTS_ENV"""
+    segments = {}
+    for part in value.split(","):
+        stem, _, segment = part.partition("=")
+        if stem.strip() and segment.strip():
+            segments[stem.strip()] = segment.strip()
+    return segments
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Publish all translations and run the API with several workers"""
+    import uvicorn
+
+    from src.bible_manager import BibleManager
+
+    parser = argparse.ArgumentParser(
+        description="Serve translations from shared memory"
+    )
+    parser.add_argument("--texts-dir", default="src/texts/")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    manager = BibleManager()
+    asyncio.run(
+        manager.load_bibles(
+            args.texts_dir,
+            max_workers=os.cpu_count(),
+            compact=True,
+            # The workers build their own, this process only publishes
+            build_indexes=False,
+        )
+    )
+
+    published: List[SharedMemory] = []
+    segments = {}
+    try:
+        for stem, name in manager.files.items():
+            segment = f"pybl_{os.getpid()}_{stem}"
+            published.append(publish_corpus(segment, name, manager.bibles[name].books))
+            segments[stem] = segment
+            print(f"Published {name} to shared memory {segment}")
+        del manager
+
+        os.environ[SEGMENTS_ENV] = format_segments(segments)
+        # Workers cannot reload a shared translation on their own
+        os.environ["BIBLE_HOT_RELOAD"] = "0"
+        uvicorn.run(
+            "src.main:app", host=args.host, port=args.port, workers=args.workers
+        )
+    finally:
+        for shared in published:
+            shared.close()
+            shared.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Tuple
+
+
+class VerseIndex:
+    """Dense canonical numbering of all verses of a bible
+
+    Verses are numbered from 0 in canonical order: books in the order of
+    the bible, chapters and verses ascending. Verse ID -> reference is three
+    array lookups, reference -> verse ID a chapter table lookup plus a check
+    of the expected position, falling back to a binary search within the
+    chapter when verse numbers have gaps.
+    """
+
+    def __init__(self, books: Mapping):
+        self.book_names: List[str] = []
+        self.verse_books = array("H")
+        self.verse_chapters = array("H")
+        self.verse_numbers = array("H")
+        # Book -> chapter -> (first verse ID, end verse ID)
+        self.chapters: Dict[str, Dict[int, Tuple[int, int]]] = {}
+
+        for book, book_chapters in books.items():
+            book_position = len(self.book_names)
+            self.book_names.append(book)
+            table = self.chapters[book] = {}
+            for chapter in sorted(book_chapters):
+                start = len(self.verse_numbers)
+                verses = sorted(book_chapters[chapter])
+                self.verse_numbers.extend(verses)
+                self.verse_books.extend([book_position] * len(verses))
+                self.verse_chapters.extend([chapter] * len(verses))
+                table[chapter] = (start, len(self.verse_numbers))
+
+    def __len__(self) -> int:
+        return len(self.verse_numbers)
+
+    def reference(self, verse_id: int) -> Optional[Tuple[str, int, int]]:
+        """Get the (book, chapter, verse) reference of a verse ID"""
+        if not 0 <= verse_id < len(self.verse_numbers):
+            return None
+        return (
+            self.book_names[self.verse_books[verse_id]],
+            self.verse_chapters[verse_id],
+            self.verse_numbers[verse_id],
+        )
+
+    def chapter_range(self, book: str, chapter: int) -> Optional[Tuple[int, int]]:
+        """Get the first and end verse ID of a chapter"""
+        return self.chapters.get(book, {}).get(chapter)
+
+    def verse_id(self, book: str, chapter: int, verse: int) -> Optional[int]:
+        """Get the verse ID of a reference using the bible's book key"""
+        bounds = self.chapter_range(book, chapter)
+        if bounds is None:
+            return None
+        start, end = bounds
+        # Verses are usually numbered 1..n without gaps
+        verse_id = start + verse - 1
+        if start <= verse_id < end and self.verse_numbers[verse_id] == verse:
+            return verse_id
+        verse_id = bisect_left(self.verse_numbers, verse, start, end)
+        if verse_id < end and self.verse_numbers[verse_id] == verse:
+            return verse_id
+        return None
@@ -0,0 +1,173 @@
+from array import array
+from collections.abc import Mapping
+from itertools import accumulate
+from typing import Dict, Iterator, Sequence, Tuple, Union
+
+Buffer = Union[bytes, memoryview]
+
+
+class VerseStore(Mapping):
+    """Read-only verse storage backed by one contiguous UTF-8 buffer
+
+    Verses are kept in canonical order (book, chapter, verse) and addressed
+    by their position in that order. Verse ``i`` is the UTF-8 text between
+    ``offsets[i]`` and ``offsets[i + 1]``, its verse number is
+    ``verse_numbers[i]``. A small book -> chapter -> (start, end) table maps
+    chapters to verse positions.
+
+    The store implements the same mapping interface as the nested
+    ``Dict[str, Dict[int, Dict[int, str]]]`` used by ``Bible.books``, so it
+    can be assigned to ``Bible.books`` directly.
+    """
+
+    def __init__(
+        self,
+        text: Buffer,
+        offsets: Sequence[int],
+        verse_numbers: Sequence[int],
+        chapters: Dict[str, Dict[int, Tuple[int, int]]],
+    ):
+        self.text = text
+        self.offsets = offsets
+        self.verse_numbers = verse_numbers
+        self.chapters = chapters
+
+    @classmethod
+    def from_books(cls, books: Mapping) -> "VerseStore":
+        """Build a store from nested book -> chapter -> verse mappings"""
+        encoded = []
+        verse_numbers = array("H")
+        chapters: Dict[str, Dict[int, Tuple[int, int]]] = {}
+        for book, book_chapters in books.items():
+            table = chapters[book] = {}
+            for chapter, verses in sorted(book_chapters.items()):
+                start = len(verse_numbers)
+                for verse, verse_text in sorted(verses.items()):
+                    encoded.append(verse_text.encode("utf-8"))
+                    verse_numbers.append(verse)
+                table[chapter] = (start, len(verse_numbers))
+
+        offsets = array("I", [0])
+        offsets.extend(accumulate(map(len, encoded)))
+        return cls(b"".join(encoded), offsets, verse_numbers, chapters)
+
+    def __getstate__(self) -> Dict:
+        """Copy buffer views into plain bytes and arrays for pickling"""
+        return {
+            "text": bytes(self.text),
+            "offsets": array("I", self.offsets),
+            "verse_numbers": array("H", self.verse_numbers),
+            "chapters": self.chapters,
+        }
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+
+    def __getitem__(self, book: str) -> "BookView":
+        return BookView(self, self.chapters[book])
+
+    def __contains__(self, book: object) -> bool:
+        return book in self.chapters
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.chapters)
+
+    def __len__(self) -> int:
+        return len(self.chapters)
+
+    @property
+    def verse_count(self) -> int:
+        """Total number of verses in the store"""
+        return len(self.verse_numbers)
+
+    def verse_text(self, index: int) -> str:
+        """Decode the text of the verse at a canonical position"""
+        return str(self.text[self.offsets[index] : self.offsets[index + 1]], "utf-8")
+
+    def to_dict(self) -> Dict[str, Dict[int, Dict[int, str]]]:
+        """Expand the store back into nested dicts"""
+        return {
+            book: {chapter: dict(verses) for chapter, verses in chapters.items()}
+            for book, chapters in self.items()
+        }
+
+
+class BookView(Mapping):
+    """Chapter number -> ChapterView mapping over a VerseStore"""
+
+    __slots__ = ("store", "chapters")
+
+    def __init__(self, store: VerseStore, chapters: Dict[int, Tuple[int, int]]):
+        self.store = store
+        self.chapters = chapters
+
+    def __getitem__(self, chapter: int) -> "ChapterView":
+        start, end = self.chapters[chapter]
+        return ChapterView(self.store, start, end)
+
+    def __contains__(self, chapter: object) -> bool:
+        return chapter in self.chapters
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.chapters)
+
+    def __len__(self) -> int:
+        return len(self.chapters)
+
+    def to_dict(self) -> Dict[int, Dict[int, str]]:
+        """Expand the book into nested dicts"""
+        return {
+            chapter: ChapterView(self.store, start, end).to_dict()
+            for chapter, (start, end) in self.chapters.items()
+        }
+
+
+class ChapterView(Mapping):
+    """Verse number -> verse text mapping over a range of a VerseStore"""
+
+    __slots__ = ("store", "start", "end")
+
+    def __init__(self, store: VerseStore, start: int, end: int):
+        self.store = store
+        self.start = start
+        self.end = end
+
+    def _index(self, verse: object) -> int:
+        """Find the canonical position of a verse number in this chapter"""
+        if isinstance(verse, int):
+            verse_numbers = self.store.verse_numbers
+            # Verses are usually numbered 1..n without gaps
+            index = self.start + verse - 1
+            if self.start <= index < self.end and verse_numbers[index] == verse:
+                return index
+            for index in range(self.start, self.end):
+                if verse_numbers[index] == verse:
+                    return index
+        return -1
+
+    def __getitem__(self, verse: int) -> str:
+        index = self._index(verse)
+        if index < 0:
+            raise KeyError(verse)
+        return self.store.verse_text(index)
+
+    def __contains__(self, verse: object) -> bool:
+        return self._index(verse) >= 0
+
+    def __iter__(self) -> Iterator[int]:
+        verse_numbers = self.store.verse_numbers
+        return (verse_numbers[index] for index in range(self.start, self.end))
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def to_dict(self) -> Dict[int, str]:
+        """Decode all verses of the chapter into a dict"""
+        offsets = self.store.offsets[self.start : self.end + 1]
+        base = offsets[0]
+        chunk = bytes(self.store.text[base : offsets[-1]])
+        texts = [
+            chunk[start - base : end - base].decode("utf-8")
+            for start, end in zip(offsets, offsets[1:])
+        ]
+        return dict(zip(self.store.verse_numbers[self.start : self.end], texts))
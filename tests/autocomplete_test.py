@@ -0,0 +1,97 @@
+import unittest
+
+from autocomplete import AutocompleteIndex, Completion, CompletionIndex, is_one_edit
+from conftest import make_bible
+from search_index import SearchIndex
+
+AUTOCOMPLETE_TEXT = """0#1. Mose#1#1#Im Anfang schuf Gott die Himmel und die Erde.
+0#1. Mose#1#2#Und die Erde war wüst und leer.
+0#1. Johannes#1#1#Was von Anfang war, was wir gehört haben.
+0#Johannes#3#16#Denn also hat Gott die Welt geliebt.
+0#Johannes#3#17#Denn Gott hat seinen Sohn nicht gesandt."""
+
+
+class TestAutocomplete(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        bible = make_bible(AUTOCOMPLETE_TEXT)
+        self.index = AutocompleteIndex(bible, SearchIndex(bible))
+
+    def test_is_one_edit(self):
+        """Test insertions, deletions, replacements and swaps"""
+        for a, b in (
+            ("himmel", "himel"),
+            ("himmel", "himmeln"),
+            ("himmel", "hinmel"),
+            ("himmel", "hmimel"),
+            ("himmel", "ihmmel"),
+        ):
+            with self.subTest(a=a, b=b):
+                self.assertTrue(is_one_edit(a, b))
+                self.assertTrue(is_one_edit(b, a))
+        for a, b in (("himmel", "himmel"), ("himmel", "hmmiel"), ("himmel", "hi")):
+            with self.subTest(a=a, b=b):
+                self.assertFalse(is_one_edit(a, b))
+
+    def test_prefix_completions_by_weight(self):
+        """Test that short and long prefixes rank keys by weight"""
+        index = CompletionIndex(
+            [("gott", "Gott", 3), ("gottes", "Gottes", 5), ("gold", "Gold", 1)]
+        )
+        self.assertEqual(
+            [completion.text for completion in index.complete("go", 10)],
+            ["Gottes", "Gott", "Gold"],
+        )
+        self.assertEqual(
+            index.complete("gott", 10),
+            [Completion("Gottes", 0), Completion("Gott", 0)],
+        )
+        self.assertEqual(index.complete("go", 1), [Completion("Gottes", 0)])
+        self.assertEqual(index.complete("x", 10), [])
+
+    def test_typo_completions(self):
+        """Test that typo matches fill up after prefix matches"""
+        index = CompletionIndex([("sprach", "sprach", 1), ("spruch", "spruch", 2)])
+        self.assertEqual(
+            index.complete("sprich", 10),
+            [Completion("spruch", 1), Completion("sprach", 1)],
+        )
+        # Short queries are only completed by prefix
+        self.assertEqual(index.complete("spx", 10), [])
+
+    def test_complete_books(self):
+        """Test book completion by name, abbreviation, English name and typo"""
+        self.assertEqual(
+            [completion.text for completion in self.index.complete_books("joh", 10)],
+            ["Johannes"],
+        )
+        self.assertEqual(
+            self.index.complete_books("1. Jo", 10), [Completion("1. Johannes", 0)]
+        )
+        self.assertEqual(
+            self.index.complete_books("gen", 10), [Completion("1. Mose", 0)]
+        )
+        self.assertEqual(
+            self.index.complete_books("Johanes", 10), [Completion("Johannes", 1)]
+        )
+        # Books missing from the translation are not suggested
+        self.assertEqual(self.index.complete_books("Ruth", 10), [])
+        self.assertEqual(self.index.complete_books("  ", 10), [])
+
+    def test_complete_words(self):
+        """Test completing the last word of a query from the vocabulary"""
+        self.assertEqual(
+            self.index.complete_words("Himmel und Er", 10), [Completion("erde", 0)]
+        )
+        self.assertEqual(
+            self.index.complete_words("geliebd", 10), [Completion("geliebt", 1)]
+        )
+        self.assertEqual(
+            [completion.text for completion in self.index.complete_words("g", 2)],
+            ["gott", "gehört"],
+        )
+        self.assertEqual(self.index.complete_words("Gott ", 10), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
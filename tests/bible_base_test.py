@@ -1,4 +1,9 @@
+import asyncio
+import os
+import pickle
+import tempfile
 import unittest
+from unittest.mock import patch
 
 from bible_base import Bible
 
@@ -167,6 +172,157 @@ class TestBibleBase(unittest.TestCase):
         # Should not add any books
         self.assertEqual(len(bible.get_book_names()), 0)
 
+    def test_parse_text_hash_format_with_reference_in_text(self):
+        """Test hash lines whose text contains a "C:V" reference"""
+        bible = BibleTestHelper("Test")
+        content = "0#Johannes#3#16#Siehe Johannes 3:16 und Römer 5:8 dazu."
+        bible._parse_text(content)
+
+        self.assertEqual(bible.get_book_names(), ["Johannes"])
+        verse = bible.get_verse("Johannes", 3, 16)
+        self.assertEqual(verse, "Siehe Johannes 3:16 und Römer 5:8 dazu.")
+
+    def test_parse_text_hash_format_normalizes_abbreviations(self):
+        """Test hash lines with abbreviated book names"""
+        bible = BibleTestHelper("Test")
+        content = """0#1Mos#1#1#Im Anfang schuf Gott die Himmel und die Erde.
+0#1Mos#1#2#Und die Erde war wüst und leer."""
+        bible._parse_text(content)
+
+        self.assertEqual(bible.get_book_names(), ["1. Mose"])
+        self.assertEqual(bible.get_verse_count("1. Mose", 1), 2)
+
+    def test_parse_text_falls_back_for_other_format(self):
+        """Test lines that do not match the detected format"""
+        bible = BibleTestHelper("Test")
+        content = """1. Mose 1:1 Im Anfang schuf Gott die Himmel und die Erde.
+0#1. Mose#1#2#Und die Erde war wüst und leer."""
+        bible._parse_text(content)
+
+        self.assertEqual(bible.get_verse_count("1. Mose", 1), 2)
+
+    def test_pickle_round_trip(self):
+        """Test that pickling keeps all verses and the translation name"""
+        self.bible._parse_text("0#2. Mose#3#14#Und Gott sprach zu Mose.")
+        restored = pickle.loads(pickle.dumps(self.bible))
+
+        self.assertEqual(restored.name, "Test Bible")
+        self.assertEqual(restored.books, self.bible.books)
+        self.assertEqual(restored.get_book_names(), ["1. Mose", "2. Mose"])
+
+    def test_compact_keeps_getter_behavior(self):
+        """Test the getters on a bible compacted into a VerseStore"""
+        books = self.bible.get_book("1. Mose")
+        self.bible.compact()
+
+        self.assertEqual(self.bible.get_book("1. Mose"), books)
+        self.assertEqual(self.bible.get_chapter("1. Mose", 1), books[1])
+        self.assertEqual(
+            self.bible.get_verse("1. Mose", 1, 1),
+            "Im Anfang schuf Gott die Himmel und die Erde.",
+        )
+        self.assertIsNone(self.bible.get_verse("1. Mose", 1, 999))
+        self.assertIsNone(self.bible.get_chapter("1. Mose", 999))
+        self.assertEqual(self.bible.get_book_names(), ["1. Mose"])
+        self.assertEqual(self.bible.get_chapter_count("1. Mose"), 1)
+        self.assertEqual(self.bible.get_verse_count("1. Mose", 1), 11)
+
+    def test_resolve_book_aliases(self):
+        """Test resolving book names, abbreviations and IDs to the book key"""
+        for name in ("1. Mose", "1Mos", "1 mose", "Gen", "genesis", "1"):
+            self.assertEqual(self.bible.resolve_book(name), "1. Mose")
+        self.assertIsNone(self.bible.resolve_book("Johannes"))
+        self.assertIsNone(self.bible.resolve_book("Unknown"))
+        self.assertEqual(
+            self.bible.get_verse("Gen", 1, 3), self.bible.get_verse("1. Mose", 1, 3)
+        )
+        self.assertEqual(self.bible.get_chapter_count("genesis"), 1)
+        self.assertEqual(self.bible.get_verse_count("1Mos", 1), 11)
+
+    def test_resolve_book_after_books_change(self):
+        """Test that the alias table follows replaced and compacted books"""
+        self.assertEqual(self.bible.resolve_book("Gen"), "1. Mose")
+        self.bible.books = {"Genesis": {1: {1: "In the beginning"}}}
+        self.assertEqual(self.bible.resolve_book("1. Mose"), "Genesis")
+        self.bible.compact()
+        self.assertEqual(self.bible.get_verse("1Mos", 1, 1), "In the beginning")
+
+    def test_verse_ids(self):
+        """Test converting references to verse IDs and back"""
+        self.assertEqual(len(self.bible.verse_index), 11)
+        self.assertEqual(self.bible.verse_id("1. Mose", 1, 1), 0)
+        self.assertEqual(self.bible.verse_id("Gen", 1, 11), 10)
+        self.assertIsNone(self.bible.verse_id("1. Mose", 1, 12))
+        self.assertIsNone(self.bible.verse_id("Johannes", 3, 16))
+        self.assertEqual(self.bible.verse_reference(4), ("1. Mose", 1, 5))
+        self.assertIsNone(self.bible.verse_reference(11))
+
+    def test_get_range(self):
+        """Test slicing verses by ID, clamped to the bible"""
+        verses = self.bible.get_range(9, 20)
+        self.assertEqual([verse[0] for verse in verses], [9, 10])
+        self.assertEqual(verses[0][1:4], ("1. Mose", 1, 10))
+        self.assertEqual(verses[0][4], self.bible.get_verse("1. Mose", 1, 10))
+        self.assertEqual(self.bible.get_range(3, 2), [])
+
+        expected = self.bible.get_range(0, 10)
+        self.bible.compact()
+        self.assertEqual(self.bible.get_range(0, 10), expected)
+
+    def test_verse_index_follows_parsing(self):
+        """Test that parsing more verses rebuilds the verse index"""
+        self.assertEqual(len(self.bible.verse_index), 11)
+        self.bible._parse_text("0#1. Mose#1#12#Und die Erde brachte Gras hervor.")
+        self.assertEqual(len(self.bible.verse_index), 12)
+
+    def test_content_hashes_follow_parsing(self):
+        """Test that parsing more verses changes the chapter hash"""
+        before = self.bible.content_hashes.chapter("1. Mose", 1)
+        self.bible._parse_text("0#1. Mose#1#12#Und die Erde brachte Gras hervor.")
+        self.assertNotEqual(self.bible.content_hashes.chapter("1. Mose", 1), before)
+        compacted = pickle.loads(pickle.dumps(self.bible))
+        self.assertEqual(
+            compacted.content_hashes.translation,
+            self.bible.content_hashes.translation,
+        )
+
+    def test_aload_text_in_chunks(self):
+        """Test that chunked async loading matches parsing the whole text"""
+        content = "\n".join(
+            f"0#1. Mose#1#{verse}#{text}"
+            for verse, text in self.bible.books["1. Mose"][1].items()
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            bible = BibleTestHelper("Async")
+            # Chunks end in the middle of lines
+            with patch("bible_base.LOAD_CHUNK_SIZE", 37):
+                asyncio.run(bible.aload_text(path))
+        self.assertEqual(bible.books, self.bible.books)
+        self.assertEqual(bible.verse_id("1. Mose", 1, 11), 10)
+
+    def test_aload_text_missing_file(self):
+        """Test that a missing file raises and leaves the bible empty"""
+        bible = BibleTestHelper("Async")
+        with self.assertRaises(OSError):
+            asyncio.run(bible.aload_text("non_existent_file.txt"))
+        self.assertEqual(bible.books, {})
+
+    def test_aload_text_decode_error(self):
+        """Test that a decode error after the first chunks keeps no verses"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test.txt")
+            with open(path, "wb") as f:
+                f.write("0#1. Mose#1#1#Im Anfang schuf Gott.\n".encode() * 20)
+                f.write(b"0#1. Mose#1#2#\xff\n")
+            bible = BibleTestHelper("Async")
+            with patch("bible_base.LOAD_CHUNK_SIZE", 37):
+                with self.assertRaises(UnicodeDecodeError):
+                    asyncio.run(bible.aload_text(path))
+        self.assertEqual(bible.books, {})
+
     def test_normalize_german_book_name_abbreviations(self):
         """Test normalization of German book name abbreviations"""
         bible = BibleTestHelper("Test")
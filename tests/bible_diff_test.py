@@ -0,0 +1,106 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from bible_diff import (
+    ADDED,
+    CHANGED,
+    REMOVED,
+    diff_bibles,
+    format_change,
+    main,
+    verse_fingerprint,
+)
+from conftest import make_bible
+
+OLD_TEXT = """0#1. Mose#1#1#Im Anfang schuf Gott die Himmel und die Erde.
+0#1. Mose#1#2#Und die Erde war wüst und leer.
+0#Johannes#3#16#Denn also hat Gott die Welt geliebt."""
+
+NEW_TEXT = """0#1. Mose#1#1#Im Anfang schuf Gott die Himmel und die Erde.
+0#1. Mose#1#2#Und die Erde war wüst und öde.
+0#1. Mose#1#3#Und Gott sprach: Es werde Licht!"""
+
+
+class TestBibleDiff(unittest.TestCase):
+    def test_verse_fingerprint(self):
+        """Test that fingerprints are short and depend on the text only"""
+        fingerprint = verse_fingerprint("Und es ward Licht.")
+        self.assertEqual(len(fingerprint), 8)
+        self.assertEqual(fingerprint, verse_fingerprint("Und es ward Licht."))
+        self.assertNotEqual(fingerprint, verse_fingerprint("Und es ward Licht!"))
+
+    def test_diff_revisions(self):
+        """Test added, removed and changed verses between two revisions"""
+        diff = diff_bibles(make_bible(OLD_TEXT), make_bible(NEW_TEXT))
+        self.assertEqual(
+            [(c.change, c.book, c.chapter, c.verse) for c in diff.changes()],
+            [
+                (CHANGED, "1. Mose", 1, 2),
+                (ADDED, "1. Mose", 1, 3),
+                (REMOVED, "Johannes", 3, 16),
+            ],
+        )
+        self.assertEqual(diff.changed[0].old, "Und die Erde war wüst und leer.")
+        self.assertEqual(diff.changed[0].new, "Und die Erde war wüst und öde.")
+        self.assertIsNone(diff.added[0].old)
+        self.assertIsNone(diff.removed[0].new)
+        self.assertEqual(diff.chapters(), {("1. Mose", 1), ("Johannes", 3)})
+        self.assertFalse(diff.is_empty())
+
+    def test_diff_identical_and_compact(self):
+        """Test that compact and dict bibles with the same verses do not differ"""
+        compact = make_bible(OLD_TEXT)
+        compact.compact()
+        self.assertTrue(diff_bibles(make_bible(OLD_TEXT), compact).is_empty())
+
+    def test_diff_aligns_book_names_across_translations(self):
+        """Test that books are aligned by ID, not by name"""
+        english = make_bible(
+            "Genesis 1:1 In the beginning God created the heavens and the earth.",
+            "English",
+        )
+        diff = diff_bibles(make_bible(OLD_TEXT), english)
+        self.assertEqual(
+            [(c.change, c.book, c.verse) for c in diff.changes()],
+            [
+                (CHANGED, "Genesis", 1),
+                (REMOVED, "1. Mose", 2),
+                (REMOVED, "Johannes", 16),
+            ],
+        )
+
+    def test_format_change(self):
+        """Test the one line format of the CLI"""
+        diff = diff_bibles(make_bible(OLD_TEXT), make_bible(NEW_TEXT))
+        self.assertEqual(
+            format_change(diff.added[0]),
+            "+ 1. Mose 1:3 Und Gott sprach: Es werde Licht!",
+        )
+        self.assertTrue(format_change(diff.removed[0]).startswith("- Johannes 3:16 "))
+        self.assertIn(" -> ", format_change(diff.changed[0]))
+
+    def test_main(self):
+        """Test comparing two text files on the command line"""
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for name, content in (("old", OLD_TEXT), ("new", NEW_TEXT)):
+                path = os.path.join(directory, f"elberfelder1905_{name}.txt")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(content)
+                paths.append(path)
+
+            output = io.StringIO()
+            with redirect_stdout(output):
+                main(paths)
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("~ 1. Mose 1:2 "))
+        self.assertEqual(lines[-1], "1 added, 1 removed, 1 changed")
+
+
+if __name__ == "__main__":
+    unittest.main()
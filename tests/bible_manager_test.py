@@ -1,7 +1,13 @@
+import asyncio
+import os
+import tempfile
+import threading
 import unittest
 from unittest.mock import MagicMock, patch
 
-from bible_manager import BibleManager
+from autocomplete import AutocompleteIndex
+from bible_manager import BibleManager, _index_bible, _load_lazy_bible
+from corpus_stats import CorpusStatistics
 
 
 class TestBibleManager(unittest.TestCase):
@@ -44,6 +50,295 @@ class TestBibleManager(unittest.TestCase):
             # No bibles should be loaded
             self.assertEqual(len(self.manager.bibles), 0)
 
+    def write_texts(self, directory, *filenames):
+        """Write the sample content to files in a directory"""
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.sample_content)
+
+    def test_load_bibles_sequential(self):
+        """Test loading bibles from real files in-process"""
+        with tempfile.TemporaryDirectory() as texts_dir:
+            self.write_texts(texts_dir, "elberfelder1905.txt", "world.txt")
+            with patch("builtins.print"):
+                asyncio.run(self.manager.load_bibles(texts_dir))
+
+        self.assertEqual(
+            sorted(self.manager.get_translation_names()),
+            ["Elberfelder1905", "WorldEnglishBible"],
+        )
+        bible = self.manager.get_bible("Elberfelder1905")
+        self.assertEqual(bible.get_verse_count("1. Mose", 1), 3)
+        self.assertEqual(
+            self.manager.status,
+            {"Elberfelder1905": "ready", "WorldEnglishBible": "ready"},
+        )
+        self.assertTrue(self.manager.is_ready())
+
+    def test_load_status(self):
+        """Test that translations are loading until added, failed if empty"""
+        with tempfile.TemporaryDirectory() as texts_dir:
+            self.write_texts(texts_dir, "elberfelder1905.txt")
+            with open(os.path.join(texts_dir, "world.txt"), "w") as f:
+                f.write("no verses")
+            # Valid verses followed by bytes that are not UTF-8
+            with open(os.path.join(texts_dir, "schlachter1951.txt"), "wb") as f:
+                f.write(self.sample_content.encode() + b"\n0#1. Mose#1#4#\xff")
+            statuses = []
+            self.manager.add_reload_listener(
+                lambda name, diff: statuses.append(self.manager.status.get(name))
+            )
+            with patch("builtins.print"):
+                asyncio.run(self.manager.load_bibles(texts_dir))
+
+        self.assertEqual(statuses, ["ready"])
+        self.assertEqual(self.manager.status["WorldEnglishBible"], "failed")
+        self.assertEqual(self.manager.status["Schlachter1951"], "failed")
+        self.assertEqual(self.manager.get_translation_names(), ["Elberfelder1905"])
+        self.assertTrue(self.manager.is_ready())
+
+    def test_index_built_off_event_loop(self):
+        """Test that search indexes and content hashes are built in a thread"""
+        threads = []
+
+        def index_bible(bible):
+            threads.append(threading.current_thread())
+            return _index_bible(bible)
+
+        with tempfile.TemporaryDirectory() as texts_dir:
+            self.write_texts(texts_dir, "elberfelder1905.txt")
+            with patch("builtins.print"), patch(
+                "bible_manager._index_bible", side_effect=index_bible
+            ):
+                asyncio.run(self.manager.load_bibles(texts_dir))
+
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+        self.assertIn("Elberfelder1905", self.manager.search_indexes)
+        self.assertIn("Elberfelder1905", self.manager.index_seconds)
+
+    def test_load_bibles_parallel(self):
+        """Test loading bibles in a process pool"""
+        with tempfile.TemporaryDirectory() as texts_dir:
+            self.write_texts(
+                texts_dir, "elberfelder1905.txt", "schlachter1951.txt", "world.txt"
+            )
+            with patch("builtins.print"):
+                asyncio.run(self.manager.load_bibles(texts_dir, max_workers=2))
+
+        self.assertEqual(
+            sorted(self.manager.get_translation_names()),
+            ["Elberfelder1905", "Schlachter1951", "WorldEnglishBible"],
+        )
+        bible = self.manager.get_bible("Schlachter1951")
+        self.assertEqual(
+            bible.get_verse("1. Mose", 1, 1),
+            "Im Anfang schuf Gott die Himmel und die Erde.",
+        )
+
+    def test_reload_file(self):
+        """Test swapping in a changed translation and notifying listeners"""
+        listener = MagicMock()
+        self.manager.add_reload_listener(listener)
+        with tempfile.TemporaryDirectory() as texts_dir:
+            self.write_texts(texts_dir, "elberfelder1905.txt")
+            file_path = os.path.join(texts_dir, "elberfelder1905.txt")
+
+            async def load_and_reload():
+                await self.manager.load_bibles(texts_dir)
+                old_bible = self.manager.get_bible("Elberfelder1905")
+                with open(file_path, "a", encoding="utf-8") as f:
+                    f.write("\n0#Johannes#3#16#Denn also hat Gott die Welt geliebt.")
+                await self.manager.reload_file(file_path)
+                return old_bible
+
+            with patch("builtins.print"):
+                old_bible = asyncio.run(load_and_reload())
+
+        bible = self.manager.get_bible("Elberfelder1905")
+        self.assertIsNot(bible, old_bible)
+        self.assertEqual(old_bible.get_book_names(), ["1. Mose"])
+        self.assertEqual(bible.get_book_names(), ["1. Mose", "Johannes"])
+        self.assertEqual(
+            self.manager.search_indexes["Elberfelder1905"].search("Welt")[0], 1
+        )
+        self.assertEqual(listener.call_count, 2)
+        name, diff = listener.call_args.args
+        self.assertEqual(name, "Elberfelder1905")
+        self.assertEqual(
+            [(change.book, change.chapter, change.verse) for change in diff.added],
+            [("Johannes", 3, 16)],
+        )
+        self.assertEqual(diff.removed, [])
+        self.assertEqual(diff.changed, [])
+        self.assertIs(self.manager.diffs["Elberfelder1905"], diff)
+
+    def test_load_without_indexes(self):
+        """Test that publishing processes skip search indexes and hashes"""
+        with tempfile.TemporaryDirectory() as texts_dir:
+            self.write_texts(texts_dir, "world.txt")
+            with patch("builtins.print"):
+                asyncio.run(self.manager.load_bibles(texts_dir, build_indexes=False))
+
+        bible = self.manager.get_bible("WorldEnglishBible")
+        self.assertEqual(bible.get_verse_count("1. Mose", 1), 3)
+        self.assertEqual(self.manager.search_indexes, {})
+        self.assertIsNone(bible._content_hashes)
+
+    def test_autocomplete_index_off_event_loop(self):
+        """Test that completions are built in a thread on first use"""
+        threads = []
+
+        def build(bible, search_index):
+            threads.append(threading.current_thread())
+            return AutocompleteIndex(bible, search_index)
+
+        with tempfile.TemporaryDirectory() as texts_dir:
+            self.write_texts(texts_dir, "elberfelder1905.txt")
+
+            async def load_and_complete():
+                await self.manager.load_bibles(texts_dir)
+                first = await self.manager.get_autocomplete_index("Elberfelder1905")
+                second = await self.manager.get_autocomplete_index("Elberfelder1905")
+                missing = await self.manager.get_autocomplete_index("Unknown")
+                return first, second, missing
+
+            with patch("builtins.print"), patch(
+                "bible_manager.AutocompleteIndex", side_effect=build
+            ):
+                first, second, missing = asyncio.run(load_and_complete())
+
+        self.assertIs(first, second)
+        self.assertIsNone(missing)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+        self.assertEqual(first.complete_words("Fin", 1)[0].text, "finsternis")
+
+    def test_statistics_off_event_loop(self):
+        """Test that statistics are built in a thread and dropped on reload"""
+        threads = []
+
+        def build(search_index):
+            threads.append(threading.current_thread())
+            return CorpusStatistics(search_index)
+
+        with tempfile.TemporaryDirectory() as texts_dir:
+            self.write_texts(texts_dir, "elberfelder1905.txt")
+
+            async def load_and_count():
+                await self.manager.load_bibles(texts_dir)
+                first = await self.manager.get_statistics("Elberfelder1905")
+                second = await self.manager.get_statistics("Elberfelder1905")
+                missing = await self.manager.get_statistics("Unknown")
+                return first, second, missing
+
+            with patch("builtins.print"), patch(
+                "bible_manager.CorpusStatistics", side_effect=build
+            ):
+                first, second, missing = asyncio.run(load_and_count())
+
+        self.assertIs(first, second)
+        self.assertIsNone(missing)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+        self.assertEqual(first.top_words(1)[0].word, "und")
+
+        # Statistics of a translation reloaded while they were built are not kept
+        def reload_meanwhile(search_index):
+            self.manager.bibles["Elberfelder1905"] = MagicMock()
+            return CorpusStatistics(search_index)
+
+        self.manager.statistics.clear()
+        with patch("bible_manager.CorpusStatistics", side_effect=reload_meanwhile):
+            asyncio.run(self.manager.get_statistics("Elberfelder1905"))
+        self.assertEqual(self.manager.statistics, {})
+
+    def test_lazy_search_index_off_event_loop(self):
+        """Test that lazy bibles hash at load and index on first search in a thread"""
+        threads = []
+
+        def index_bible(bible):
+            threads.append(threading.current_thread())
+            return _index_bible(bible)
+
+        with tempfile.TemporaryDirectory() as texts_dir:
+            self.write_texts(texts_dir, "world.txt")
+
+            async def load_and_search():
+                await self.manager.load_bibles(texts_dir, lazy_max_bytes=10**6)
+                self.assertEqual(threads, [])
+                first = await self.manager.get_search_index("WorldEnglishBible")
+                second = await self.manager.get_search_index("WorldEnglishBible")
+                return first, second
+
+            with patch("builtins.print"), patch(
+                "bible_manager._index_bible", side_effect=index_bible
+            ):
+                first, second = asyncio.run(load_and_search())
+            bible = self.manager.get_bible("WorldEnglishBible")
+            self.assertIsNotNone(bible._content_hashes)
+            self.assertEqual(first.search("Licht")[0], 1)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+        self.assertIn("WorldEnglishBible", self.manager.index_seconds)
+
+    def test_reload_lazy_file_off_event_loop(self):
+        """Test that reloading scans a lazily loaded file in a thread"""
+        threads = []
+
+        def load_lazy_bible(*args):
+            threads.append(threading.current_thread())
+            return _load_lazy_bible(*args)
+
+        with tempfile.TemporaryDirectory() as texts_dir:
+            self.write_texts(texts_dir, "world.txt")
+            file_path = os.path.join(texts_dir, "world.txt")
+
+            async def load_and_reload():
+                await self.manager.load_bibles(texts_dir, lazy_max_bytes=10**6)
+                await self.manager.reload_file(file_path)
+
+            with patch("builtins.print"), patch(
+                "bible_manager._load_lazy_bible", side_effect=load_lazy_bible
+            ):
+                asyncio.run(load_and_reload())
+            # Books are parsed from the file on first access
+            bible = self.manager.get_bible("WorldEnglishBible")
+            self.assertEqual(bible.get_verse_count("1. Mose", 1), 3)
+
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.main_thread(), threads)
+
+    def test_reload_deleted_file(self):
+        """Test that deleting a text file removes its translation"""
+        listener = MagicMock()
+        self.manager.add_reload_listener(listener)
+        with tempfile.TemporaryDirectory() as texts_dir:
+            self.write_texts(texts_dir, "world.txt")
+            file_path = os.path.join(texts_dir, "world.txt")
+
+            async def load_and_delete():
+                await self.manager.load_bibles(texts_dir)
+                os.remove(file_path)
+                await self.manager.reload_file(file_path)
+
+            with patch("builtins.print"):
+                asyncio.run(load_and_delete())
+
+        self.assertEqual(self.manager.get_translation_names(), [])
+        self.assertIsNone(
+            asyncio.run(self.manager.get_search_index("WorldEnglishBible"))
+        )
+        listener.assert_called_with("WorldEnglishBible", None)
+
+    def test_reload_unknown_file(self):
+        """Test that files of unknown translations are ignored"""
+        asyncio.run(self.manager.reload_file("src/texts/unknown.txt"))
+        self.assertEqual(self.manager.bibles, {})
+
     def test_get_bible_existing(self):
         """Test getting existing bible translation"""
         # Add a mock bible
@@ -0,0 +1,57 @@
+import unittest
+
+from book_registry import (
+    BOOK_COUNT,
+    BOOK_NAMES,
+    ENGLISH_ABBREVIATIONS,
+    ENGLISH_BOOK_NAMES,
+    GERMAN_BOOK_NAMES,
+    alias_key,
+    book_id,
+    book_name,
+    canonical_book_name,
+)
+
+
+class TestBookRegistry(unittest.TestCase):
+    def test_book_ids(self):
+        """Test that books are numbered 1 to 66 in canonical order"""
+        self.assertEqual(BOOK_COUNT, 66)
+        self.assertEqual(book_name(1), "1. Mose")
+        self.assertEqual(book_name(40), "Matthäus")
+        self.assertEqual(book_name(66), "Offenbarung")
+        self.assertIsNone(book_name(0))
+        self.assertIsNone(book_name(67))
+
+    def test_book_id_aliases(self):
+        """Test German and English names and abbreviations"""
+        for name in ("1. Mose", "1Mos", "1 Mos.", "genesis", "Gen", "GEN", " 1 "):
+            self.assertEqual(book_id(name), 1)
+        self.assertEqual(book_id("Joh"), 43)
+        self.assertEqual(book_id("1 John"), 62)
+        self.assertEqual(book_id("1joh"), 62)
+        self.assertEqual(book_id("Song of Solomon"), 22)
+        self.assertEqual(book_id("röm"), 45)
+        self.assertIsNone(book_id("Unknown"))
+        self.assertIsNone(book_id("67"))
+
+    def test_aliases_are_unambiguous(self):
+        """Test that no alias names two different books"""
+        aliases = {}
+        for table in (ENGLISH_ABBREVIATIONS, ENGLISH_BOOK_NAMES, GERMAN_BOOK_NAMES):
+            for alias, name in table.items():
+                self.assertIn(name, BOOK_NAMES)
+                key = alias_key(alias)
+                self.assertEqual(aliases.setdefault(key, name), name, alias)
+
+    def test_canonical_book_name(self):
+        """Test mapping German and English names to the German name"""
+        self.assertEqual(canonical_book_name("Genesis"), "1. Mose")
+        self.assertEqual(canonical_book_name("song of solomon"), "Hohelied")
+        self.assertEqual(canonical_book_name("1Kor"), "1. Korinther")
+        self.assertEqual(canonical_book_name("RÖMER"), "Römer")
+        self.assertEqual(canonical_book_name("Unknown"), "Unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import gzip
+import unittest
+
+from compression import ENCODERS, compress, negotiate_encoding, variant_etag
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class TestCompression(unittest.TestCase):
+    def test_negotiate_gzip(self):
+        """Test picking gzip from Accept-Encoding headers"""
+        self.assertEqual(negotiate_encoding("gzip, deflate"), "gzip")
+        self.assertEqual(negotiate_encoding("GZIP;q=0.5"), "gzip")
+        self.assertEqual(negotiate_encoding("*"), next(iter(ENCODERS)))
+
+    def test_negotiate_uncompressed(self):
+        """Test headers that do not accept a supported encoding"""
+        self.assertIsNone(negotiate_encoding(None))
+        self.assertIsNone(negotiate_encoding(""))
+        self.assertIsNone(negotiate_encoding("identity"))
+        self.assertIsNone(negotiate_encoding("deflate, zstd"))
+        self.assertIsNone(negotiate_encoding("gzip;q=0"))
+        self.assertIsNone(negotiate_encoding("*;q=0"))
+        self.assertIsNone(negotiate_encoding("gzip;q=x"))
+
+    @unittest.skipIf(brotli is None, "brotli is not installed")
+    def test_negotiate_brotli(self):
+        """Test that brotli is preferred unless gzip has a higher quality"""
+        self.assertEqual(negotiate_encoding("gzip, br"), "br")
+        self.assertEqual(negotiate_encoding("gzip, br;q=0.5"), "gzip")
+        self.assertEqual(brotli.decompress(compress(b"x" * 100, "br")), b"x" * 100)
+
+    def test_gzip_is_deterministic(self):
+        """Test that gzip output does not depend on the time"""
+        body = "Im Anfang schuf Gott die Himmel und die Erde. ".encode() * 50
+        compressed = compress(body, "gzip")
+        self.assertEqual(gzip.decompress(compressed), body)
+        self.assertEqual(compressed, compress(body, "gzip"))
+        self.assertLess(len(compressed), len(body))
+
+    def test_variant_etag(self):
+        """Test distinct strong ETags per encoding"""
+        self.assertEqual(variant_etag('"abc"', None), '"abc"')
+        self.assertEqual(variant_etag('"abc"', "gzip"), '"abc-gzip"')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,3 +3,25 @@ import sys
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bible_base import Bible  # noqa: E402
+
+# Sample translation in the hash line format shared by the tests
+SAMPLE_TEXT = """0#1. Mose#1#1#Im Anfang schuf Gott die Himmel und die Erde.
+0#1. Mose#1#2#Und die Erde war wüst und leer.
+0#1. Mose#2#1#Und die Himmel und die Erde wurden vollendet.
+0#Johannes#3#16#Denn also hat Gott die Welt geliebt, daß er seinen Sohn gab."""
+
+
+class SampleBible(Bible):
+    """Concrete implementation of Bible for testing, loads SAMPLE_TEXT"""
+
+    def load_text(self, file_path: str) -> None:
+        self._parse_text(SAMPLE_TEXT)
+
+
+def make_bible(text: str = SAMPLE_TEXT, name: str = "Test") -> Bible:
+    """Build a bible from text in the hash line format"""
+    bible = SampleBible(name)
+    bible._parse_text(text)
+    return bible
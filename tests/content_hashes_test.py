@@ -0,0 +1,50 @@
+import unittest
+
+from content_hashes import ContentHashes, chapter_hash
+from verse_store import VerseStore
+
+BOOKS = {
+    "1. Mose": {
+        1: {1: "Im Anfang schuf Gott die Himmel und die Erde.", 2: "Und die Erde."},
+        2: {1: "Und die Himmel und die Erde wurden vollendet."},
+    },
+    "Johannes": {3: {16: "Denn also hat Gott die Welt geliebt."}},
+}
+
+
+class TestContentHashes(unittest.TestCase):
+    def test_chapter_hash(self):
+        """Test that chapter hashes depend on verse numbers and texts only"""
+        verses = BOOKS["1. Mose"][1]
+        content_hash = chapter_hash(verses)
+        self.assertEqual(len(content_hash), 16)
+        self.assertEqual(content_hash, chapter_hash(dict(reversed(verses.items()))))
+        self.assertNotEqual(content_hash, chapter_hash({1: verses[1], 3: verses[2]}))
+        self.assertNotEqual(content_hash, chapter_hash({**verses, 2: "Und."}))
+
+    def test_content_hashes(self):
+        """Test chapter lookups and that a changed verse changes its hashes"""
+        hashes = ContentHashes(BOOKS)
+        self.assertEqual(
+            hashes.chapter("1. Mose", 2), chapter_hash(BOOKS["1. Mose"][2])
+        )
+        self.assertIsNone(hashes.chapter("1. Mose", 3))
+        self.assertIsNone(hashes.chapter("Ruth", 1))
+
+        revised = {**BOOKS, "Johannes": {3: {16: "Denn also hat Gott geliebt."}}}
+        changed = ContentHashes(revised)
+        self.assertEqual(changed.chapters["1. Mose"], hashes.chapters["1. Mose"])
+        self.assertNotEqual(
+            changed.chapter("Johannes", 3), hashes.chapter("Johannes", 3)
+        )
+        self.assertNotEqual(changed.translation, hashes.translation)
+
+    def test_compact_books(self):
+        """Test that compact and dict books hash the same"""
+        hashes = ContentHashes(VerseStore.from_books(BOOKS))
+        self.assertEqual(hashes.chapters, ContentHashes(BOOKS).chapters)
+        self.assertEqual(hashes.translation, ContentHashes(BOOKS).translation)
+
+
+if __name__ == "__main__":
+    unittest.main()
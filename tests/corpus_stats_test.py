@@ -0,0 +1,115 @@
+import unittest
+
+from conftest import make_bible
+from corpus_stats import CorpusStatistics, np
+from search_index import SearchIndex
+
+STATISTICS_TEXT = """0#1. Mose#1#1#Im Anfang schuf Gott die Himmel und die Erde.
+0#1. Mose#1#2#Und die Erde war wüst und leer, und Finsternis war über der Tiefe.
+0#1. Mose#1#3#Und Gott sprach: Es werde Licht! und es ward Licht.
+0#1. Mose#2#1#Und die Himmel und die Erde wurden vollendet.
+0#Johannes#1#1#Im Anfang war das Wort, und das Wort war bei Gott.
+0#Johannes#3#16#Denn also hat Gott die Welt geliebt, daß er seinen Sohn gab."""
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestCorpusStatistics(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.statistics = CorpusStatistics(SearchIndex(make_bible(STATISTICS_TEXT)))
+
+    def test_matrix(self):
+        """Test that rows and columns hold the same word counts"""
+        statistics = self.statistics
+        self.assertEqual(list(statistics.row_starts), [0, 8, 18, 25, 31, 39, 51])
+        verse = statistics.row_words[
+            statistics.row_starts[2] : statistics.row_starts[3]
+        ]
+        self.assertEqual(
+            [statistics.vocabulary[word_id] for word_id in verse],
+            ["es", "gott", "licht", "sprach", "und", "ward", "werde"],
+        )
+        self.assertEqual(statistics.column_counts.sum(), statistics.row_counts.sum())
+        self.assertEqual(list(statistics.verse_lengths), [9, 13, 10, 8, 11, 12])
+
+    def test_word_count(self):
+        """Test counting the words of a verse range"""
+        self.assertEqual(self.statistics.word_count(), 63)
+        self.assertEqual(self.statistics.word_count(4), 23)
+        self.assertEqual(self.statistics.word_count(1, 2), 23)
+
+    def test_top_words(self):
+        """Test the most frequent words, ties in alphabetical order"""
+        self.assertEqual(
+            [tuple(count) for count in self.statistics.top_words(3)],
+            [("und", 9, 5), ("die", 6, 4), ("gott", 4, 4)],
+        )
+        self.assertEqual(
+            [count.word for count in self.statistics.top_words(3, 4, 4)],
+            ["das", "war", "wort"],
+        )
+        self.assertEqual(len(self.statistics.top_words(1000)), 35)
+
+    def test_frequency_by_book(self):
+        """Test counting a word per book"""
+        self.assertEqual(
+            [
+                tuple(frequency)
+                for frequency in self.statistics.frequency_by_book("die")
+            ],
+            [("1. Mose", 5, 3, 125.0), ("Johannes", 1, 1, 43.478)],
+        )
+        self.assertEqual(
+            [frequency.book for frequency in self.statistics.frequency_by_book("wort")],
+            ["Johannes"],
+        )
+        self.assertEqual(self.statistics.frequency_by_book("Posaune"), [])
+
+    def test_concordance(self):
+        """Test occurrences in context"""
+        total, lines = self.statistics.concordance("und", width=2, limit=3, offset=1)
+        self.assertEqual(total, 9)
+        self.assertEqual(
+            [tuple(line) for line in lines],
+            [
+                ("1. Mose", 1, 2, "", "Und", " die Erde"),
+                ("1. Mose", 1, 2, "war wüst ", "und", " leer, und"),
+                ("1. Mose", 1, 2, "und leer, ", "und", " Finsternis war"),
+            ],
+        )
+        _, lines = self.statistics.concordance("gott", width=20)
+        self.assertEqual(
+            lines[1].left + lines[1].word + lines[1].right,
+            "Und Gott sprach: Es werde Licht! und es ward Licht.",
+        )
+
+    def test_concordance_scope(self):
+        """Test occurrences within a verse range"""
+        total, lines = self.statistics.concordance("dass", start=5)
+        self.assertEqual(total, 1)
+        self.assertEqual(lines[0].word, "daß")
+        self.assertEqual(self.statistics.concordance("wort", end=3), (0, []))
+        self.assertEqual(self.statistics.concordance("und", offset=9), (9, []))
+
+    def test_cooccurrences(self):
+        """Test words ranked by shared verses relative to their frequency"""
+        verses, words = self.statistics.cooccurrences("erde", 3)
+        self.assertEqual(verses, 3)
+        self.assertEqual(
+            [tuple(word) for word in words],
+            [("die", 3, 0.8571), ("himmel", 2, 0.8), ("und", 3, 0.75)],
+        )
+
+    def test_cooccurrences_scope(self):
+        """Test co-occurrences counted within a verse range"""
+        verses, words = self.statistics.cooccurrences("gott", 2, start=4)
+        self.assertEqual(verses, 2)
+        # The two verses share no other word
+        self.assertEqual([word.word for word in words], ["also", "anfang"])
+        self.assertEqual(words[0].dice, 0.6667)
+        self.assertEqual(self.statistics.cooccurrences("wort", 5, end=3), (0, []))
+        self.assertEqual(self.statistics.cooccurrences("Posaune", 5), (0, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from bible_manager import BibleManager
+from corpus import dump_corpus, load_corpus, main, read_corpus_buffer, write_corpus
+from verse_store import VerseStore
+
+
+class TestCorpus(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.books = {
+            "1. Mose": {
+                1: {
+                    1: "Im Anfang schuf Gott die Himmel und die Erde.",
+                    2: "Und die Erde war wüst und leer.",
+                },
+                2: {1: "Und die Himmel und die Erde wurden vollendet."},
+            },
+            "Römer": {8: {28: "Wir wissen aber, daß denen, die Gott lieben."}},
+        }
+        self.store = VerseStore.from_books(self.books)
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_dump_and_read_round_trip(self):
+        """Test reading a serialized corpus back from a buffer"""
+        data = dump_corpus("Elberfelder1905", self.store)
+        self.assertEqual(data[:4], b"PYBL")
+
+        name, store = read_corpus_buffer(data)
+        self.assertEqual(name, "Elberfelder1905")
+        self.assertEqual(store, self.books)
+        self.assertEqual(store.chapters, self.store.chapters)
+        self.assertIsInstance(store.text, memoryview)
+
+    def test_read_empty_corpus(self):
+        """Test a corpus without any books"""
+        name, store = read_corpus_buffer(
+            dump_corpus("Empty", VerseStore.from_books({}))
+        )
+        self.assertEqual(name, "Empty")
+        self.assertEqual(len(store), 0)
+
+    def test_read_invalid_buffer(self):
+        """Test that other data is rejected"""
+        with self.assertRaises(ValueError):
+            read_corpus_buffer(b"0#1. Mose#1#1#Im Anfang" + b"\0" * 64)
+
+    def test_write_and_load_corpus(self):
+        """Test memory-mapping a corpus file"""
+        path = os.path.join(self.temp_dir.name, "elberfelder1905.pybl")
+        write_corpus("Elberfelder1905", self.store, path)
+
+        name, store = load_corpus(path)
+        self.assertEqual(name, "Elberfelder1905")
+        self.assertEqual(store["Römer"][8][28], self.books["Römer"][8][28])
+
+    def test_rewrite_mapped_corpus(self):
+        """Test that rewriting a corpus file leaves existing mappings intact"""
+        path = os.path.join(self.temp_dir.name, "elberfelder1905.pybl")
+        write_corpus("Elberfelder1905", self.store, path)
+        _, store = load_corpus(path)
+        inode = os.stat(path).st_ino
+
+        write_corpus("Elberfelder1905", VerseStore.from_books({}), path)
+        self.assertNotEqual(os.stat(path).st_ino, inode)
+        self.assertEqual(store["Römer"][8][28], self.books["Römer"][8][28])
+        self.assertEqual(os.listdir(self.temp_dir.name), ["elberfelder1905.pybl"])
+
+    def test_compile_and_load_bibles(self):
+        """Test that load_bibles serves compiled corpus files"""
+        text_path = os.path.join(self.temp_dir.name, "elberfelder1905.txt")
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write("0#1. Mose#1#1#Im Anfang schuf Gott die Himmel und die Erde.")
+
+        with patch("builtins.print"):
+            main([self.temp_dir.name])
+        corpus_path = os.path.join(self.temp_dir.name, "elberfelder1905.pybl")
+        self.assertTrue(os.path.exists(corpus_path))
+
+        manager = BibleManager()
+        with patch("builtins.print"), patch("bible_manager.load_corpus") as loader:
+            loader.side_effect = load_corpus
+            asyncio.run(manager.load_bibles(self.temp_dir.name))
+            loader.assert_called_once_with(corpus_path)
+
+        bible = manager.get_bible("Elberfelder1905")
+        self.assertEqual(
+            bible.get_verse("1. Mose", 1, 1),
+            "Im Anfang schuf Gott die Himmel und die Erde.",
+        )
+
+    def test_stale_corpus_is_ignored(self):
+        """Test that a corpus older than its text file is not used"""
+        text_path = os.path.join(self.temp_dir.name, "world.txt")
+        corpus_path = os.path.join(self.temp_dir.name, "world.pybl")
+        write_corpus("WorldEnglishBible", self.store, corpus_path)
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write("0#Johannes#3#16#For God so loved the world.")
+        os.utime(corpus_path, (0, 0))
+
+        manager = BibleManager()
+        with patch("builtins.print"):
+            asyncio.run(manager.load_bibles(self.temp_dir.name))
+
+        bible = manager.get_bible("WorldEnglishBible")
+        self.assertEqual(bible.get_book_names(), ["Johannes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+import unittest
+
+from conftest import make_bible
+from export import iter_csv, iter_ndjson
+
+EXPORT_TEXT = """0#1. Mose#1#1#Im Anfang schuf Gott die Himmel und die Erde.
+0#1. Mose#1#2#Und die Erde war wüst und leer, und Finsternis war über der Tiefe.
+0#1. Mose#2#1#Und die Himmel und die Erde wurden vollendet.
+0#Johannes#3#16#Denn also hat Gott die Welt geliebt, "daß" er seinen Sohn gab."""
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.bible = make_bible(EXPORT_TEXT)
+
+    def test_iter_ndjson(self):
+        """Test one JSON object per verse and one chunk per chapter"""
+        chunks = list(iter_ndjson(self.bible))
+        self.assertEqual(len(chunks), 3)
+
+        lines = b"".join(chunks).decode().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(
+            json.loads(lines[1]),
+            {
+                "translation": "Test",
+                "book": "1. Mose",
+                "chapter": 1,
+                "verse": 2,
+                "text": "Und die Erde war wüst und leer, und Finsternis war über der Tiefe.",
+            },
+        )
+
+    def test_iter_csv(self):
+        """Test CSV rows with quoting and a header"""
+        content = b"".join(iter_csv(self.bible)).decode()
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(rows[0], ["book", "chapter", "verse", "text"])
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(
+            rows[4],
+            [
+                "Johannes",
+                "3",
+                "16",
+                'Denn also hat Gott die Welt geliebt, "daß" er seinen Sohn gab.',
+            ],
+        )
+
+    def test_export_compacted_bible(self):
+        """Test exporting a bible backed by a VerseStore"""
+        expected = b"".join(iter_ndjson(self.bible))
+        self.bible.compact()
+        self.assertEqual(b"".join(iter_ndjson(self.bible)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import json
+import unittest
+
+from json_encoding import serialize_json
+from models import BookResponse, VerseResponse
+from verse_store import VerseStore
+
+
+class TestJsonEncoding(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.books = {
+            "1. Mose": {
+                1: {
+                    1: "Im Anfang schuf Gott die Himmel und die Erde.",
+                    2: 'Und Gott sprach: "Es werde Licht!"',
+                },
+                2: {1: "Und die Himmel und die Erde wurden vollendet."},
+            },
+        }
+
+    def test_matches_model_serialization(self):
+        """Test the same bytes as serializing the validated model"""
+        store = VerseStore.from_books(self.books)
+        expected = BookResponse(
+            book="1. Mose", chapters=self.books["1. Mose"], translation="Test"
+        ).model_dump_json()
+        for chapters in (self.books["1. Mose"], store["1. Mose"]):
+            body = serialize_json(
+                {"book": "1. Mose", "chapters": chapters, "translation": "Test"}
+            )
+            self.assertEqual(body, expected.encode())
+
+    def test_non_ascii_and_models(self):
+        """Test that text stays UTF-8 and nested models are encoded"""
+        verse = VerseResponse(
+            book="Römer", chapter=1, verse=16, text="Evangelium", translation="Test"
+        )
+        body = serialize_json({"verse": verse, "empty": None})
+        self.assertIn("Römer".encode(), body)
+        self.assertEqual(json.loads(body)["verse"], verse.model_dump())
+        self.assertIsNone(json.loads(body)["empty"])
+
+    def test_unknown_type(self):
+        """Test that unknown objects are rejected"""
+        with self.assertRaises(TypeError):
+            serialize_json({"value": object()})
+
+
+if __name__ == "__main__":
+    unittest.main()
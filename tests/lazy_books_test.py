@@ -0,0 +1,99 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from bible_manager import BibleManager
+from elberfelder1905 import Elberfelder1905
+from lazy_books import LazyBooks
+
+
+class TestLazyBooks(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.content = """0#1. Mose#1#1#Im Anfang schuf Gott die Himmel und die Erde.
+0#1. Mose#1#2#Und die Erde war wüst und leer.
+
+0#1. Mose#2#1#Und die Himmel und die Erde wurden vollendet.
+0#2Mos#1#1#Und dies sind die Namen der Söhne Israels.
+0#Johannes#3#16#Denn also hat Gott die Welt geliebt.
+0#1. Mose#3#1#Und die Schlange war listiger als alles Getier des Feldes.
+"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "elberfelder1905.txt")
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write(self.content)
+
+        self.bible = Elberfelder1905()
+        self.bible.books = LazyBooks(self.bible, self.file_path, max_bytes=10**6)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_scan_records_book_ranges(self):
+        """Test that construction only indexes books by byte range"""
+        books = self.bible.books
+        self.assertEqual(list(books), ["1. Mose", "2. Mose", "Johannes"])
+        self.assertEqual(len(books.ranges["1. Mose"]), 2)
+        self.assertIn("Johannes", books)
+        self.assertNotIn("Ruth", books)
+        self.assertEqual(books.loads, 0)
+        self.assertEqual(books.resident_books(), [])
+
+        self.assertEqual(len(books["1. Mose"]), 3)
+        self.assertEqual(books.loads, 1)
+
+    def test_matches_eager_parsing(self):
+        """Test that lazily parsed books equal an eagerly parsed bible"""
+        eager = Elberfelder1905()
+        eager.load_text(self.file_path)
+        self.assertEqual(self.bible.books, eager.books)
+        self.assertEqual(self.bible.get_chapter_count("1. Mose"), 3)
+        self.assertEqual(
+            self.bible.get_verse("2. Mose", 1, 1),
+            "Und dies sind die Namen der Söhne Israels.",
+        )
+
+    def test_lru_eviction(self):
+        """Test that the resident set stays within the byte budget"""
+        books = self.bible.books
+        books.max_bytes = books.book_size("2. Mose") + books.book_size("Johannes")
+
+        self.bible.get_book("2. Mose")
+        self.bible.get_book("Johannes")
+        self.assertEqual(books.resident_books(), ["2. Mose", "Johannes"])
+
+        self.bible.get_book("2. Mose")
+        self.bible.get_book("1. Mose")
+        self.assertEqual(books.resident_books(), ["1. Mose"])
+        self.assertLessEqual(books.resident_bytes, books.book_size("1. Mose"))
+
+        self.bible.get_book("Johannes")
+        self.assertEqual(books.loads, 4)
+
+    def test_compact_books(self):
+        """Test keeping parsed books in a VerseStore"""
+        books = LazyBooks(self.bible, self.file_path, max_bytes=10**6, compact=True)
+        self.assertEqual(books["1. Mose"][3][1], self.bible.books["1. Mose"][3][1])
+
+    def test_manager_lazy_mode(self):
+        """Test lazy loading through the manager"""
+        manager = BibleManager()
+        with patch("builtins.print"):
+            asyncio.run(manager.load_bibles(self.temp_dir.name, lazy_max_bytes=10**6))
+
+        # Content hashes are built at load time, the search index on first use
+        bible = manager.get_bible("Elberfelder1905")
+        self.assertIsNotNone(bible._content_hashes)
+        self.assertNotIn("Elberfelder1905", manager.search_indexes)
+
+        search_index = asyncio.run(manager.get_search_index("Elberfelder1905"))
+        self.assertIs(manager.search_indexes["Elberfelder1905"], search_index)
+        total, hits = search_index.search("Schlange")
+        self.assertEqual(total, 1)
+        self.assertEqual(hits[0][:3], ("1. Mose", 3, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,724 @@
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from bible_diff import diff_bibles
+from compression import compress
+from conftest import make_bible
+from corpus_stats import np
+from main import (
+    CACHE_CONTROL,
+    app,
+    bible_manager,
+    diff_cache,
+    invalidate_responses,
+    range_cache,
+    response_cache,
+    startup_complete,
+    verse_cache,
+)
+from models import (
+    AutocompleteResponse,
+    BatchVerseResponse,
+    BibleListResponse,
+    BookResponse,
+    ChapterResponse,
+    CompareResponse,
+    ConcordanceResponse,
+    CoOccurrencesResponse,
+    DiffResponse,
+    FrequencyResponse,
+    RangeResponse,
+    SearchResponse,
+    VerseResponse,
+    WordsResponse,
+)
+from search_index import SearchIndex
+
+
+class TestApi(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        bible = make_bible()
+        bible_manager.bibles = {"Test": bible}
+        bible_manager.search_indexes = {"Test": SearchIndex(bible)}
+        bible_manager.autocomplete_indexes = {}
+        bible_manager.statistics = {}
+        response_cache.clear()
+        verse_cache.clear()
+        range_cache.clear()
+        diff_cache.clear()
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        bible_manager.bibles = {}
+        bible_manager.search_indexes = {}
+        bible_manager.autocomplete_indexes = {}
+        bible_manager.statistics = {}
+
+    def test_get_chapter(self):
+        """Test the chapter endpoint and its cache headers"""
+        response = self.client.get("/api/Test/1. Mose/1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/json")
+        self.assertIn("ETag", response.headers)
+        self.assertIn("max-age", response.headers["Cache-Control"])
+        self.assertEqual(
+            response.json(),
+            {
+                "book": "1. Mose",
+                "chapter": 1,
+                "verses": {
+                    "1": "Im Anfang schuf Gott die Himmel und die Erde.",
+                    "2": "Und die Erde war wüst und leer.",
+                },
+                "translation": "Test",
+            },
+        )
+
+    def test_get_book_is_cached(self):
+        """Test that a book is serialized once and then served from the cache"""
+        hits = response_cache.hits
+        first = self.client.get("/api/Test/1. Mose")
+        second = self.client.get("/api/Test/1. Mose")
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first.headers["ETag"], second.headers["ETag"])
+        self.assertEqual(response_cache.hits, hits + 1)
+        self.assertEqual(set(first.json()["chapters"]), {"1", "2"})
+
+    def test_book_aliases(self):
+        """Test that abbreviations and IDs share the canonical cache entry"""
+        canonical = self.client.get("/api/Test/1. Mose/1/1")
+        for path in ("/api/Test/Gen/1/1", "/api/Test/1mos/1/1", "/api/Test/1/1/1"):
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content, canonical.content)
+        self.assertEqual(len(verse_cache), 1)
+        self.assertEqual(
+            self.client.get("/api/Test/john/chapters").json()["book"], "Johannes"
+        )
+
+    def test_get_book_not_found(self):
+        """Test that missing books are not cached"""
+        response = self.client.get("/api/Test/Offenbarung")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(response_cache), 0)
+
+    def test_conditional_requests(self):
+        """Test 304 Not Modified on every cached route"""
+        for path in (
+            "/api/translations",
+            "/api/Test/books",
+            "/api/Test/1. Mose",
+            "/api/Test/1. Mose/chapters",
+            "/api/Test/1. Mose/2",
+            "/api/Test/1. Mose/1/2",
+        ):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                etag = response.headers["ETag"]
+
+                response = self.client.get(path, headers={"If-None-Match": etag})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b"")
+                self.assertEqual(response.headers["ETag"], etag)
+
+                response = self.client.get(path, headers={"If-None-Match": '"old"'})
+                self.assertEqual(response.status_code, 200)
+
+    def test_list_routes(self):
+        """Test the translation, book and chapter lists"""
+        self.assertEqual(
+            self.client.get("/api/translations").json(), {"translations": ["Test"]}
+        )
+        hashes = bible_manager.bibles["Test"].content_hashes
+        books = self.client.get("/api/Test/books").json()
+        self.assertEqual(books["hash"], hashes.translation)
+        self.assertEqual(
+            books["books"],
+            [
+                {
+                    "name": "1. Mose",
+                    "chapters": 2,
+                    "hashes": {
+                        "1": hashes.chapter("1. Mose", 1),
+                        "2": hashes.chapter("1. Mose", 2),
+                    },
+                },
+                {
+                    "name": "Johannes",
+                    "chapters": 1,
+                    "hashes": {"3": hashes.chapter("Johannes", 3)},
+                },
+            ],
+        )
+        self.assertEqual(
+            self.client.get("/api/Test/1. Mose/chapters").json()["chapters"],
+            [
+                {"chapter": 1, "verses": 2, "hash": hashes.chapter("1. Mose", 1)},
+                {"chapter": 2, "verses": 1, "hash": hashes.chapter("1. Mose", 2)},
+            ],
+        )
+        self.assertEqual(
+            self.client.get("/api/Test/Johannes/3/16").json()["text"],
+            "Denn also hat Gott die Welt geliebt, daß er seinen Sohn gab.",
+        )
+
+    def test_range(self):
+        """Test slicing verses by verse ID and by reference"""
+        response = self.client.get("/api/Test/range", params={"from": 1, "count": 2})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data["start"], data["end"]), (1, 2))
+        self.assertEqual((data["previous"], data["next"]), (0, 3))
+        self.assertEqual(
+            [(v["id"], v["book"], v["chapter"], v["verse"]) for v in data["verses"]],
+            [(1, "1. Mose", 1, 2), (2, "1. Mose", 2, 1)],
+        )
+
+        data = self.client.get(
+            "/api/Test/range", params={"from": "1. Mose 2", "to": "Johannes 3"}
+        ).json()
+        self.assertEqual([v["id"] for v in data["verses"]], [2, 3])
+        self.assertIsNone(data["next"])
+
+        data = self.client.get("/api/Test/range", params={"from": "Gen 1:2"}).json()
+        self.assertEqual([v["id"] for v in data["verses"]], [1, 2, 3])
+
+    def test_range_errors(self):
+        """Test invalid and unknown range bounds"""
+        for params, status in (
+            ({"from": 4}, 404),
+            ({"from": "Ruth 1"}, 404),
+            ({"from": "not a reference"}, 400),
+            ({"from": 2, "to": 1}, 400),
+            ({"from": 0, "count": 0}, 422),
+            ({"from": 0, "to": 2000}, 200),
+        ):
+            with self.subTest(params=params):
+                response = self.client.get("/api/Test/range", params=params)
+                self.assertEqual(response.status_code, status)
+        response = self.client.get("/api/Unknown/range", params={"from": 0})
+        self.assertEqual(response.status_code, 404)
+
+    def test_responses_match_models(self):
+        """Test that unvalidated responses have the shape of their models"""
+        for path, model in (
+            ("/api/translations", BibleListResponse),
+            ("/api/Test/1. Mose", BookResponse),
+            ("/api/Test/1. Mose/1", ChapterResponse),
+            ("/api/Test/1. Mose/1/1", VerseResponse),
+            ("/api/Test/range?from=0", RangeResponse),
+            ("/api/Test/verses?refs=Johannes 3:16", BatchVerseResponse),
+            ("/api/Test/search?q=Erde", SearchResponse),
+            ("/api/compare/Johannes/3", CompareResponse),
+        ):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                validated = model.model_validate_json(response.content)
+                self.assertEqual(validated.model_dump(mode="json"), response.json())
+
+        schemas = self.client.get("/openapi.json").json()["components"]["schemas"]
+        self.assertIn("BookResponse", schemas)
+        self.assertIn("RangeResponse", schemas)
+
+    def test_index_compressed_once(self):
+        """Test that the index page is rendered and compressed once"""
+        with patch("src.response_cache.compress", wraps=compress) as compress_body:
+            first = self.client.get("/", headers={"Accept-Encoding": "gzip"})
+            second = self.client.get("/", headers={"Accept-Encoding": "gzip"})
+        compress_body.assert_called_once()
+        self.assertEqual(first.headers["Content-Encoding"], "gzip")
+        self.assertEqual(first.headers["Vary"], "Accept-Encoding")
+        self.assertTrue(first.headers["ETag"].endswith('-gzip"'))
+        self.assertIn('<option value="Test">', first.text)
+        self.assertEqual(first.content, second.content)
+
+        response = self.client.get(
+            "/",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]},
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_uncompressed_responses(self):
+        """Test identity encoding and small bodies"""
+        response = self.client.get("/", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertFalse(response.headers["ETag"].endswith('-gzip"'))
+        self.assertIn("<option", response.text)
+
+        response = self.client.get(
+            "/api/Test/1. Mose/1", headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.headers["Vary"], "Accept-Encoding")
+
+    def test_metrics(self):
+        """Test that requests are counted per route template"""
+        self.client.get("/api/Test/1. Mose/1")
+        self.client.get("/api/Test/Johannes/3")
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertRegex(
+            response.text,
+            r'http_requests_total\{method="GET",'
+            r'route="/api/\{translation\}/\{book\}/\{chapter:int\}",status="200"\} \d+',
+        )
+        self.assertIn('bible_verses{translation="Test"} 4', response.text)
+        self.assertIn('cache_entries{cache="responses"} 2', response.text)
+        self.assertIn('cache_entries{cache="verses"} 0', response.text)
+
+    def revised_bible(self):
+        """Get a copy of the test bible with one verse text changed"""
+        revised = make_bible()
+        revised.books["1. Mose"][1][2] = "Und die Erde war wüst und öde."
+        return revised
+
+    def test_diff_translations(self):
+        """Test the verse differences between two loaded translations"""
+        bible_manager.bibles["Revised"] = self.revised_bible()
+        response = self.client.get("/api/diff/Test/Revised")
+        self.assertEqual(response.status_code, 200)
+        body = DiffResponse.model_validate(response.json())
+        self.assertEqual((body.added, body.removed, body.changed), (0, 0, 1))
+        self.assertEqual(
+            body.verses[0].model_dump(),
+            {
+                "change": "changed",
+                "book": "1. Mose",
+                "chapter": 1,
+                "verse": 2,
+                "old": "Und die Erde war wüst und leer.",
+                "new": "Und die Erde war wüst und öde.",
+            },
+        )
+
+        response = self.client.get("/api/diff/Test/Revised?book=Joh")
+        self.assertEqual(response.json()["verses"], [])
+        self.assertEqual(self.client.get("/api/diff/Test/Unknown").status_code, 404)
+        self.assertEqual(
+            self.client.get("/api/diff/Test/Revised?book=Ruth").status_code, 404
+        )
+
+    def test_diff_cached(self):
+        """Test that pages of a diff compare the translations once"""
+        bible_manager.bibles["Revised"] = self.revised_bible()
+        with patch("main.diff_bibles", wraps=diff_bibles) as compare:
+            self.client.get("/api/diff/Test/Revised")
+            self.client.get("/api/diff/Test/Revised?offset=1")
+            compare.assert_called_once()
+
+            # A reload of either side drops the diff
+            invalidate_responses("Revised", None)
+            self.assertEqual(diff_cache, {})
+            response = self.client.get("/api/diff/Test/Revised")
+        self.assertEqual(compare.call_count, 2)
+        self.assertEqual(response.json()["changed"], 1)
+
+    def test_reload_changes(self):
+        """Test the verses changed by the last reload of a translation"""
+        self.assertEqual(self.client.get("/api/Test/changes").status_code, 404)
+        diff = diff_bibles(bible_manager.bibles["Test"], self.revised_bible())
+        bible_manager.diffs["Test"] = diff
+        try:
+            response = self.client.get("/api/Test/changes")
+        finally:
+            bible_manager.diffs.pop("Test")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["changed"], 1)
+
+    def test_invalidate_changed_chapters(self):
+        """Test that a reload only drops responses containing changed verses"""
+        paths = (
+            "/api/Test/books",
+            "/api/Test/1. Mose",
+            "/api/Test/1. Mose/1",
+            "/api/Test/1. Mose/2",
+            "/api/Test/1. Mose/1/2",
+            "/api/Test/Johannes/3/16",
+            "/api/Test/range?from=0&to=0",
+            "/api/Test/range?from=1&to=2",
+        )
+        for path in paths:
+            self.client.get(path)
+        revised = self.revised_bible()
+        diff = diff_bibles(bible_manager.bibles["Test"], revised)
+        bible_manager.bibles["Test"] = revised
+
+        invalidate_responses("Test", diff)
+        cached = {
+            key[1:]
+            for cache in (response_cache, verse_cache, range_cache)
+            for key in cache._entries
+            if key[0] == "Test"
+        }
+        self.assertEqual(
+            cached,
+            {
+                ("chapter", "1. Mose", 2),
+                ("verse", "Johannes", 3, 16),
+                ("range", 0, 0),
+            },
+        )
+
+        invalidate_responses("Test", None)
+        self.assertEqual(len(response_cache), 0)
+        self.assertEqual(len(verse_cache), 0)
+        self.assertEqual(len(range_cache), 0)
+
+    def test_scans_keep_chapters(self):
+        """Test that single verses and ranges are evicted before chapters are"""
+        self.client.get("/api/Test/1. Mose/1")
+        with patch.object(verse_cache, "max_entries", 2), patch.object(
+            range_cache, "max_entries", 1
+        ):
+            for path in (
+                "/api/Test/1. Mose/1/1",
+                "/api/Test/1. Mose/1/2",
+                "/api/Test/1. Mose/2/1",
+                "/api/Test/Johannes/3/16",
+                "/api/Test/range?from=0&to=1",
+                "/api/Test/range?from=2&to=3",
+            ):
+                self.assertEqual(self.client.get(path).status_code, 200)
+        self.assertEqual(
+            list(response_cache._entries), [("Test", "chapter", "1. Mose", 1)]
+        )
+        self.assertEqual(
+            list(verse_cache._entries),
+            [("Test", "verse", "1. Mose", 2, 1), ("Test", "verse", "Johannes", 3, 16)],
+        )
+        self.assertEqual(list(range_cache._entries), [("Test", "range", 2, 3)])
+
+    def test_versioned_chapter(self):
+        """Test immutable chapter URLs and redirects of outdated hashes"""
+        content_hash = bible_manager.bibles["Test"].content_hashes.chapter("1. Mose", 1)
+        path = f"/api/v/{content_hash}/Test/1. Mose/1"
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("immutable", response.headers["Cache-Control"])
+        self.assertEqual(response.json(), self.client.get("/api/Test/1. Mose/1").json())
+
+        response = self.client.get(
+            "/api/v/0000000000000000/Test/Gen/1", follow_redirects=False
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            response.headers["location"], f"/api/v/{content_hash}/Test/1.%20Mose/1"
+        )
+        self.assertEqual(response.headers["Cache-Control"], "no-cache")
+        self.assertEqual(
+            self.client.get(f"/api/v/{content_hash}/Test/1. Mose/9").status_code, 404
+        )
+
+    def test_autocomplete(self):
+        """Test book and word completions and the translation check"""
+        response = self.client.get("/api/Test/autocomplete?q=Joh")
+        self.assertEqual(response.status_code, 200)
+        body = AutocompleteResponse.model_validate(response.json())
+        self.assertEqual(
+            [suggestion.model_dump() for suggestion in body.books],
+            [{"text": "Johannes", "distance": 0}],
+        )
+        self.assertEqual(response.json()["words"], [])
+        response = self.client.get("/api/Test/autocomplete?q=Himmel und Erd")
+        self.assertEqual(response.json()["words"][0]["text"], "erde")
+        self.assertEqual(
+            self.client.get("/api/Unknown/autocomplete?q=Joh").status_code, 404
+        )
+        self.assertEqual(
+            self.client.get("/api/Test/autocomplete?q=Joh&limit=0").status_code, 422
+        )
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_statistics(self):
+        """Test the word frequency, concordance and co-occurrence reports"""
+        for path, model in (
+            ("/api/Test/stats/words?book=Genesis&chapters=1", WordsResponse),
+            ("/api/Test/stats/frequency?word=Gott", FrequencyResponse),
+            ("/api/Test/stats/concordance?word=Erde&width=1", ConcordanceResponse),
+            ("/api/Test/stats/cooccurrence?word=Himmel", CoOccurrencesResponse),
+        ):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                validated = model.model_validate_json(response.content)
+                self.assertEqual(validated.model_dump(mode="json"), response.json())
+
+        words = self.client.get("/api/Test/stats/words?limit=2").json()
+        self.assertEqual(words["total"], 36)
+        self.assertEqual(
+            words["words"],
+            [
+                {"word": "die", "count": 6, "verses": 4},
+                {"word": "und", "count": 5, "verses": 3},
+            ],
+        )
+        frequency = self.client.get("/api/Test/stats/frequency?word=GOTT").json()
+        self.assertEqual(frequency["total"], 2)
+        self.assertEqual(
+            [book["book"] for book in frequency["books"]], ["1. Mose", "Johannes"]
+        )
+        concordance = self.client.get(
+            "/api/Test/stats/concordance?word=erde&width=1&book=1. Mose&chapters=2"
+        ).json()
+        self.assertEqual(
+            concordance["lines"],
+            [
+                {
+                    "book": "1. Mose",
+                    "chapter": 2,
+                    "verse": 1,
+                    "left": "die ",
+                    "word": "Erde",
+                    "right": " wurden",
+                }
+            ],
+        )
+        cooccurrence = self.client.get("/api/Test/stats/cooccurrence?word=erde").json()
+        self.assertEqual(cooccurrence["verses"], 3)
+        self.assertEqual(
+            cooccurrence["words"][0], {"word": "und", "verses": 3, "dice": 1.0}
+        )
+
+    def test_statistics_errors(self):
+        """Test statistics of unknown translations and of several words"""
+        with patch("src.corpus_stats.np", None):
+            response = self.client.get("/api/Test/stats/words")
+        self.assertEqual(response.status_code, 501)
+        response = self.client.get("/api/Unknown/stats/frequency?word=Gott")
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get("/api/Test/stats/frequency?word=Himmel und Erde")
+        self.assertEqual(response.status_code, 400)
+
+    def test_translation_list_during_startup(self):
+        """Test that partial translation lists are not cached by clients"""
+        for path in ("/", "/api/translations"):
+            response = self.client.get(path)
+            self.assertEqual(response.headers["Cache-Control"], "no-cache")
+
+        startup_complete.set()
+        try:
+            for path in ("/", "/api/translations"):
+                response = self.client.get(path)
+                self.assertEqual(response.headers["Cache-Control"], CACHE_CONTROL)
+        finally:
+            startup_complete.clear()
+
+    def test_health_and_readiness(self):
+        """Test the probes during and after startup loading"""
+        self.assertEqual(self.client.get("/health").json(), {"status": "ok"})
+
+        bible_manager.status = {"Test": "ready", "Other": "loading"}
+        startup_complete.set()
+        try:
+            response = self.client.get("/ready")
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(
+                response.json(),
+                {"ready": False, "translations": {"Test": "ready", "Other": "loading"}},
+            )
+            self.assertEqual(self.client.get("/ready/Test").status_code, 200)
+            self.assertEqual(self.client.get("/ready/Other").status_code, 503)
+            self.assertEqual(self.client.get("/ready/Unknown").status_code, 404)
+
+            # Routes of a translation that is still loading ask to retry
+            for path in (
+                "/api/Other/books",
+                "/api/Other/search?q=Gott",
+                "/api/compare/Johannes/3?translations=Test,Other",
+            ):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 503)
+                self.assertIn("Retry-After", response.headers)
+
+            bible_manager.status["Other"] = "failed"
+            self.assertEqual(self.client.get("/ready").status_code, 200)
+        finally:
+            bible_manager.status = {}
+            startup_complete.clear()
+        self.assertEqual(self.client.get("/ready").status_code, 503)
+
+    def test_not_found_routes(self):
+        """Test 404 responses of the cached routes"""
+        for path in (
+            "/api/Unknown/books",
+            "/api/Test/Ruth/chapters",
+            "/api/Test/1. Mose/3",
+            "/api/Test/1. Mose/1/3",
+        ):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 404)
+        self.assertEqual(len(response_cache), 0)
+
+    def test_get_verses(self):
+        """Test resolving several references in one request"""
+        response = self.client.get(
+            "/api/Test/verses", params={"refs": "1. Mose 1:1-2;Joh 3:16;Ruth 1:1"}
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["missing"], ["Ruth 1:1"])
+        self.assertEqual(
+            [(v["book"], v["chapter"], v["verse"]) for v in data["verses"]],
+            [("1. Mose", 1, 1), ("1. Mose", 1, 2), ("Johannes", 3, 16)],
+        )
+
+    def test_post_verses(self):
+        """Test posting a list of references"""
+        response = self.client.post(
+            "/api/Test/verses", json={"refs": ["1. Mose 1:2-2:1", "Johannes 3:16"]}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["verses"]), 3)
+
+    def test_verses_streamed(self):
+        """Test that large batches stream the same JSON shape"""
+        expected = self.client.get("/api/Test/verses", params={"refs": "1. Mose 1-2"})
+        with patch("main.STREAM_VERSE_THRESHOLD", 1):
+            streamed = self.client.get(
+                "/api/Test/verses", params={"refs": "1. Mose 1-2"}
+            )
+        self.assertEqual(streamed.json(), expected.json())
+
+    def test_verses_limit(self):
+        """Test that batches covering too many verses are rejected"""
+        with patch("main.MAX_BATCH_VERSES", 2):
+            response = self.client.get(
+                "/api/Test/verses", params={"refs": "1. Mose 1-2"}
+            )
+            self.assertEqual(response.status_code, 400)
+            response = self.client.get("/api/Test/verses", params={"refs": "1. Mose 1"})
+            self.assertEqual(response.status_code, 200)
+
+    def test_verses_invalid_reference(self):
+        """Test that invalid references are rejected"""
+        response = self.client.get("/api/Test/verses", params={"refs": "Johannes"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_compare_chapter(self):
+        """Test verse-aligned chapters from translations with English names"""
+        english = make_bible(
+            """0#Genesis#1#1#In the beginning God created the heavens and the earth.
+0#Genesis#1#3#God said, "Let there be light," and there was light.""",
+            "English",
+        )
+        bible_manager.bibles["English"] = english
+
+        response = self.client.get(
+            "/api/compare/Genesis/1", params={"translations": "Test,English"}
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["book"], "1. Mose")
+        self.assertEqual(data["translations"], ["Test", "English"])
+        self.assertEqual([v["verse"] for v in data["verses"]], [1, 2, 3])
+        self.assertEqual(
+            data["verses"][1]["texts"],
+            {"Test": "Und die Erde war wüst und leer.", "English": None},
+        )
+
+        response = self.client.get("/api/compare/1Mos/1")
+        self.assertEqual(response.json()["translations"], ["Test", "English"])
+
+    def test_compare_not_found(self):
+        """Test unknown translations and chapters"""
+        response = self.client.get(
+            "/api/compare/Johannes/3", params={"translations": "Test,Unknown"}
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.get("/api/compare/Ruth/1").status_code, 404)
+
+    def test_export(self):
+        """Test streaming a translation as NDJSON and CSV"""
+        response = self.client.get("/api/Test/export")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        self.assertEqual(len(response.text.splitlines()), 4)
+
+        response = self.client.get("/api/Test/export", params={"format": "csv"})
+        self.assertTrue(response.headers["content-type"].startswith("text/csv"))
+        self.assertIn('filename="Test.csv"', response.headers["content-disposition"])
+        self.assertEqual(response.text.splitlines()[0], "book,chapter,verse,text")
+
+        response = self.client.get("/api/Test/export", params={"format": "xml"})
+        self.assertEqual(response.status_code, 422)
+
+    def test_search(self):
+        """Test the search endpoint"""
+        response = self.client.get("/api/Test/search", params={"q": "Gott Erde"})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["total"], 1)
+        self.assertEqual(
+            data["results"],
+            [
+                {
+                    "book": "1. Mose",
+                    "chapter": 1,
+                    "verse": 1,
+                    "text": "Im Anfang schuf Gott die Himmel und die Erde.",
+                    "score": None,
+                }
+            ],
+        )
+
+    def test_search_pagination(self):
+        """Test offset and limit of the search endpoint"""
+        response = self.client.get(
+            "/api/Test/search", params={"q": "Gott", "limit": 1, "offset": 1}
+        )
+        data = response.json()
+        self.assertEqual(data["total"], 2)
+        self.assertEqual(data["results"][0]["book"], "Johannes")
+
+    def test_search_ranked(self):
+        """Test ranked search with scores"""
+        response = self.client.get(
+            "/api/Test/search", params={"q": "Erde wüst", "mode": "ranked"}
+        )
+        data = response.json()
+        self.assertEqual(data["total"], 3)
+        first = data["results"][0]
+        self.assertEqual((first["chapter"], first["verse"]), (1, 2))
+        self.assertGreater(data["results"][0]["score"], data["results"][1]["score"])
+
+        response = self.client.get(
+            "/api/Test/search", params={"q": "Gott", "mode": "best"}
+        )
+        self.assertEqual(response.status_code, 422)
+
+    def test_search_scope(self):
+        """Test searching within a book or chapters"""
+
+        def search(**params):
+            return self.client.get("/api/Test/search", params={"q": "Erde", **params})
+
+        self.assertEqual(search(book="Genesis").json()["total"], 3)
+        self.assertEqual(search(book="1. Mose", chapters="2").json()["total"], 1)
+        self.assertEqual(search(book="Johannes").json()["total"], 0)
+        self.assertEqual(
+            search(book="1. Mose", chapters="1-2", mode="ranked").json()["total"], 3
+        )
+        self.assertEqual(search(book="Ruth").status_code, 404)
+        self.assertEqual(search(book="1. Mose", chapters="5").status_code, 404)
+        self.assertEqual(search(book="1. Mose", chapters="x").status_code, 400)
+        self.assertEqual(search(chapters="1").status_code, 400)
+
+    def test_search_unknown_translation(self):
+        """Test searching a translation that is not loaded"""
+        response = self.client.get("/api/Unknown/search", params={"q": "Gott"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_search_requires_query(self):
+        """Test that a query is required"""
+        response = self.client.get("/api/Test/search")
+        self.assertEqual(response.status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
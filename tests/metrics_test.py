@@ -0,0 +1,118 @@
+import unittest
+
+from bible_manager import BibleManager
+from conftest import make_bible
+from metrics import (
+    Histogram,
+    RequestMetrics,
+    bible_stats,
+    format_labels,
+    format_value,
+    render_bible_metrics,
+    render_cache_metrics,
+)
+from response_cache import ResponseCache
+
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram(self):
+        """Test cumulative bucket counts, sum and count"""
+        histogram = Histogram((1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+        self.assertEqual(
+            histogram.samples(()),
+            [
+                ("_bucket", (("le", "1"),), 2),
+                ("_bucket", (("le", "5"),), 3),
+                ("_bucket", (("le", "+Inf"),), 4),
+                ("_sum", (), 14.5),
+                ("_count", (), 4),
+            ],
+        )
+
+    def test_format_labels(self):
+        """Test label formatting and escaping"""
+        self.assertEqual(format_labels(()), "")
+        self.assertEqual(
+            format_labels((("route", "/api"), ("q", 'a "b"'))),
+            '{route="/api",q="a \\"b\\""}',
+        )
+
+    def test_format_value(self):
+        """Test that large counts keep every digit"""
+        self.assertEqual(format_value(3650660), "3650660")
+        self.assertEqual(format_value(0.25), "0.25")
+
+    def test_request_metrics(self):
+        """Test request counts and histograms per route template"""
+        metrics = RequestMetrics()
+        metrics.observe("GET", "/api/{translation}/books", 200, 0.002, 300)
+        metrics.observe("GET", "/api/{translation}/books", 200, 0.004, 300)
+        metrics.observe("GET", "/api/{translation}/books", 404, 0.001, 50)
+        lines = metrics.render()
+        labels = 'method="GET",route="/api/{translation}/books"'
+        self.assertIn(f'http_requests_total{{{labels},status="200"}} 2', lines)
+        self.assertIn(f'http_requests_total{{{labels},status="404"}} 1', lines)
+        self.assertIn(f"http_request_duration_seconds_count{{{labels}}} 3", lines)
+        self.assertIn(f'http_response_size_bytes_bucket{{{labels},le="1024"}} 3', lines)
+
+    def test_histogram_bounds(self):
+        """Test that bucket bounds are printed exactly"""
+        metrics = RequestMetrics()
+        metrics.observe("GET", "/api/{translation}/export", 200, 0.3, 2000000)
+        lines = metrics.render()
+        labels = 'method="GET",route="/api/{translation}/export"'
+        for bound, count in (("262144", 0), ("1048576", 0), ("4194304", 1)):
+            self.assertIn(
+                f'http_response_size_bytes_bucket{{{labels},le="{bound}"}} {count}',
+                lines,
+            )
+        self.assertIn(
+            f'http_request_duration_seconds_bucket{{{labels},le="0.0025"}} 0', lines
+        )
+        self.assertIn(
+            f'http_request_duration_seconds_bucket{{{labels},le="0.5"}} 1', lines
+        )
+
+    def test_bible_stats(self):
+        """Test verse counts and memory estimates of plain and compact bibles"""
+        bible = make_bible()
+        verses, size = bible_stats(bible)
+        self.assertEqual(verses, 4)
+        self.assertGreater(size, 0)
+
+        bible.compact()
+        verses, compact_size = bible_stats(bible)
+        self.assertEqual(verses, 4)
+        self.assertLess(compact_size, size)
+
+    def test_bible_metrics(self):
+        """Test per-translation load durations and verse counts"""
+        bible = make_bible()
+        manager = BibleManager()
+        manager.bibles = {"Test": bible}
+        manager.load_seconds = {"Test": 0.5}
+        lines = render_bible_metrics(manager)
+        self.assertIn('bible_load_seconds{translation="Test"} 0.5', lines)
+        self.assertIn('bible_verses{translation="Test"} 4', lines)
+
+    def test_cache_metrics(self):
+        """Test cache hit ratio and size gauges"""
+        cache = ResponseCache()
+        cache.put(("Test", "books"), b"body")
+        cache.get(("Test", "books"))
+        cache.get(("Test", "missing"))
+        cache.get(("Test", "books"))
+        lines = render_cache_metrics({"responses": cache, "verses": ResponseCache()})
+        self.assertIn('cache_hits_total{cache="responses"} 2', lines)
+        self.assertIn('cache_misses_total{cache="responses"} 1', lines)
+        self.assertIn('cache_hit_ratio{cache="responses"} 0.6666666666666666', lines)
+        self.assertIn('cache_bytes{cache="responses"} 4', lines)
+        self.assertIn('cache_hit_ratio{cache="verses"} 0', lines)
+        # One family per metric, a sample per cache
+        self.assertEqual(lines.count("# TYPE cache_hits_total counter"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+
+from conftest import make_bible
+from references import (
+    Reference,
+    book_bounds,
+    count_reference,
+    iter_reference,
+    parse_reference,
+    parse_references,
+    reference_bounds,
+    resolve_book,
+)
+
+REFERENCE_TEXT = """0#1. Mose#1#29#Und Gott sprach: Siehe, ich habe euch gegeben alles Kraut.
+0#1. Mose#1#30#Und allem Getier der Erde habe ich alles grüne Kraut zur Speise gegeben.
+0#1. Mose#1#31#Und Gott sah alles, was er gemacht hatte.
+0#1. Mose#2#1#So wurden vollendet der Himmel und die Erde.
+0#1. Mose#2#2#Und Gott hatte am siebenten Tage vollendet sein Werk.
+0#1. Mose#2#3#Und Gott segnete den siebenten Tag.
+0#Johannes#3#16#Denn also hat Gott die Welt geliebt."""
+
+
+class TestReferences(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.bible = make_bible(REFERENCE_TEXT)
+
+    def test_parse_single_verse(self):
+        """Test parsing a single verse reference"""
+        self.assertEqual(
+            parse_reference("Johannes 3:16"), Reference("Johannes", 3, 16, 3, 16)
+        )
+
+    def test_parse_verse_range(self):
+        """Test parsing verse ranges within and across chapters"""
+        self.assertEqual(
+            parse_reference("1. Mose 1:1-5"), Reference("1. Mose", 1, 1, 1, 5)
+        )
+        self.assertEqual(
+            parse_reference(" 1. Mose 1:30 - 2:2 "), Reference("1. Mose", 1, 30, 2, 2)
+        )
+
+    def test_parse_chapters(self):
+        """Test parsing whole chapters and chapter ranges"""
+        self.assertEqual(
+            parse_reference("Psalmen 23"), Reference("Psalmen", 23, None, 23, None)
+        )
+        self.assertEqual(
+            parse_reference("Psalmen 1-3"), Reference("Psalmen", 1, None, 3, None)
+        )
+
+    def test_parse_invalid(self):
+        """Test that invalid references raise ValueError"""
+        for text in ("Johannes", "3:16", "Johannes 3:16-2", "Psalmen 5-3", ""):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_reference(text)
+
+    def test_parse_references(self):
+        """Test splitting references at semicolons"""
+        references = parse_references("1. Mose 1:1-5;Johannes 3:16; ")
+        self.assertEqual([r.book for r in references], ["1. Mose", "Johannes"])
+
+    def test_reference_bounds(self):
+        """Test the first and last verse ID a reference covers"""
+        self.assertEqual(
+            reference_bounds(self.bible, parse_reference("1. Mose 1:30")), (1, 1)
+        )
+        self.assertEqual(
+            reference_bounds(self.bible, parse_reference("1. Mose 1:30-2:2")), (1, 4)
+        )
+        self.assertEqual(reference_bounds(self.bible, parse_reference("Gen 2")), (3, 5))
+        self.assertEqual(reference_bounds(self.bible, parse_reference("Joh 3")), (6, 6))
+        self.assertIsNone(reference_bounds(self.bible, parse_reference("1. Mose 1:1")))
+        self.assertIsNone(reference_bounds(self.bible, parse_reference("1. Mose 3")))
+        self.assertIsNone(reference_bounds(self.bible, parse_reference("Ruth 1")))
+
+    def test_book_bounds(self):
+        """Test the first and last verse ID of a book"""
+        self.assertEqual(book_bounds(self.bible, "Genesis"), (0, 5))
+        self.assertEqual(book_bounds(self.bible, "Joh"), (6, 6))
+        self.assertIsNone(book_bounds(self.bible, "Ruth"))
+
+    def test_resolve_book(self):
+        """Test resolving full names and abbreviations"""
+        self.assertEqual(resolve_book(self.bible, "1. Mose"), "1. Mose")
+        self.assertEqual(resolve_book(self.bible, "Joh"), "Johannes")
+        self.assertIsNone(resolve_book(self.bible, "Ruth"))
+
+    def test_iter_reference_across_chapters(self):
+        """Test resolving a range that crosses a chapter boundary"""
+        verses = list(iter_reference(self.bible, parse_reference("1Mos 1:30-2:2")))
+        self.assertEqual(
+            verses,
+            [
+                ("1. Mose", 1, 30),
+                ("1. Mose", 1, 31),
+                ("1. Mose", 2, 1),
+                ("1. Mose", 2, 2),
+            ],
+        )
+
+    def test_iter_reference_whole_chapter(self):
+        """Test resolving a whole chapter"""
+        verses = list(iter_reference(self.bible, parse_reference("1. Mose 2")))
+        self.assertEqual([verse for _, _, verse in verses], [1, 2, 3])
+
+    def test_count_reference(self):
+        """Test that counting matches the verses a reference resolves to"""
+        for text in (
+            "1Mos 1:30-2:2",
+            "1. Mose 2",
+            "1. Mose 1-2",
+            "1. Mose 1:31",
+            "1. Mose 2:2-3",
+            "Johannes 3:17",
+            "Ruth 1:1",
+        ):
+            with self.subTest(reference=text):
+                reference = parse_reference(text)
+                self.assertEqual(
+                    count_reference(self.bible, reference),
+                    len(list(iter_reference(self.bible, reference))),
+                )
+
+    def test_iter_reference_missing(self):
+        """Test references to books and verses that do not exist"""
+        self.assertEqual(
+            list(iter_reference(self.bible, parse_reference("Ruth 1:1"))), []
+        )
+        self.assertEqual(
+            list(iter_reference(self.bible, parse_reference("Johannes 3:17"))), []
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from watchfiles import Change
+
+from reloader import _is_translation_file, watch_texts
+
+
+class TestReloader(unittest.TestCase):
+    def test_watch_filter(self):
+        """Test that only text and corpus files are watched"""
+        self.assertTrue(_is_translation_file(Change.modified, "src/texts/world.txt"))
+        self.assertTrue(_is_translation_file(Change.added, "src/texts/world.pybl"))
+        self.assertFalse(_is_translation_file(Change.added, "src/texts/world.txt~"))
+
+    def test_watch_texts_reloads_changed_files(self):
+        """Test that each changed translation is reloaded once"""
+        manager = MagicMock()
+        manager.reload_file = AsyncMock()
+
+        async def changes(*args, **kwargs):
+            yield {
+                (Change.modified, "src/texts/world.txt"),
+                (Change.modified, "src/texts/world.pybl"),
+                (Change.deleted, "src/texts/elberfelder1905.txt"),
+            }
+
+        with patch("reloader.awatch", changes):
+            asyncio.run(watch_texts(manager, "src/texts/"))
+
+        reloaded = sorted(call.args[0] for call in manager.reload_file.call_args_list)
+        self.assertEqual(len(reloaded), 2)
+        self.assertEqual(reloaded[0], "src/texts/elberfelder1905.txt")
+        self.assertTrue(reloaded[1].startswith("src/texts/world."))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+from unittest.mock import patch
+
+from response_cache import ResponseCache, etag_matches, make_etag
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.cache = ResponseCache(max_bytes=10, max_entries=3)
+
+    def test_make_etag(self):
+        """Test that ETags are strong and depend on the body only"""
+        etag = make_etag(b"{}")
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+        self.assertEqual(etag, make_etag(b"{}"))
+        self.assertNotEqual(etag, make_etag(b"[]"))
+
+    def test_etag_matches(self):
+        """Test If-None-Match parsing"""
+        etag = '"abc"'
+        self.assertTrue(etag_matches('"abc"', etag))
+        self.assertTrue(etag_matches('"x", W/"abc"', etag))
+        self.assertTrue(etag_matches(" * ", etag))
+        self.assertFalse(etag_matches('"abcd"', etag))
+        self.assertFalse(etag_matches("", etag))
+        self.assertFalse(etag_matches(None, etag))
+
+    def test_get_and_put(self):
+        """Test hits, misses and the stored body"""
+        self.assertIsNone(self.cache.get(("T", "book", "Ruth")))
+        cached = self.cache.put(("T", "book", "Ruth"), b"abc")
+        self.assertEqual(self.cache.get(("T", "book", "Ruth")), cached)
+        self.assertEqual(cached.body, b"abc")
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(self.cache.size, 3)
+
+    def test_evicts_least_recently_used_by_count(self):
+        """Test eviction once the entry limit is exceeded"""
+        for name in ("a", "b", "c"):
+            self.cache.put(("T", name), b"x")
+        self.cache.get(("T", "a"))
+        self.cache.put(("T", "d"), b"x")
+
+        self.assertIsNone(self.cache.get(("T", "b")))
+        self.assertIsNotNone(self.cache.get(("T", "a")))
+        self.assertEqual(len(self.cache), 3)
+
+    def test_evicts_least_recently_used_by_size(self):
+        """Test eviction once the byte limit is exceeded"""
+        self.cache.put(("T", "a"), b"12345")
+        self.cache.put(("T", "b"), b"1234")
+        self.cache.put(("T", "c"), b"123")
+
+        self.assertIsNone(self.cache.get(("T", "a")))
+        self.assertEqual(self.cache.size, 7)
+
+    def test_oversized_body_is_not_stored(self):
+        """Test that bodies larger than the cache are passed through"""
+        cached = self.cache.put(("T", "a"), b"12345678901")
+        self.assertEqual(cached.body, b"12345678901")
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.size, 0)
+
+    def test_replace_entry(self):
+        """Test that replacing an entry keeps the size accurate"""
+        self.cache.put(("T", "a"), b"12345")
+        self.cache.put(("T", "a"), b"12")
+        self.assertEqual(self.cache.size, 2)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_invalidate_translation(self):
+        """Test dropping all responses of one translation"""
+        self.cache.put(("A", "book", "Ruth"), b"1")
+        self.cache.put(("B", "book", "Ruth"), b"22")
+        self.cache.invalidate("A")
+
+        self.assertIsNone(self.cache.get(("A", "book", "Ruth")))
+        self.assertIsNotNone(self.cache.get(("B", "book", "Ruth")))
+        self.assertEqual(self.cache.size, 2)
+
+    def test_invalidate_stale_keys(self):
+        """Test dropping only the responses a predicate marks as stale"""
+        self.cache.put(("A", "book", "Ruth"), b"1")
+        self.cache.put(("A", "book", "Jona"), b"2")
+        self.cache.invalidate("A", lambda key: key[2] == "Ruth")
+
+        self.assertIsNone(self.cache.get(("A", "book", "Ruth")))
+        self.assertIsNotNone(self.cache.get(("A", "book", "Jona")))
+        self.assertEqual(self.cache.size, 1)
+
+    def test_clear(self):
+        """Test dropping all responses"""
+        self.cache.put(("A", "book", "Ruth"), b"1")
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.size, 0)
+
+    def test_encoded_variants(self):
+        """Test that variants are compressed once and count towards the size"""
+        cache = ResponseCache(max_bytes=1000)
+        body = b"a" * 200
+        cached = cache.put(("T", "book"), body)
+        with patch("response_cache.compress", return_value=b"z" * 20) as compress:
+            self.assertEqual(cache.encoded(("T", "book"), cached, "gzip"), b"z" * 20)
+            self.assertEqual(cache.encoded(("T", "book"), cached, "gzip"), b"z" * 20)
+        compress.assert_called_once_with(body, "gzip")
+        self.assertEqual(cache.size, 220)
+
+        cache.invalidate("T")
+        self.assertEqual(cache.size, 0)
+
+    def test_encoded_variants_evict(self):
+        """Test that variants beyond the byte limit evict older entries"""
+        self.cache.put(("T", "a"), b"12345")
+        cached = self.cache.put(("T", "b"), b"1234")
+        with patch("response_cache.compress", return_value=b"12"):
+            self.cache.encoded(("T", "b"), cached, "gzip")
+        self.assertIsNone(self.cache.get(("T", "a")))
+        self.assertEqual(self.cache.size, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+
+from conftest import make_bible
+from search_index import SearchIndex, intersect, parse_query, tokenize
+
+SEARCH_TEXT = """0#1. Mose#1#1#Im Anfang schuf Gott die Himmel und die Erde.
+0#1. Mose#1#2#Und die Erde war wüst und leer, und Finsternis war über der Tiefe.
+0#1. Mose#1#3#Und Gott sprach: Es werde Licht! und es ward Licht.
+0#1. Mose#1#4#Und Gott sah das Licht, daß es gut war.
+0#Johannes#1#1#Im Anfang war das Wort, und das Wort war bei Gott.
+0#Johannes#3#16#Denn also hat Gott die Welt geliebt, daß er seinen Sohn gab."""
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.index = SearchIndex(make_bible(SEARCH_TEXT))
+
+    def references(self, query):
+        return [hit[:3] for hit in self.index.search(query, limit=100)[1]]
+
+    def test_tokenize(self):
+        """Test case folding of umlauts and ß"""
+        self.assertEqual(tokenize("Über der Tiefe"), ["über", "der", "tiefe"])
+        self.assertEqual(tokenize("daß es GUT war!"), ["dass", "es", "gut", "war"])
+        self.assertEqual(tokenize("über"), ["über"])
+
+    def test_parse_query(self):
+        """Test splitting terms and quoted phrases"""
+        terms, phrases = parse_query('Gott "im Anfang" Licht ""')
+        self.assertEqual(terms, ["gott", "licht"])
+        self.assertEqual(phrases, [["im", "anfang"]])
+
+    def test_intersect(self):
+        """Test intersecting sorted posting lists"""
+        self.assertEqual(
+            list(intersect([[1, 3, 5, 7], [3, 4, 7], [0, 3, 7, 9]])), [3, 7]
+        )
+        self.assertEqual(list(intersect([[1, 2], [5, 6]])), [])
+
+    def test_search_and_query(self):
+        """Test that all terms must occur in a verse"""
+        self.assertEqual(
+            self.references("gott licht"), [("1. Mose", 1, 3), ("1. Mose", 1, 4)]
+        )
+
+    def test_search_umlaut_and_eszett(self):
+        """Test matching umlauts and ß written as ss"""
+        self.assertEqual(self.references("WÜST"), [("1. Mose", 1, 2)])
+        self.assertEqual(
+            self.references("dass"), [("1. Mose", 1, 4), ("Johannes", 3, 16)]
+        )
+
+    def test_search_phrase(self):
+        """Test that quoted phrases must occur in order"""
+        self.assertEqual(
+            self.references('"im anfang"'), [("1. Mose", 1, 1), ("Johannes", 1, 1)]
+        )
+        self.assertEqual(self.references('"anfang im"'), [])
+        self.assertEqual(self.references('"das wort" gott'), [("Johannes", 1, 1)])
+
+    def test_search_no_match(self):
+        """Test unknown terms and empty queries"""
+        self.assertEqual(self.index.search("Gott Posaune"), (0, []))
+        self.assertEqual(self.index.search("!?"), (0, []))
+
+    def test_search_pagination(self):
+        """Test total count, offset and limit"""
+        total, hits = self.index.search("gott", limit=2, offset=1)
+        self.assertEqual(total, 5)
+        self.assertEqual([hit.verse for hit in hits], [3, 4])
+        self.assertEqual(
+            hits[0].text, "Und Gott sprach: Es werde Licht! und es ward Licht."
+        )
+
+    def test_rank_by_relevance(self):
+        """Test that rare terms and repeated terms rank higher"""
+        total, hits = self.index.rank("licht gott", limit=2)
+        self.assertEqual(total, 5)
+        self.assertEqual(
+            [hit[:3] for hit in hits], [("1. Mose", 1, 3), ("1. Mose", 1, 4)]
+        )
+        self.assertGreater(hits[0].score, hits[1].score)
+
+    def test_rank_any_term(self):
+        """Test that ranked verses need to contain only one term"""
+        total, hits = self.index.rank("sohn wüst")
+        self.assertEqual(total, 2)
+        self.assertEqual(
+            {hit[:3] for hit in hits}, {("1. Mose", 1, 2), ("Johannes", 3, 16)}
+        )
+
+    def test_rank_shorter_verse_first(self):
+        """Test that a term in a short verse outranks one in a long verse"""
+        _, hits = self.index.rank("anfang")
+        self.assertEqual(
+            [hit[:3] for hit in hits], [("1. Mose", 1, 1), ("Johannes", 1, 1)]
+        )
+
+    def test_rank_phrase(self):
+        """Test that ranked verses must contain every phrase"""
+        total, hits = self.index.rank('"das wort" licht')
+        self.assertEqual(total, 1)
+        self.assertEqual(hits[0][:3], ("Johannes", 1, 1))
+
+    def test_rank_pagination(self):
+        """Test that pages of ranked hits continue each other"""
+        _, everything = self.index.rank("gott", limit=100)
+        total, page = self.index.rank("gott", limit=2, offset=2)
+        self.assertEqual(total, 5)
+        self.assertEqual(page, everything[2:4])
+        self.assertEqual(self.index.rank("Posaune"), (0, []))
+
+    def test_scope(self):
+        """Test searching only verse IDs from start to end"""
+        self.assertEqual(self.index.search("gott", start=1, end=3)[0], 2)
+        total, hits = self.index.rank("gott", start=4)
+        self.assertEqual(total, 2)
+        self.assertEqual({hit.book for hit in hits}, {"Johannes"})
+        self.assertEqual(self.index.search("wort", start=0, end=3), (0, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
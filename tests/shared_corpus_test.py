@@ -0,0 +1,89 @@
+import asyncio
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from bible_manager import BibleManager
+from shared_corpus import (
+    attach_corpus,
+    format_segments,
+    parse_segments,
+    publish_corpus,
+)
+from verse_store import VerseStore
+
+
+class TestSharedCorpus(unittest.TestCase):
+    def setUp(self):
+        """Publish a small translation in shared memory"""
+        self.books = {
+            "1. Mose": {1: {1: "Im Anfang schuf Gott die Himmel und die Erde."}},
+            "Johannes": {3: {16: "Denn also hat Gott die Welt geliebt."}},
+        }
+        self.segment = f"pybl_test_{os.getpid()}"
+        self.shared = publish_corpus(
+            self.segment, "Elberfelder1905", VerseStore.from_books(self.books)
+        )
+
+    def tearDown(self):
+        self.shared.close()
+        self.shared.unlink()
+
+    def test_attach(self):
+        """Test serving verses from the published segment"""
+        name, store = attach_corpus(self.segment)
+        self.assertEqual(name, "Elberfelder1905")
+        self.assertEqual(store.to_dict(), self.books)
+
+    def test_attach_is_read_only(self):
+        """Test that attached verse texts cannot be written"""
+        _, store = attach_corpus(self.segment)
+        with self.assertRaises(TypeError):
+            store.text[0] = 0
+
+    @unittest.skipUnless(Path("/dev/shm").is_dir(), "needs /dev/shm")
+    def test_attach_without_shm_files(self):
+        """Test attaching through SharedMemory where /dev/shm is missing"""
+        with patch("shared_corpus.SHM_DIR", Path("/nonexistent")), patch(
+            "shared_corpus.resource_tracker.unregister"
+        ) as unregister:
+            name, store = attach_corpus(self.segment)
+        unregister.assert_called_once()
+        self.assertEqual(name, "Elberfelder1905")
+        self.assertEqual(store["Johannes"][3][16], self.books["Johannes"][3][16])
+        with self.assertRaises(TypeError):
+            store.text[0] = 0
+
+    def test_segments_round_trip(self):
+        """Test passing segment names through the environment"""
+        segments = {
+            "elberfelder1905": "pybl_1_elberfelder1905",
+            "world": "pybl_1_world",
+        }
+        self.assertEqual(parse_segments(format_segments(segments)), segments)
+        self.assertEqual(
+            parse_segments("world=pybl_1_world,,broken"), {"world": "pybl_1_world"}
+        )
+
+    def test_manager_loads_shared_corpus(self):
+        """Test adding attached translations to a BibleManager"""
+        manager = BibleManager()
+        with patch("builtins.print"):
+            asyncio.run(
+                manager.load_shared_corpus(
+                    {"elberfelder1905": self.segment, "unknown": self.segment}
+                )
+            )
+            asyncio.run(manager.load_shared_corpus({"world": "pybl_missing_segment"}))
+
+        self.assertEqual(manager.get_translation_names(), ["Elberfelder1905"])
+        bible = manager.get_bible("Elberfelder1905")
+        self.assertEqual(bible.get_verse("Joh", 3, 16), self.books["Johannes"][3][16])
+        self.assertEqual(manager.files, {"elberfelder1905": "Elberfelder1905"})
+        total, _ = manager.search_indexes["Elberfelder1905"].search("Welt")
+        self.assertEqual(total, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
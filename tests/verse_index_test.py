@@ -0,0 +1,64 @@
+import unittest
+
+from verse_index import VerseIndex
+from verse_store import VerseStore
+
+
+class TestVerseIndex(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.books = {
+            "1. Mose": {
+                2: {1: "So wurden vollendet", 2: "Und Gott hatte"},
+                1: {2: "Und die Erde", 1: "Im Anfang"},
+            },
+            "Johannes": {3: {16: "Denn also", 18: "Wer an ihn glaubt"}},
+        }
+        self.index = VerseIndex(self.books)
+
+    def test_canonical_order(self):
+        """Test that verse IDs follow books, then sorted chapters and verses"""
+        self.assertEqual(len(self.index), 6)
+        self.assertEqual(
+            [self.index.reference(verse_id) for verse_id in range(6)],
+            [
+                ("1. Mose", 1, 1),
+                ("1. Mose", 1, 2),
+                ("1. Mose", 2, 1),
+                ("1. Mose", 2, 2),
+                ("Johannes", 3, 16),
+                ("Johannes", 3, 18),
+            ],
+        )
+        self.assertIsNone(self.index.reference(6))
+        self.assertIsNone(self.index.reference(-1))
+
+    def test_verse_id(self):
+        """Test reference to verse ID conversion with and without gaps"""
+        for verse_id in range(len(self.index)):
+            self.assertEqual(
+                self.index.verse_id(*self.index.reference(verse_id)), verse_id
+            )
+        self.assertIsNone(self.index.verse_id("1. Mose", 1, 3))
+        self.assertIsNone(self.index.verse_id("Johannes", 3, 17))
+        self.assertIsNone(self.index.verse_id("Johannes", 4, 1))
+        self.assertIsNone(self.index.verse_id("Ruth", 1, 1))
+
+    def test_chapter_range(self):
+        """Test the verse ID bounds of chapters"""
+        self.assertEqual(self.index.chapter_range("1. Mose", 2), (2, 4))
+        self.assertEqual(self.index.chapter_range("Johannes", 3), (4, 6))
+        self.assertIsNone(self.index.chapter_range("Johannes", 1))
+
+    def test_matches_verse_store_positions(self):
+        """Test that verse IDs are the positions of a VerseStore"""
+        store = VerseStore.from_books(self.books)
+        for verse_id in range(len(self.index)):
+            book, chapter, verse = self.index.reference(verse_id)
+            self.assertEqual(
+                store.verse_text(verse_id), self.books[book][chapter][verse]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
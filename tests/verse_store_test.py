@@ -0,0 +1,99 @@
+import pickle
+import unittest
+
+from models import BookResponse, ChapterResponse
+from verse_store import VerseStore
+
+
+class TestVerseStore(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.books = {
+            "1. Mose": {
+                1: {
+                    1: "Im Anfang schuf Gott die Himmel und die Erde.",
+                    2: "Und die Erde war wüst und leer.",
+                },
+                2: {1: "Und die Himmel und die Erde wurden vollendet."},
+            },
+            "Psalmen": {117: {2: "Denn mächtig über uns ist seine Güte.", 1: "Lobet"}},
+        }
+        self.store = VerseStore.from_books(self.books)
+
+    def test_from_books_layout(self):
+        """Test the flat verse arrays and chapter table"""
+        self.assertEqual(self.store.verse_count, 5)
+        self.assertEqual(len(self.store.offsets), 6)
+        self.assertEqual(list(self.store.verse_numbers), [1, 2, 1, 1, 2])
+        self.assertEqual(self.store.chapters["1. Mose"], {1: (0, 2), 2: (2, 3)})
+        self.assertEqual(self.store.chapters["Psalmen"], {117: (3, 5)})
+
+    def test_view_to_dict(self):
+        """Test expanding book and chapter views into dicts"""
+        self.assertEqual(self.store["1. Mose"].to_dict(), self.books["1. Mose"])
+        chapter = self.store["Psalmen"][117].to_dict()
+        self.assertEqual(
+            chapter, {1: "Lobet", 2: "Denn mächtig über uns ist seine Güte."}
+        )
+        self.assertEqual(list(chapter), [1, 2])
+
+    def test_verse_text(self):
+        """Test decoding verses by canonical position"""
+        self.assertEqual(
+            self.store.verse_text(4), "Denn mächtig über uns ist seine Güte."
+        )
+
+    def test_mapping_interface(self):
+        """Test nested lookups through the book and chapter views"""
+        self.assertIn("1. Mose", self.store)
+        self.assertNotIn("2. Mose", self.store)
+        self.assertEqual(list(self.store), ["1. Mose", "Psalmen"])
+        self.assertEqual(len(self.store["1. Mose"]), 2)
+        self.assertIn(2, self.store["1. Mose"][1])
+        self.assertNotIn(3, self.store["1. Mose"][1])
+        self.assertEqual(list(self.store["Psalmen"][117]), [1, 2])
+        self.assertEqual(self.store["Psalmen"][117][1], "Lobet")
+
+    def test_missing_keys(self):
+        """Test that missing books, chapters and verses raise KeyError"""
+        with self.assertRaises(KeyError):
+            self.store["Offenbarung"]
+        with self.assertRaises(KeyError):
+            self.store["1. Mose"][50]
+        with self.assertRaises(KeyError):
+            self.store["1. Mose"][1][3]
+        with self.assertRaises(KeyError):
+            self.store["1. Mose"][1]["1"]
+
+    def test_equals_nested_dicts(self):
+        """Test that the store compares equal to the dicts it was built from"""
+        self.assertEqual(self.store, self.books)
+        self.assertEqual(self.store.to_dict(), self.books)
+
+    def test_pickle_round_trip(self):
+        """Test pickling a store built over a memoryview"""
+        store = VerseStore(
+            memoryview(self.store.text),
+            self.store.offsets,
+            self.store.verse_numbers,
+            self.store.chapters,
+        )
+        restored = pickle.loads(pickle.dumps(store))
+        self.assertIsInstance(restored.text, bytes)
+        self.assertEqual(restored, self.books)
+
+    def test_response_models_accept_views(self):
+        """Test that response models validate book and chapter views"""
+        chapter = ChapterResponse(
+            book="1. Mose", chapter=1, verses=self.store["1. Mose"][1], translation="T"
+        )
+        self.assertEqual(chapter.verses, self.books["1. Mose"][1])
+
+        book = BookResponse(
+            book="1. Mose", chapters=self.store["1. Mose"], translation="T"
+        )
+        self.assertEqual(book.chapters, self.books["1. Mose"])
+
+
+if __name__ == "__main__":
+    unittest.main()